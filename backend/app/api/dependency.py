@@ -1,23 +1,22 @@
+import hmac
 from typing import AsyncGenerator
 
 from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import databaseManager
+from app.core.database import getDatabaseManager
+from app.core.revocation import getRevocationList
 from app.core.settings import getSettings
-from app.services.userService import UserService
-from app.utils.jwtHandler import JWTHandler
-
-# JWT Handler instance
-jwtHandler = JWTHandler(
-    secretKey=getSettings.SECRET_KEY, algorithm=getSettings.ALGORITHM
-)
+from app.models.userModel import User
+from app.repository.userRepo import UserRepository
+from app.services.userService import ACCESS_TOKEN_COOKIE, UserService
+from app.utils.jwtHandler import TokenData, getJwtHandler
 
 
 # Database dependency to get an async session
 async def getAsyncSession() -> AsyncGenerator[AsyncSession, None]:
     """Get asynchronous database session"""
-    async with databaseManager.asyncSessionMaker() as session:
+    async with getDatabaseManager().asyncSessionMaker() as session:
         yield session
 
 
@@ -29,10 +28,10 @@ def getUserService(
     return UserService(session=session)
 
 
-# Get current user ID from JWT token in cookies
-async def getCurrentUserId(request: Request) -> str:
-    """Get current user ID from JWT token in cookies"""
-    accessToken = request.cookies.get("accessToken")
+# Get the decoded access token from cookies
+async def getCurrentTokenData(request: Request) -> TokenData:
+    """Decode the access token cookie and reject revoked sessions"""
+    accessToken = request.cookies.get(ACCESS_TOKEN_COOKIE)
     if not accessToken:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,17 +39,73 @@ async def getCurrentUserId(request: Request) -> str:
         )
 
     try:
-        tokenData = jwtHandler.decodeToken(accessToken)
-        return str(tokenData.userId)
+        tokenData = getJwtHandler().decodeToken(accessToken)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Invalid token: {str(e)}"
         )
 
+    # In-memory lookup; revocations are synced in the background
+    if tokenData.sessionId and getRevocationList().isRevoked(tokenData.sessionId):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session has been revoked",
+        )
+    return tokenData
+
+
+# Get current user ID from JWT token in cookies
+async def getCurrentUserId(
+    tokenData: TokenData = Depends(getCurrentTokenData),
+) -> str:
+    """Get current user ID from JWT token in cookies"""
+    return str(tokenData.userId)
+
+
+# Load the current user at most once per request
+async def getCurrentUser(
+    request: Request,
+    tokenData: TokenData = Depends(getCurrentTokenData),
+    session: AsyncSession = Depends(getAsyncSession),
+) -> User:
+    """Load the authenticated user, reusing the row already loaded for this request
+
+    Endpoints that only need the id, phone number or name should depend on
+    the token data instead and skip the database entirely.
+    """
+    user = getattr(request.state, "currentUser", None)
+    if user is not None:
+        return user
+
+    user = await UserRepository(session).queryId(int(tokenData.userId))
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User for this token no longer exists",
+        )
+    request.state.currentUser = user
+    return user
+
+
+# Require the admin secret header for operational endpoints
+async def requireAdmin(request: Request) -> None:
+    """Require the configured admin secret in the X-Admin-Secret header"""
+    providedSecret = request.headers.get("X-Admin-Secret", "")
+    if not getSettings.ADMIN_SECRET or not hmac.compare_digest(
+        providedSecret.encode(), getSettings.ADMIN_SECRET.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+
 
 # Common dependencies alias
 databaseDep = Depends(getAsyncSession)
+currentTokenDep = Depends(getCurrentTokenData)
 currentUserIdDep = Depends(getCurrentUserId)
+currentUserDep = Depends(getCurrentUser)
+adminDep = Depends(requireAdmin)
 
 # UserService dependency alias
 userServiceDep = Depends(getUserService)
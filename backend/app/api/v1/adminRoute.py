@@ -0,0 +1,146 @@
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.api.dependency import adminDep
+from app.core.database import getDatabaseManager
+from app.core.orderArchive import getOrderArchiver
+from app.core.profiling import listProfiles
+from app.core.settings import getSettings
+from app.repository.auditRepo import AuditRepository
+from app.repository.orderRepo import OrderRepository
+from app.schemas.auditSchema import AuditEventResponseSchema
+from app.schemas.inventorySchema import StockResponseSchema, StockUpdateSchema
+from app.schemas.orderSchema import OrderArchiveResponseSchema
+from app.schemas.smsCampaignSchema import (
+    SmsCampaignCreateSchema,
+    SmsCampaignResponseSchema,
+)
+from app.schemas.userSchema import MessageResponseSchema
+from app.services.inventoryService import InventoryService
+from app.services.smsCampaignService import SmsCampaignService, startCampaign
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import FileResponse
+
+adminRoutes = APIRouter(dependencies=[adminDep])
+
+logger = logging.getLogger(__name__)
+
+
+@adminRoutes.get(
+    "/profiles",
+    status_code=status.HTTP_200_OK,
+)
+async def getProfiles() -> List[Dict[str, Any]]:
+    return listProfiles(getSettings.PROFILING_OUTPUT_DIR)
+
+
+@adminRoutes.get(
+    "/profiles/{name}",
+    status_code=status.HTTP_200_OK,
+)
+async def getProfile(name: str) -> FileResponse:
+    outputDir = os.path.realpath(getSettings.PROFILING_OUTPUT_DIR)
+    path = os.path.realpath(os.path.join(outputDir, name))
+    if os.path.dirname(path) != outputDir or not os.path.isfile(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    logger.info(f"Serving profile {name}")
+    return FileResponse(path, filename=name)
+
+
+@adminRoutes.post(
+    "/smsCampaigns",
+    response_model=MessageResponseSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def createSmsCampaign(data: SmsCampaignCreateSchema) -> MessageResponseSchema:
+    # Re-posting an interrupted campaign's name resumes it from its checkpoint
+    if not startCampaign(
+        getDatabaseManager().asyncSessionMaker, data.name, data.message, data.verifiedOnly
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Campaign is already running",
+        )
+    logger.info(f"SMS campaign {data.name} queued")
+    return MessageResponseSchema(message="SMS campaign started")
+
+
+@adminRoutes.get(
+    "/smsCampaigns/{name}",
+    response_model=SmsCampaignResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def getSmsCampaign(name: str) -> SmsCampaignResponseSchema:
+    campaign = await SmsCampaignService(
+        getDatabaseManager().asyncSessionMaker
+    ).getCampaign(name)
+    if campaign is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Campaign not found",
+        )
+    return SmsCampaignResponseSchema.model_validate(campaign)
+
+
+@adminRoutes.get(
+    "/auditEvents",
+    response_model=List[AuditEventResponseSchema],
+    status_code=status.HTTP_200_OK,
+)
+async def getAuditEvents(
+    userId: Optional[int] = None,
+    eventType: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+) -> List[AuditEventResponseSchema]:
+    # Events still buffered in memory show up after the next flush
+    async with getDatabaseManager().asyncSessionMaker() as session:
+        events = await AuditRepository(session).query(
+            userId, eventType, since, until, limit
+        )
+    return [AuditEventResponseSchema.model_validate(event) for event in events]
+
+
+@adminRoutes.put(
+    "/inventory/{sku}",
+    response_model=StockResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def setStock(sku: str, data: StockUpdateSchema) -> StockResponseSchema:
+    async with getDatabaseManager().asyncSessionMaker() as session:
+        stock = await InventoryService(session).setStock(sku, data)
+    return StockResponseSchema.model_validate(stock)
+
+
+@adminRoutes.get(
+    "/orderArchives",
+    response_model=List[OrderArchiveResponseSchema],
+    status_code=status.HTTP_200_OK,
+)
+async def getOrderArchives(
+    since: Optional[datetime] = None, until: Optional[datetime] = None
+) -> List[OrderArchiveResponseSchema]:
+    async with getDatabaseManager().asyncSessionMaker() as session:
+        archives = await OrderRepository(session).listArchives(since, until)
+    return [OrderArchiveResponseSchema.model_validate(archive) for archive in archives]
+
+
+@adminRoutes.post(
+    "/orderArchives",
+    response_model=MessageResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def archiveOrders() -> MessageResponseSchema:
+    # Runs in the request; archiving a large month can take a while
+    archived = await getOrderArchiver().maintain()
+    logger.info(f"Archived {len(archived)} months of orders")
+    return MessageResponseSchema(
+        message=f"Archived {sum(item['rowCount'] for item in archived)} orders "
+        f"from {len(archived)} months"
+    )
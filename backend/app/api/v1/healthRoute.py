@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Response, status
+
+from app.core.health import getHealthMonitor
+from app.core.shutdown import getShutdownManager
+from app.schemas.healthSchema import (
+    LivenessResponseSchema,
+    ProbeResultSchema,
+    ReadinessResponseSchema,
+)
+
+healthRoutes = APIRouter()
+
+
+@healthRoutes.get(
+    "/live",
+    response_model=LivenessResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def getLiveness() -> LivenessResponseSchema:
+    # Answering at all means the event loop is running; no dependency checks
+    return LivenessResponseSchema(status="alive")
+
+
+@healthRoutes.get(
+    "/ready",
+    response_model=ReadinessResponseSchema,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessResponseSchema}},
+)
+async def getReadiness(response: Response) -> ReadinessResponseSchema:
+    # Served from the cached probe results; never touches the dependencies
+    monitor = getHealthMonitor()
+    ready, reason = monitor.readiness(draining=not getShutdownManager().ready)
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    now = monitor.clock()
+    return ReadinessResponseSchema(
+        status="ready" if ready else "not_ready",
+        reason=reason,
+        checks={
+            name: ProbeResultSchema(
+                ok=result.ok,
+                critical=result.critical,
+                latencyMs=round(result.latencyMs, 2),
+                ageSeconds=round(now - result.checkedAt, 2),
+                detail=result.detail,
+                error=result.error,
+            )
+            for name, result in monitor.results.items()
+        },
+    )
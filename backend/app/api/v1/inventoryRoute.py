@@ -0,0 +1,81 @@
+import logging
+
+from app.api.dependency import currentTokenDep, databaseDep
+from app.schemas.inventorySchema import (
+    ReservationCreateSchema,
+    ReservationResponseSchema,
+    StockResponseSchema,
+)
+from app.schemas.orderSchema import OrderResponseSchema
+from app.schemas.userSchema import MessageResponseSchema
+from app.services.inventoryService import InventoryService
+from app.utils.jwtHandler import TokenData
+from fastapi import APIRouter, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+inventoryRoutes = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+
+@inventoryRoutes.get(
+    "/{sku}",
+    response_model=StockResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def getStock(sku: str, db: AsyncSession = databaseDep) -> StockResponseSchema:
+    stock = await InventoryService(db).getStock(sku)
+    return StockResponseSchema.model_validate(stock)
+
+
+@inventoryRoutes.post(
+    "/{sku}/reservations",
+    response_model=ReservationResponseSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+async def reserveStock(
+    sku: str,
+    data: ReservationCreateSchema,
+    tokenData: TokenData = currentTokenDep,
+    db: AsyncSession = databaseDep,
+) -> ReservationResponseSchema:
+    reservation = await InventoryService(db).reserve(
+        sku, int(tokenData.userId), data.quantity
+    )
+    logger.info(
+        f"Stock reserved: {sku}",
+        extra={"userId": tokenData.userId, "reservationId": reservation.Id},
+    )
+    return ReservationResponseSchema.model_validate(reservation)
+
+
+@inventoryRoutes.post(
+    "/reservations/{reservationId}/checkout",
+    response_model=OrderResponseSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+async def checkoutReservation(
+    reservationId: int,
+    tokenData: TokenData = currentTokenDep,
+    db: AsyncSession = databaseDep,
+) -> OrderResponseSchema:
+    order = await InventoryService(db).checkout(reservationId, int(tokenData.userId))
+    logger.info(
+        f"Reservation checked out: {reservationId}",
+        extra={"userId": tokenData.userId, "orderId": order.Id},
+    )
+    return OrderResponseSchema.model_validate(order)
+
+
+@inventoryRoutes.delete(
+    "/reservations/{reservationId}",
+    response_model=MessageResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def releaseReservation(
+    reservationId: int,
+    tokenData: TokenData = currentTokenDep,
+    db: AsyncSession = databaseDep,
+) -> MessageResponseSchema:
+    await InventoryService(db).release(reservationId, int(tokenData.userId))
+    return MessageResponseSchema(message="Reservation released")
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import getMetricsRegistry
+
+metricsRoutes = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@metricsRoutes.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    include_in_schema=False,
+)
+async def getMetrics() -> PlainTextResponse:
+    # Scraped by Prometheus; keep it off the public ingress
+    return PlainTextResponse(
+        getMetricsRegistry().render(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
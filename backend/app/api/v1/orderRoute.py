@@ -0,0 +1,32 @@
+import logging
+from datetime import datetime
+from typing import Optional
+
+from app.api.dependency import currentTokenDep, databaseDep
+from app.schemas.orderSchema import OrderHistoryResponseSchema
+from app.services.orderService import OrderService
+from app.utils.jwtHandler import TokenData
+from fastapi import APIRouter, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+orderRoutes = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+
+@orderRoutes.get(
+    "",
+    response_model=OrderHistoryResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def getOrderHistory(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    includeArchived: bool = False,
+    limit: int = Query(100, ge=1, le=1000),
+    tokenData: TokenData = currentTokenDep,
+    db: AsyncSession = databaseDep,
+) -> OrderHistoryResponseSchema:
+    return await OrderService(db).getHistory(
+        int(tokenData.userId), since, until, includeArchived, limit
+    )
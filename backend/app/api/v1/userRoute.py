@@ -1,7 +1,14 @@
 import logging
 
-from app.api.dependency import currentUserIdDep, databaseDep, userServiceDep
+from app.api.dependency import (
+    currentTokenDep,
+    currentUserDep,
+    databaseDep,
+    userServiceDep,
+)
+from app.models.userModel import User
 from app.schemas.userSchema import (
+    CurrentUserSchema,
     MessageResponseSchema,
     UserChangePasswordSchema,
     UserCreateSchema,
@@ -10,8 +17,9 @@ from app.schemas.userSchema import (
     UserResetPasswordSchema,
     VerifyOtpSchema,
 )
-from app.services.userService import UserService
-from fastapi import APIRouter, Response, status
+from app.services.userService import REFRESH_TOKEN_COOKIE, UserService
+from app.utils.jwtHandler import TokenData
+from fastapi import APIRouter, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 userRoutes = APIRouter()
@@ -143,17 +151,77 @@ async def resetPassword(
 async def changePassword(
     data: UserChangePasswordSchema,
     service: UserService = userServiceDep,
-    currentUserId: int = currentUserIdDep,
+    currentUser: User = currentUserDep,
+    tokenData: TokenData = currentTokenDep,
     db: AsyncSession = databaseDep,
 ) -> MessageResponseSchema:
     try:
-        await service.changePassword(currentUserId, data)
+        await service.changePassword(currentUser, data, tokenData.sessionId)
         logger.info(
-            f"User password changed successfully: {currentUserId}",
+            f"User password changed successfully: {currentUser.Id}",
         )
         return MessageResponseSchema(message="Password changed successfully")
     except Exception as e:
         logger.error(
-            f"Error changing password for user {currentUserId}: {str(e)}",
+            f"Error changing password for user {currentUser.Id}: {str(e)}",
+        )
+        raise
+
+
+@userRoutes.get(
+    "/me",
+    response_model=CurrentUserSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def me(tokenData: TokenData = currentTokenDep) -> CurrentUserSchema:
+    # Served from the token claims, no database round trip
+    return CurrentUserSchema(
+        userId=tokenData.userId,
+        phoneNumber=tokenData.phoneNumber,
+        fullName=tokenData.fullName,
+    )
+
+
+@userRoutes.post(
+    "/refresh",
+    response_model=MessageResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def refresh(
+    request: Request,
+    response: Response,
+    service: UserService = userServiceDep,
+    db: AsyncSession = databaseDep,
+) -> MessageResponseSchema:
+    try:
+        await service.refreshSession(request.cookies.get(REFRESH_TOKEN_COOKIE), response)
+        return MessageResponseSchema(message="Session refreshed successfully")
+    except Exception as e:
+        logger.error(
+            f"Error refreshing session: {str(e)}",
+        )
+        raise
+
+
+@userRoutes.post(
+    "/logout",
+    response_model=MessageResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def logout(
+    response: Response,
+    service: UserService = userServiceDep,
+    tokenData: TokenData = currentTokenDep,
+    db: AsyncSession = databaseDep,
+) -> MessageResponseSchema:
+    try:
+        await service.logoutUser(tokenData, response)
+        logger.info(
+            f"User logged out successfully: {tokenData.userId}",
+        )
+        return MessageResponseSchema(message="User logged out successfully")
+    except Exception as e:
+        logger.error(
+            f"Error logging out user: {str(e)}",
         )
         raise
@@ -0,0 +1 @@
+"""Operational command line tools, run with ``python -m app.cli.<tool>``."""
@@ -0,0 +1,52 @@
+"""Normalize stored phone numbers to canonical E.164 form.
+
+    python -m app.cli.backfillPhoneNumbers [--batch-size 1000]
+
+Migration 0009 runs the same backfill; this command lets it run ahead of a
+deploy on large tables, and lists duplicate accounts that it could not
+normalize because another user already owns the canonical number.
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+
+from sqlalchemy.engine import Connection
+
+from app.core.database import getDatabaseManager
+
+_migration = importlib.import_module("app.migrations.r0009_normalize_phone_numbers")
+
+
+async def _run(batchSize: int) -> None:
+    databaseManager = getDatabaseManager()
+
+    def backfill(conn: Connection) -> None:
+        for tableName, unique in (("users", True), ("otps", False)):
+            stats = _migration.backfillTable(conn, tableName, unique, batchSize)
+            print(
+                f"{tableName}: scanned {stats['scanned']}, updated {stats['updated']}, "
+                f"invalid {stats['invalid']}, conflicts {stats['conflicts']}"
+            )
+
+    try:
+        async with databaseManager.asyncEngine.connect() as conn:
+            # Each batch commits on its own so the tables are never locked for long
+            autocommitConn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await autocommitConn.run_sync(backfill)
+    finally:
+        await databaseManager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=_migration.BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Pick argon2 cost parameters that fit a verify latency target on this host.
+
+    python -m app.cli.calibrateArgon2 --target-ms 250 --max-memory-mib 128
+
+For every memory size (halving from the budget down to --min-memory-mib) the
+time cost is raised until the median verify latency exceeds the target. The
+strongest fitting setting (memory x passes, ties to more memory) is printed
+as ARGON2_* environment lines. Use --concurrency to measure while that many
+verifies run in parallel, as they would across busy workers. Existing hashes
+are upgraded on the next successful login.
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from app.core.workers import availableCpus
+
+SAMPLE_PASSWORD = "calibration-Password-123"
+
+
+@dataclass
+class Candidate:
+    memoryCostKib: int
+    timeCost: int
+    parallelism: int
+    medianMs: float
+    p95Ms: float
+
+    @property
+    def strength(self) -> int:
+        return self.memoryCostKib * self.timeCost
+
+
+def measure(
+    memoryCostKib: int, timeCost: int, parallelism: int, samples: int, concurrency: int
+) -> Candidate:
+    """Median and p95 verify latency for one parameter set"""
+    from passlib.hash import argon2
+
+    handler = argon2.using(
+        memory_cost=memoryCostKib, time_cost=timeCost, parallelism=parallelism
+    )
+    hashed = handler.hash(SAMPLE_PASSWORD)
+
+    def verifyOnce(_: int) -> float:
+        startTime = time.perf_counter()
+        handler.verify(SAMPLE_PASSWORD, hashed)
+        return (time.perf_counter() - startTime) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        timings = sorted(pool.map(verifyOnce, range(samples * concurrency)))
+    return Candidate(
+        memoryCostKib=memoryCostKib,
+        timeCost=timeCost,
+        parallelism=parallelism,
+        medianMs=statistics.median(timings),
+        p95Ms=timings[min(len(timings) - 1, int(0.95 * len(timings)))],
+    )
+
+
+def calibrate(
+    targetMs: float,
+    maxMemoryMib: int,
+    minMemoryMib: int,
+    maxTimeCost: int,
+    parallelism: int,
+    samples: int,
+    concurrency: int,
+    verbose: bool = True,
+) -> Optional[Candidate]:
+    """Return the strongest parameters whose median verify time fits targetMs"""
+    fitting: List[Candidate] = []
+    memoryMib = maxMemoryMib
+    while memoryMib >= minMemoryMib:
+        for timeCost in range(1, maxTimeCost + 1):
+            candidate = measure(memoryMib * 1024, timeCost, parallelism, samples, concurrency)
+            if verbose:
+                print(
+                    f"m={memoryMib:>4} MiB t={timeCost:>2} p={parallelism}: "
+                    f"median {candidate.medianMs:7.1f} ms  p95 {candidate.p95Ms:7.1f} ms"
+                )
+            if candidate.medianMs > targetMs:
+                break
+            fitting.append(candidate)
+        memoryMib //= 2
+
+    if not fitting:
+        return None
+    return max(fitting, key=lambda c: (c.strength, c.memoryCostKib))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Median verify latency target")
+    parser.add_argument("--max-memory-mib", type=int, default=128, help="Memory budget per hash")
+    parser.add_argument("--min-memory-mib", type=int, default=16)
+    parser.add_argument("--max-time-cost", type=int, default=10)
+    parser.add_argument("--parallelism", type=int, default=min(4, availableCpus()))
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    best = calibrate(
+        targetMs=args.target_ms,
+        maxMemoryMib=args.max_memory_mib,
+        minMemoryMib=args.min_memory_mib,
+        maxTimeCost=args.max_time_cost,
+        parallelism=args.parallelism,
+        samples=args.samples,
+        concurrency=args.concurrency,
+        verbose=not args.json,
+    )
+    if best is None:
+        raise SystemExit(
+            f"No setting with at least {args.min_memory_mib} MiB fits {args.target_ms} ms"
+        )
+
+    if args.json:
+        import json
+
+        print(json.dumps(asdict(best)))
+        return
+    print(
+        f"\nSelected: median {best.medianMs:.1f} ms, p95 {best.p95Ms:.1f} ms\n"
+        f"ARGON2_MEMORY_COST={best.memoryCostKib}\n"
+        f"ARGON2_TIME_COST={best.timeCost}\n"
+        f"ARGON2_PARALLELISM={best.parallelism}"
+    )
+
+
+if __name__ == "__main__":
+    main()
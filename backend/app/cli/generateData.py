@@ -0,0 +1,472 @@
+"""Fill the database with synthetic users, OTPs and orders for scale testing.
+
+    python -m app.cli.generateData --users 2000000 --otps 5000000 --orders 10000000 --seed 7
+
+Rows are generated in fixed-size chunks, each from its own seeded random
+stream, so the same --seed, sizes and --end produce the same rows in an
+empty database however many --workers generate them or in which order the
+chunks finish. Chunks
+are generated in worker processes and written by up to --connections
+concurrent connections: COPY on PostgreSQL (asyncpg), executemany batches
+elsewhere.
+
+The data is skewed the way production data is: operator prefixes by market
+share, signups growing over time, a few users placing most orders, mostly
+single-item orders with a long tail, and activity peaking in the Cambodian
+evening. Every generated user has the password GENERATED_PASSWORD.
+
+Intended for scratch databases: generated phone numbers are unique among
+themselves, across runs too, but may collide with numbers of real accounts.
+"""
+
+import argparse
+import asyncio
+import bisect
+import concurrent.futures
+import functools
+import hashlib
+import itertools
+import logging
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import app.models  # noqa: F401
+from app.core import partitions
+from app.models.base import ServiceBase
+
+logger = logging.getLogger(__name__)
+
+GENERATED_PASSWORD = "generatedPassword1"
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Subscriber numbers are a bijection of the user Id onto seven digits
+SUBSCRIBER_SPACE = 10**7
+_SUBSCRIBER_MULTIPLIER = 3_141_593  # coprime with 10, so the mapping is one to one
+
+# Mobile prefixes (without the trunk 0) weighted by rough market share
+PHONE_PREFIXES: Tuple[Tuple[str, float], ...] = (
+    ("12", 14.0), ("97", 10.0), ("88", 9.0), ("10", 8.0), ("15", 6.0),
+    ("16", 6.0), ("17", 5.0), ("96", 5.0), ("11", 4.0), ("69", 4.0),
+    ("70", 4.0), ("71", 3.0), ("77", 3.0), ("81", 3.0), ("86", 3.0),
+    ("87", 3.0), ("89", 2.0), ("92", 2.0), ("93", 2.0), ("98", 2.0),
+    ("60", 1.0), ("66", 1.0), ("67", 1.0), ("68", 1.0), ("90", 1.0),
+    ("95", 1.0), ("99", 1.0), ("31", 0.5),
+)
+_PREFIX_WEIGHTS = list(itertools.accumulate(weight for _, weight in PHONE_PREFIXES))
+
+FIRST_NAMES = (
+    "Sokha", "Dara", "Vanna", "Sophea", "Chenda", "Rithy", "Bopha", "Sovann",
+    "Kosal", "Sreymom", "Vichea", "Pisey", "Rathana", "Sreyneang", "Piseth",
+    "Borey", "Channary", "Vuthy", "Sophal", "Mealea",
+)
+LAST_NAMES = (
+    "Chan", "Sok", "Kim", "Heng", "Chea", "Ly", "Meas", "Prak", "Phan", "Keo",
+    "Seng", "Nguon", "Touch", "Yim", "Lim", "Noun", "Hem", "Pov", "Sim", "Tep",
+)
+
+# Catalog as (product, price); popularity falls off with position (Zipf)
+PRODUCTS: Tuple[Tuple[str, float], ...] = (
+    ("Phone top-up card", 5.0), ("Drinking water 24-pack", 3.5), ("Instant noodles box", 6.0),
+    ("Jasmine rice 5kg", 7.25), ("Fish sauce", 1.75), ("Coffee 3-in-1 pack", 4.5),
+    ("Cooking oil 1L", 2.8), ("Sugar 1kg", 1.2), ("Laundry detergent", 5.6),
+    ("Shampoo", 3.9), ("Toothpaste", 1.9), ("Energy drink 6-pack", 4.2),
+    ("Condensed milk", 1.4), ("Soy sauce", 1.3), ("Dish soap", 1.6),
+    ("Phone charger", 8.5), ("Earphones", 12.0), ("Power bank", 19.9),
+    ("Rice cooker", 35.0), ("Electric fan", 28.0), ("Mosquito net", 9.5),
+    ("School backpack", 15.0), ("Sandals", 6.5), ("T-shirt", 7.0),
+    ("Krama scarf", 4.0), ("Helmet", 22.0), ("Motorbike oil", 6.8),
+    ("Smartphone", 189.0), ("Tablet", 249.0), ("Bluetooth speaker", 39.0),
+)
+_PRODUCT_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) ** 1.1 for rank in range(len(PRODUCTS))))
+
+# Share of activity by local (UTC+7) hour: quiet nights, lunch bump, evening peak
+HOUR_WEIGHTS = (
+    1, 0.6, 0.4, 0.3, 0.3, 0.6, 1.5, 2.5, 3.5, 4, 4.5, 5,
+    6, 5.5, 4.5, 4.5, 5, 6, 7.5, 9, 10, 9, 6, 3,
+)
+_HOUR_CUMULATIVE = list(itertools.accumulate(HOUR_WEIGHTS))
+LOCAL_UTC_OFFSET = timedelta(hours=7)
+
+USER_COLUMNS = ("Id", "fullName", "phoneNumber", "hashedPassword", "isVerified", "createdAt", "lastLoginAt")
+OTP_COLUMNS = ("phoneNumber", "otpCode", "createdAt", "expiresAt", "isUsed", "attempts")
+ORDER_COLUMNS = ("userId", "productName", "quantity", "pricePerUnit", "totalPrice", "orderedAt")
+
+
+class Plan:
+    """Everything a chunk generator needs; picklable for worker processes"""
+
+    def __init__(
+        self,
+        seed: int,
+        firstUserId: int,
+        users: int,
+        end: datetime,
+        years: float,
+        hashedPassword: str,
+    ) -> None:
+        self.seed = seed
+        self.firstUserId = firstUserId
+        self.users = users
+        self.end = end
+        self.start = end - timedelta(days=365.25 * years)
+        self.hashedPassword = hashedPassword
+
+    @property
+    def span(self) -> timedelta:
+        return self.end - self.start
+
+    def rng(self, table: str, chunkIndex: int) -> random.Random:
+        return random.Random(f"{self.seed}:{table}:{chunkIndex}")
+
+    def userCreatedAt(self, userId: int) -> datetime:
+        """Signup time of a generated user; later Ids signed up later
+
+        Signups grow linearly over the period, so the cumulative share of
+        users at time t is t squared and position p signed up at sqrt(p).
+        """
+        position = (userId - self.firstUserId + _unitHash(self.seed, userId)) / max(self.users, 1)
+        return self.start + self.span * math.sqrt(min(position, 1.0))
+
+
+@functools.lru_cache(maxsize=None)
+def _seedOffset(seed: int) -> int:
+    digest = hashlib.sha256(str(seed).encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def _unitHash(seed: int, value: int) -> float:
+    """Deterministic value in [0, 1) for (seed, value), without an RNG"""
+    return (((value + _seedOffset(seed)) * 2_654_435_761) % 2**32) / 2**32
+
+
+def phoneNumberFor(seed: int, userId: int) -> str:
+    """The E.164 phone number generated for userId under seed
+
+    Benchmarks use this to address generated users without reading them back.
+    """
+    prefix = PHONE_PREFIXES[
+        bisect.bisect(_PREFIX_WEIGHTS, _unitHash(seed, userId) * _PREFIX_WEIGHTS[-1])
+    ][0]
+    # Independent of the seed, so runs with different seeds never collide
+    subscriber = userId * _SUBSCRIBER_MULTIPLIER % SUBSCRIBER_SPACE
+    return f"+855{prefix}{subscriber:07d}"
+
+
+def _activityTime(rng: random.Random, earliest: datetime, end: datetime, recency: float) -> datetime:
+    """A timestamp between earliest and end, denser towards end, at a realistic hour
+
+    recency > 1 pulls days towards end (u ** (1 / recency)).
+    """
+    days = max((end - earliest).days, 0)
+    day = int(days * rng.random() ** (1 / recency))
+    localHour = bisect.bisect(_HOUR_CUMULATIVE, rng.random() * _HOUR_CUMULATIVE[-1])
+    value = (
+        earliest.replace(hour=0, minute=0, second=0, microsecond=0)
+        + timedelta(days=day, hours=localHour, seconds=rng.randrange(3600))
+        - LOCAL_UTC_OFFSET
+    )
+    return min(max(value, earliest), end)
+
+
+def generateUsers(plan: Plan, chunkIndex: int, chunkSize: int) -> List[tuple]:
+    rng = plan.rng("users", chunkIndex)
+    firstId = plan.firstUserId + chunkIndex * chunkSize
+    lastId = min(firstId + chunkSize, plan.firstUserId + plan.users)
+    rows = []
+    for userId in range(firstId, lastId):
+        createdAt = plan.userCreatedAt(userId)
+        lastLoginAt = None
+        if rng.random() < 0.8:
+            lastLoginAt = createdAt + (plan.end - createdAt) * rng.random() ** (1 / 3)
+        rows.append(
+            (
+                userId,
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {userId}",
+                phoneNumberFor(plan.seed, userId),
+                plan.hashedPassword,
+                rng.random() < 0.9,
+                createdAt,
+                lastLoginAt,
+            )
+        )
+    return rows
+
+
+def _activeUser(plan: Plan, rng: random.Random) -> int:
+    """A generated user Id; early users are far more active than late ones"""
+    return plan.firstUserId + int(plan.users * rng.random() ** 2.5)
+
+
+def generateOtps(plan: Plan, chunkIndex: int, chunkSize: int, total: int) -> List[tuple]:
+    rng = plan.rng("otps", chunkIndex)
+    rows = []
+    for _ in range(min(chunkSize, total - chunkIndex * chunkSize)):
+        if plan.users and rng.random() < 0.85:
+            phoneNumber = phoneNumberFor(plan.seed, _activeUser(plan, rng))
+        else:
+            # Sign-up attempts that never completed, and mistyped numbers
+            prefix = rng.choice(PHONE_PREFIXES)[0]
+            phoneNumber = f"+855{prefix}{rng.randrange(SUBSCRIBER_SPACE):07d}"
+        # OTPs are short-lived; most of the table is the last few weeks
+        createdAt = _activityTime(rng, plan.end - timedelta(days=90), plan.end, 4.0)
+        roll = rng.random()
+        attempts = 0 if roll < 0.7 else 1 if roll < 0.9 else rng.randint(2, 5)
+        rows.append(
+            (
+                phoneNumber,
+                f"{rng.randrange(10**6):06d}",
+                createdAt,
+                createdAt + timedelta(minutes=5),
+                rng.random() < 0.8,
+                attempts,
+            )
+        )
+    return rows
+
+
+def generateOrders(plan: Plan, chunkIndex: int, chunkSize: int, total: int) -> List[tuple]:
+    rng = plan.rng("orders", chunkIndex)
+    rows = []
+    for _ in range(min(chunkSize, total - chunkIndex * chunkSize)):
+        userId = _activeUser(plan, rng)
+        productName, price = PRODUCTS[
+            bisect.bisect(_PRODUCT_WEIGHTS, rng.random() * _PRODUCT_WEIGHTS[-1])
+        ]
+        # Mostly one item, a geometric tail, and the occasional bulk purchase
+        if rng.random() < 0.01:
+            quantity = rng.randint(10, 100)
+        else:
+            quantity = 1 + min(int(rng.expovariate(1.2)), 19)
+        orderedAt = _activityTime(rng, plan.userCreatedAt(userId), plan.end, 1.5)
+        rows.append((userId, productName, quantity, price, round(quantity * price, 2), orderedAt))
+    return rows
+
+
+async def _writeRows(
+    engine: AsyncEngine, table: str, columns: Sequence[str], rows: List[tuple]
+) -> None:
+    async with engine.connect() as conn:
+        if conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg":
+            rawConnection = await conn.get_raw_connection()
+            await rawConnection.driver_connection.copy_records_to_table(
+                table, records=rows, columns=list(columns)
+            )
+            return
+        # Through the mapped table so column types convert the values
+        await conn.execute(
+            ServiceBase.metadata.tables[table].insert(),
+            [dict(zip(columns, row)) for row in rows],
+        )
+        await conn.commit()
+
+
+async def _generateTable(
+    engine: AsyncEngine,
+    table: str,
+    columns: Sequence[str],
+    generator: Callable[..., List[tuple]],
+    chunkArgs: List[tuple],
+    pool: Optional[concurrent.futures.Executor],
+    connections: int,
+) -> int:
+    """Generate and write chunks, at most connections of them in flight"""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(connections)
+    written = 0
+
+    async def runChunk(args: tuple) -> None:
+        nonlocal written
+        async with semaphore:
+            if pool is None:
+                rows = generator(*args)
+            else:
+                rows = await loop.run_in_executor(pool, generator, *args)
+            await _writeRows(engine, table, columns, rows)
+            written += len(rows)
+
+    startTime = time.monotonic()
+    await asyncio.gather(*(runChunk(args) for args in chunkArgs))
+    elapsed = time.monotonic() - startTime
+    logger.info(
+        f"Generated {written} {table}",
+        extra={
+            "operation": "generate_data",
+            "table": table,
+            "rows": written,
+            "rows_per_s": round(written / elapsed) if elapsed else None,
+        },
+    )
+    return written
+
+
+def _prepareOrderPartitions(conn: Connection, start: datetime, end: datetime) -> None:
+    """On partitioned PostgreSQL, give every generated month its own partition
+
+    A month whose rows already sit in the default partition cannot get one;
+    those rows keep going to the default partition.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    existing = set(partitions.listPartitions(conn, "orders"))
+    month = partitions.monthStart(start)
+    while month <= end:
+        if partitions.partitionName("orders", month) not in existing:
+            try:
+                with conn.begin_nested():
+                    partitions.createMonthlyPartition(conn, "orders", month)
+            except Exception as e:
+                logger.warning(
+                    f"No partition for {month:%Y-%m}: {e}",
+                    extra={"operation": "generate_data", "table": "orders"},
+                )
+        month = partitions.addMonths(month, 1)
+
+
+def _chunkCount(total: int, chunkSize: int) -> int:
+    return (total + chunkSize - 1) // chunkSize
+
+
+async def generateData(
+    engine: AsyncEngine,
+    users: int = 0,
+    otps: int = 0,
+    orders: int = 0,
+    seed: int = 0,
+    end: Optional[datetime] = None,
+    years: float = 3.0,
+    chunkSize: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    connections: int = 4,
+    hashedPassword: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Generate and insert synthetic rows; returns counts and the generated Id range
+
+    Orders and most OTPs belong to the users generated in the same call.
+    end defaults to the start of the current UTC day; pass it explicitly to
+    reproduce a data set on another day. With workers > 1 chunks are
+    generated in that many processes.
+    """
+    if orders and not users:
+        raise ValueError("Orders are generated for the users of the same run; pass users")
+    if end is None:
+        end = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if hashedPassword is None:
+        from app.core.security import SecurityManager
+
+        hashedPassword = SecurityManager.hashPassword(GENERATED_PASSWORD)
+
+    async with engine.connect() as conn:
+        firstUserId = (
+            await conn.execute(text('SELECT coalesce(max("Id"), 0) + 1 FROM users'))
+        ).scalar_one()
+    if firstUserId + users > SUBSCRIBER_SPACE:
+        raise ValueError(f"At most {SUBSCRIBER_SPACE - 1} generated users per database")
+
+    plan = Plan(seed, firstUserId, users, end, years, hashedPassword)
+    # SQLite has a single writer; more connections only contend for its lock
+    if engine.dialect.name == "sqlite":
+        connections = 1
+    startTime = time.monotonic()
+    pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        generated = {"users": 0, "otps": 0, "orders": 0}
+        if users:
+            generated["users"] = await _generateTable(
+                engine, "users", USER_COLUMNS, generateUsers,
+                [(plan, index, chunkSize) for index in range(_chunkCount(users, chunkSize))],
+                pool, connections,
+            )
+            if engine.dialect.name == "postgresql":
+                # Ids were given explicitly; move the sequence past them
+                async with engine.begin() as conn:
+                    await conn.execute(
+                        text(
+                            "SELECT setval(pg_get_serial_sequence('users', 'Id'), "
+                            '(SELECT max("Id") FROM users))'
+                        )
+                    )
+        if otps:
+            generated["otps"] = await _generateTable(
+                engine, "otps", OTP_COLUMNS, generateOtps,
+                [(plan, index, chunkSize, otps) for index in range(_chunkCount(otps, chunkSize))],
+                pool, connections,
+            )
+        if orders:
+            async with engine.begin() as conn:
+                await conn.run_sync(_prepareOrderPartitions, plan.start, plan.end)
+            generated["orders"] = await _generateTable(
+                engine, "orders", ORDER_COLUMNS, generateOrders,
+                [(plan, index, chunkSize, orders) for index in range(_chunkCount(orders, chunkSize))],
+                pool, connections,
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return {
+        **generated,
+        "firstUserId": firstUserId,
+        "lastUserId": firstUserId + users - 1,
+        "seconds": round(time.monotonic() - startTime, 2),
+    }
+
+
+async def _run(args: argparse.Namespace) -> None:
+    from app.core.database import getDatabaseManager
+    from app.core.settings import getSettings
+
+    databaseManager = getDatabaseManager()
+    try:
+        await databaseManager.checkSchemaVersion(
+            autoMigrate=getSettings.DATABASE_AUTO_MIGRATE
+        )
+        end = datetime.fromisoformat(args.end) if args.end else None
+        if end is not None and end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
+        result = await generateData(
+            databaseManager.asyncEngine,
+            users=args.users,
+            otps=args.otps,
+            orders=args.orders,
+            seed=args.seed,
+            end=end,
+            years=args.years,
+            chunkSize=args.chunk_size,
+            workers=args.workers,
+            connections=args.connections,
+        )
+        print(
+            f"users {result['users']} (Id {result['firstUserId']}..{result['lastUserId']}), "
+            f"otps {result['otps']}, orders {result['orders']} in {result['seconds']}s"
+        )
+    finally:
+        await databaseManager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=0)
+    parser.add_argument("--otps", type=int, default=0)
+    parser.add_argument("--orders", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--end", help="ISO date the generated history ends at (default: today)")
+    parser.add_argument("--years", type=float, default=3.0, help="Length of the signup history")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=4, help="Generator processes")
+    parser.add_argument("--connections", type=int, default=4, help="Concurrent writers")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Apply and inspect database schema migrations.
+
+    python -m app.cli.migrate upgrade [--to REVISION]
+    python -m app.cli.migrate current
+    python -m app.cli.migrate history
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app.core.database import getDatabaseManager
+from app.core.migrations import MigrationRunner
+
+
+async def _run(args: argparse.Namespace) -> None:
+    databaseManager = getDatabaseManager()
+    runner = MigrationRunner(databaseManager.asyncEngine)
+    try:
+        if args.command == "upgrade":
+            applied = await runner.upgrade(target=args.to)
+            print(f"Applied: {', '.join(applied)}" if applied else "Already up to date")
+        elif args.command == "current":
+            print(f"current: {await runner.currentRevision()}  head: {runner.headRevision}")
+        elif args.command == "history":
+            current = await runner.currentRevision()
+            for migration in runner.migrations:
+                applied = current is not None and migration.revision <= current
+                mode = "" if migration.transactional else " [online]"
+                print(
+                    f"{'*' if applied else ' '} {migration.revision}  "
+                    f"{migration.description}{mode}"
+                )
+    finally:
+        await databaseManager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Database schema migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    upgradeParser = subparsers.add_parser("upgrade", help="Apply pending revisions")
+    upgradeParser.add_argument("--to", help="Stop after this revision")
+    subparsers.add_parser("current", help="Show the applied revision")
+    subparsers.add_parser("history", help="List revisions, marking applied ones")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
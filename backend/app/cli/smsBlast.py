@@ -0,0 +1,66 @@
+"""Send or resume a bulk SMS campaign to users.
+
+    python -m app.cli.smsBlast --name promo-2024-10 --message "20% off this week"
+    python -m app.cli.smsBlast --name promo-2024-10 --status
+
+Running the same --name again after an interruption resumes after the last
+checkpointed user with the campaign's original message.
+"""
+
+import argparse
+import asyncio
+import logging
+
+import app.models  # noqa: F401
+from app.core.database import getDatabaseManager
+from app.core.sharedState import getSharedState
+from app.provider.smsProvider import getSmsService
+from app.services.smsCampaignService import SmsCampaignService
+
+
+async def _run(args: argparse.Namespace) -> None:
+    databaseManager = getDatabaseManager()
+    service = SmsCampaignService(databaseManager.asyncSessionMaker)
+    try:
+        if args.status:
+            campaign = await service.getCampaign(args.name)
+        else:
+            if not args.message:
+                raise SystemExit("--message is required to start a campaign")
+            campaign = await service.runCampaign(
+                args.name,
+                args.message,
+                verifiedOnly=not args.all_users,
+                batchSize=args.batch_size,
+                concurrency=args.concurrency,
+            )
+        if campaign is None:
+            print(f"No campaign named {args.name}")
+            return
+        state = "completed" if campaign.completedAt else "in progress"
+        print(
+            f"{campaign.name}: {state}, sent {campaign.sentCount}, "
+            f"failed {campaign.failedCount}, last user {campaign.lastUserId}"
+        )
+    finally:
+        await getSmsService().close()
+        await getSharedState().close()
+        await databaseManager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--name", required=True, help="Campaign name, used to resume")
+    parser.add_argument("--message", help="Message body for a new campaign")
+    parser.add_argument("--all-users", action="store_true", help="Include unverified users")
+    parser.add_argument("--batch-size", type=int, help="Recipients per checkpoint")
+    parser.add_argument("--concurrency", type=int, help="Parallel provider requests")
+    parser.add_argument("--status", action="store_true", help="Only show progress")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
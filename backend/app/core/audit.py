@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core import partitions
+from app.core.lazy import LazySingleton
+from app.core.settings import getSettings
+from app.models.auditEventModel import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "audit_events"
+DEFAULT_PARTITION = partitions.defaultPartitionName(TABLE_NAME)
+
+# Keeps one multi-row INSERT under SQLite's bound-parameter limit
+MAX_BATCH_SIZE = 5000
+
+
+def ensurePartitions(
+    conn: Connection, now: Optional[datetime] = None, monthsAhead: int = 2
+) -> List[str]:
+    """Create monthly partitions up to monthsAhead months out (PostgreSQL only)"""
+    return partitions.ensureMonthlyPartitions(conn, TABLE_NAME, now, monthsAhead)
+
+
+def purgeAuditEvents(conn: Connection, cutoff: datetime, batchSize: int = 5000) -> Dict[str, int]:
+    """Remove audit events older than cutoff
+
+    PostgreSQL drops whole monthly partitions once every row in them is past
+    the cutoff, which costs no row-level work. SQLite deletes in batches.
+    """
+    stats = {"partitionsDropped": 0, "rowsDeleted": 0}
+    if conn.dialect.name == "postgresql":
+        for name in partitions.listPartitions(conn, TABLE_NAME):
+            if partitions.addMonths(partitions.partitionMonth(name), 1) > cutoff:
+                continue
+            partitions.dropPartition(conn, TABLE_NAME, name)
+            stats["partitionsDropped"] += 1
+        return stats
+
+    table = AuditEvent.__table__
+    while True:
+        expiredIds = (
+            select(table.c.Id)
+            .where(table.c.occurredAt < cutoff)
+            .limit(batchSize)
+            .scalar_subquery()
+        )
+        result = conn.execute(delete(table).where(table.c.Id.in_(expiredIds)))
+        stats["rowsDeleted"] += result.rowcount
+        if result.rowcount < batchSize:
+            return stats
+
+
+class AuditLog:
+    """Buffer audit events in memory and write them in batches
+
+    record() never touches the database, so it is safe to call on any
+    request path. A background task flushes the buffer with multi-row
+    INSERTs whenever batchSize events are waiting or flushIntervalSeconds
+    have passed. If the buffer reaches bufferLimit (for example while the
+    database is down) the oldest events are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        engineFactory: Callable[[], AsyncEngine],
+        batchSize: int = 500,
+        flushIntervalSeconds: float = 1.0,
+        bufferLimit: int = 50000,
+    ) -> None:
+        self._engineFactory = engineFactory
+        self.batchSize = min(batchSize, MAX_BATCH_SIZE)
+        self.flushIntervalSeconds = flushIntervalSeconds
+        self.bufferLimit = bufferLimit
+        self.dropped = 0
+        self.written = 0
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._flushLock = asyncio.Lock()
+        self._table = AuditEvent.__table__
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def record(
+        self,
+        eventType: str,
+        outcome: str = "success",
+        userId: Optional[int] = None,
+        phoneNumber: Optional[str] = None,
+        **details: Any,
+    ) -> None:
+        """Queue one event; details are stored as JSON"""
+        if len(self._buffer) >= self.bufferLimit:
+            self._buffer.popleft()
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(
+                    "Audit buffer full, dropping oldest events",
+                    extra={"operation": "audit_record", "dropped": self.dropped},
+                )
+        self._buffer.append(
+            {
+                "occurredAt": datetime.now(timezone.utc),
+                "eventType": eventType,
+                "outcome": outcome,
+                "userId": userId,
+                "phoneNumber": phoneNumber,
+                "details": json.dumps(details, default=str) if details else None,
+            }
+        )
+        if len(self._buffer) >= self.batchSize:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write everything buffered so far and return how many events were stored"""
+        written = 0
+        async with self._flushLock:
+            while self._buffer:
+                batch = [
+                    self._buffer.popleft()
+                    for _ in range(min(self.batchSize, len(self._buffer)))
+                ]
+                try:
+                    async with self._engineFactory().begin() as conn:
+                        await conn.execute(insert(self._table).values(batch))
+                except BaseException:
+                    # Put the batch back in order, also when cancelled mid-write;
+                    # it is retried on the next flush
+                    self._buffer.extendleft(reversed(batch))
+                    raise
+                written += len(batch)
+        self.written += written
+        return written
+
+    async def run(self) -> None:
+        """Flush on size or time until cancelled"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flushIntervalSeconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(
+                    f"Failed to flush audit events: {e}",
+                    extra={"operation": "audit_flush", "buffered": len(self._buffer)},
+                )
+
+    async def maintain(self, retentionDays: Optional[int] = None) -> Dict[str, int]:
+        """Create upcoming partitions and apply the retention period
+
+        Run periodically by the audit_retention job (app/jobs).
+        """
+        retentionDays = retentionDays or getSettings.AUDIT_RETENTION_DAYS
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retentionDays)
+        async with self._engineFactory().connect() as conn:
+            autocommitConn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            created = await autocommitConn.run_sync(ensurePartitions)
+            stats = await autocommitConn.run_sync(purgeAuditEvents, cutoff)
+        if created or any(stats.values()):
+            logger.info(
+                "Audit table maintenance completed",
+                extra={"operation": "audit_maintenance", "created": created, **stats},
+            )
+        return stats
+
+    async def drain(self) -> None:
+        """Final flush during shutdown; anything that cannot be written is logged"""
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(
+                f"Audit events lost at shutdown: {e}",
+                extra={"operation": "audit_drain", "lost": len(self._buffer)},
+            )
+
+
+def _createAuditLog() -> AuditLog:
+    """Create the audit log from settings"""
+    from app.core.database import getDatabaseManager
+
+    return AuditLog(
+        lambda: getDatabaseManager().asyncEngine,
+        batchSize=getSettings.AUDIT_BATCH_SIZE,
+        flushIntervalSeconds=getSettings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        bufferLimit=getSettings.AUDIT_BUFFER_LIMIT,
+    )
+
+
+# Process-wide audit log, created on first use
+getAuditLog = LazySingleton(_createAuditLog)
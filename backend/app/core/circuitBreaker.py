@@ -0,0 +1,92 @@
+import logging
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Numeric encoding of the states for the breaker state gauge
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """Stop calling a dependency after repeated failures, then probe it again
+
+    Closed: calls go through and consecutive failures are counted; reaching
+    failureThreshold opens the breaker. Open: calls are refused until
+    resetTimeoutSeconds have passed. Half-open: a single probe call is let
+    through; success closes the breaker, failure opens it again.
+    Calls slower than slowCallSeconds count as failures even if they
+    succeed, so a provider that hangs trips the breaker like one that errors.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failureThreshold: int = 5,
+        resetTimeoutSeconds: float = 30.0,
+        slowCallSeconds: float = float("inf"),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failureThreshold = failureThreshold
+        self.resetTimeoutSeconds = resetTimeoutSeconds
+        self.slowCallSeconds = slowCallSeconds
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._openedAt = 0.0
+        self._probeInFlight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._openedAt >= self.resetTimeoutSeconds:
+            return HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; claims the probe when half-open"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probeInFlight:
+            self._state = HALF_OPEN
+            self._probeInFlight = True
+            return True
+        return False
+
+    def record(self, succeeded: bool, durationSeconds: float = 0.0) -> None:
+        """Report the outcome of a call that allow() let through"""
+        self._probeInFlight = False
+        if succeeded and durationSeconds < self.slowCallSeconds:
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+            self._failures = 0
+            return
+
+        self._failures += 1
+        if self._state == OPEN:
+            return
+        if self._state == HALF_OPEN or self._failures >= self.failureThreshold:
+            self._openedAt = self._clock()
+            self._transition(OPEN)
+
+    def abandon(self) -> None:
+        """Forget a call that was cancelled before it finished"""
+        self._probeInFlight = False
+
+    def _transition(self, state: str) -> None:
+        previous, self._state = self._state, state
+        log = logger.warning if state == OPEN else logger.info
+        log(
+            f"Circuit breaker {self.name} {previous} -> {state}",
+            extra={
+                "operation": "circuit_breaker",
+                "breaker": self.name,
+                "state": state,
+                "failures": self._failures,
+            },
+        )
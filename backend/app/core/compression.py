@@ -0,0 +1,124 @@
+import gzip
+import logging
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Content types that are already compressed or must not be buffered
+EXCLUDED_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "text/event-stream",
+)
+
+
+def compressBody(body: bytes, encoding: str, gzipLevel: int, brotliQuality: int) -> bytes:
+    """Compress a response body with the given content encoding"""
+    if encoding == "br":
+        return brotli.compress(body, quality=brotliQuality)
+    return gzip.compress(body, compresslevel=gzipLevel, mtime=0)
+
+
+def selectEncoding(acceptEncoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header"""
+    offered: List[Tuple[str, float]] = []
+    for part in acceptEncoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            offered.append((name.strip(), quality))
+
+    accepted = {name: quality for name, quality in offered}
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best: Optional[str] = None
+    bestQuality = 0.0
+    for encoding in candidates:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > bestQuality:
+            best, bestQuality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """Compress buffered responses with brotli or gzip above a size threshold"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimumSize: int = 500,
+        gzipLevel: int = 6,
+        brotliQuality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimumSize = minimumSize
+        self.gzipLevel = gzipLevel
+        self.brotliQuality = brotliQuality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = selectEncoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        startMessage: Optional[Message] = None
+        passthrough = False
+
+        async def sendWrapper(message: Message) -> None:
+            nonlocal startMessage, passthrough
+
+            if message["type"] == "http.response.start":
+                startMessage = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            moreBody = message.get("more_body", False)
+            headers = MutableHeaders(raw=startMessage["headers"])
+            contentType = headers.get("content-type", "")
+
+            # Streaming, tiny, excluded or already-encoded responses go out untouched
+            if (
+                moreBody
+                or len(body) < self.minimumSize
+                or "content-encoding" in headers
+                or contentType.startswith(EXCLUDED_CONTENT_TYPES)
+            ):
+                passthrough = True
+                await send(startMessage)
+                await send(message)
+                return
+
+            compressed = compressBody(
+                body, encoding, self.gzipLevel, self.brotliQuality
+            )
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(startMessage)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, sendWrapper)
@@ -3,8 +3,9 @@ from typing import Any, Dict
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.core.lazy import LazySingleton
+from app.core.migrations import MigrationRunner
 from app.core.settings import getSettings
-from app.models.base import ServiceBase
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,12 @@ class DatabaseManager:
 
         else:
             """PostgreSQL/MySQL specific configuration"""
+            # asyncpg names its connect timeout differently from libpq drivers
+            connectArgs: Dict[str, Any] = (
+                {"timeout": 10, "prepared_statement_cache_size": 100}
+                if "asyncpg" in databaseUrl
+                else {"connect_timeout": 10}
+            )
             engineKwargs.update(
                 {
                     "pool_size": 20,
@@ -40,10 +47,7 @@ class DatabaseManager:
                     "pool_pre_ping": True,
                     "pool_recycle": 3600,
                     "pool_reset_on_return": "commit",
-                    "connect_args": {
-                        "connect_timeout": 10,
-                        "prepared_statement_cache_size": 100,
-                    },
+                    "connect_args": connectArgs,
                 }
             )
             logger.info(
@@ -77,31 +81,43 @@ class DatabaseManager:
             },
         )
 
-    async def createTables(self) -> None:
-        """create all service database tables"""
-        try:
-            async with self.asyncEngine.begin() as conn:
-                await conn.run_sync(
-                    ServiceBase.metadata.create_all,
-                    checkfirst=True,
-                )
+    async def checkSchemaVersion(self, autoMigrate: bool = False) -> None:
+        """Verify the database is at the head revision, migrating if allowed"""
+        runner = MigrationRunner(self.asyncEngine)
+        currentRevision = await runner.currentRevision()
+        if currentRevision == runner.headRevision:
             logger.info(
-                "Database tables created successfully",
+                "Database schema is up to date",
                 extra={
-                    "operation": "create_tables",
-                    "event_type": "database_table_creation",
+                    "operation": "check_schema_version",
+                    "schema_version": currentRevision,
                 },
             )
-        except Exception as e:
-            logger.warning(
-                "Failed to create database tables",
-                exc_info=True,
+            return
+
+        if not autoMigrate:
+            errMsg = (
+                f"Database schema is at revision {currentRevision}, expected "
+                f"{runner.headRevision}. Run `python -m app.cli.migrate upgrade`."
+            )
+            logger.error(
+                errMsg,
                 extra={
-                    "operation": "create_tables",
-                    "event_type": "database_table_creation_failure",
-                    "error_type": type(e).__name__,
+                    "operation": "check_schema_version",
+                    "event_type": "database_schema_outdated",
                 },
             )
+            raise RuntimeError(errMsg)
+
+        applied = await runner.upgrade()
+        logger.info(
+            "Database schema migrated at startup",
+            extra={
+                "operation": "check_schema_version",
+                "event_type": "database_migration",
+                "applied_revisions": applied,
+            },
+        )
 
     async def close(self) -> None:
         """Properly close the database engine and connections"""
@@ -115,27 +131,33 @@ class DatabaseManager:
         )
 
 
-# Initialize a global database manager instance
-if not getSettings.DATABASE_URL:
-    errMsg = "DATABASE_URL is not set in settings."
-    logger.error(
-        errMsg,
+def _createDatabaseManager() -> DatabaseManager:
+    """Create the database manager from settings"""
+    if not getSettings.DATABASE_URL:
+        errMsg = "DATABASE_URL is not set in settings."
+        logger.error(
+            errMsg,
+            extra={
+                "operation": "initialize_database_manager",
+                "database_config": False,
+                "event_type": "database_initialization_failure",
+            },
+        )
+        raise ValueError(errMsg)
+
+    manager = DatabaseManager(
+        databaseUrl=getSettings.DATABASE_URL, echo=getSettings.DEBUG
+    )
+    logger.info(
+        "Service database manager instance created",
         extra={
             "operation": "initialize_database_manager",
-            "database_config": False,
-            "event_type": "database_initialization_failure",
+            "database_config": True,
+            "event_type": "database_initialization_success",
         },
     )
-    raise ValueError(errMsg)
-
-databaseManager = DatabaseManager(
-    databaseUrl=getSettings.DATABASE_URL, echo=getSettings.DEBUG
-)
-logger.info(
-    "Service database manager instance created",
-    extra={
-        "operation": "initialize_database_manager",
-        "database_config": True,
-        "event_type": "database_initialization_success",
-    },
-)
+    return manager
+
+
+# Global database manager, created on first use
+getDatabaseManager = LazySingleton(_createDatabaseManager)
@@ -0,0 +1,186 @@
+import asyncio
+import contextvars
+import json
+import logging
+import time
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Absolute time.monotonic() deadline of the current request, if any
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "requestDeadline", default=None
+)
+
+# Statements are given slightly less than the remaining budget so the
+# database gives up before the request is cancelled around it
+STATEMENT_TIMEOUT_MARGIN_SECONDS = 0.05
+
+# Prefixes of the per-transaction statements installStatementTimeouts() runs
+DEADLINE_STATEMENTS = ("SET LOCAL statement_timeout", "PRAGMA busy_timeout")
+
+# Connection info key holding SQLite's busy timeout from before a deadline capped it
+_SAVED_BUSY_TIMEOUT = "deadlineSavedBusyTimeout"
+
+
+class DeadlineExceeded(HTTPException):
+    """The request ran out of its time budget"""
+
+    def __init__(self, detail: str = "Request deadline exceeded") -> None:
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=detail)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request, or None outside a deadline"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def isExpired(slackSeconds: float = 0.0) -> bool:
+    """Whether the deadline has passed, or is within slackSeconds of passing"""
+    left = remaining()
+    return left is not None and left <= slackSeconds
+
+
+def checkDeadline() -> None:
+    """Raise DeadlineExceeded before starting work the request can no longer use"""
+    if isExpired():
+        raise DeadlineExceeded()
+
+
+def boundedTimeout(timeoutSeconds: float) -> float:
+    """timeoutSeconds capped by the time left in the current request"""
+    left = remaining()
+    return timeoutSeconds if left is None else max(0.0, min(timeoutSeconds, left))
+
+
+def setDeadline(seconds: Optional[float]) -> contextvars.Token:
+    """Give the current context a budget of seconds from now (None clears it)"""
+    return _deadline.set(None if seconds is None else time.monotonic() + seconds)
+
+
+def detachedContext() -> contextvars.Context:
+    """Copy of the current context without the request deadline, for background tasks"""
+    context = contextvars.copy_context()
+    context.run(_deadline.set, None)
+    return context
+
+
+def installStatementTimeouts(engine: AsyncEngine) -> None:
+    """Bound database work by the request deadline
+
+    On PostgreSQL every transaction begun under a deadline runs SET LOCAL
+    statement_timeout, so the server cancels a statement that would outlive
+    the request. SQLite has no statement timeout; its busy timeout (how long
+    to wait for a write lock) is capped the same way. That pragma lasts for
+    the connection rather than the transaction, so the next transaction
+    begun without a deadline puts the configured value back.
+    """
+    syncEngine = engine.sync_engine
+    dialect = syncEngine.dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        return
+
+    def applyDeadline(conn) -> None:
+        left = remaining()
+        if left is None:
+            if _SAVED_BUSY_TIMEOUT in conn.info:
+                savedMs = conn.info.pop(_SAVED_BUSY_TIMEOUT)
+                conn.exec_driver_sql(f"PRAGMA busy_timeout = {savedMs}")
+            return
+        if left <= 0:
+            raise DeadlineExceeded()
+        timeoutMs = max(1, int((left - STATEMENT_TIMEOUT_MARGIN_SECONDS) * 1000))
+        if dialect == "postgresql":
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {timeoutMs}")
+            return
+        if _SAVED_BUSY_TIMEOUT not in conn.info:
+            conn.info[_SAVED_BUSY_TIMEOUT] = conn.exec_driver_sql("PRAGMA busy_timeout").scalar()
+        conn.exec_driver_sql(f"PRAGMA busy_timeout = {timeoutMs}")
+
+    event.listen(syncEngine, "begin", applyDeadline)
+
+
+class DeadlineMiddleware:
+    """Give each request a time budget and answer 504 once it is spent
+
+    The budget comes from routeTimeouts by path, else defaultSeconds. The
+    handler is cancelled when the budget runs out; an error response
+    produced after the deadline passed (for example a service turning a
+    cancelled statement into a 500) is rewritten to 504.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        defaultSeconds: float,
+        routeTimeouts: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.app = app
+        self.defaultSeconds = defaultSeconds
+        self.routeTimeouts = routeTimeouts or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = self.routeTimeouts.get(scope["path"], self.defaultSeconds)
+        token = setDeadline(budget)
+        responseStarted = False
+        rewriting = False
+
+        async def sendWrapper(message: Message) -> None:
+            nonlocal responseStarted, rewriting
+            if message["type"] == "http.response.start":
+                # A statement cancelled by its timeout fails just before the deadline
+                if message["status"] >= 500 and isExpired(
+                    2 * STATEMENT_TIMEOUT_MARGIN_SECONDS
+                ):
+                    rewriting = True
+                    return
+                responseStarted = True
+            elif message["type"] == "http.response.body" and rewriting:
+                if not message.get("more_body", False):
+                    rewriting = False
+                    responseStarted = True
+                    await _sendTimeout(send)
+                return
+            await send(message)
+
+        try:
+            async with asyncio.timeout(budget):
+                await self.app(scope, receive, sendWrapper)
+        except TimeoutError:
+            logger.warning(
+                "Request cancelled at deadline",
+                extra={
+                    "operation": "request_deadline",
+                    "path": scope["path"],
+                    "budget_seconds": budget,
+                },
+            )
+            if not responseStarted:
+                await _sendTimeout(send)
+        finally:
+            _deadline.reset(token)
+
+
+async def _sendTimeout(send: Send) -> None:
+    body = json.dumps({"detail": "Request deadline exceeded"}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
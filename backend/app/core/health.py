@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.circuitBreaker import OPEN
+from app.core.lazy import LazySingleton
+from app.core.metrics import getMetricsRegistry
+from app.core.settings import getSettings
+
+logger = logging.getLogger(__name__)
+
+# A probe returns details to report, or raises to report a failure
+Probe = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class ProbeFailed(Exception):
+    """A dependency answered, but not in a state the service can rely on"""
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of the latest run of one probe"""
+
+    ok: bool
+    critical: bool
+    checkedAt: float
+    latencyMs: float
+    detail: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class HealthMonitor:
+    """Run dependency probes in the background and serve their cached results
+
+    Probes run every intervalSeconds, each bounded by timeoutSeconds, so
+    however often a load balancer asks, dependencies see one check per
+    interval per process. Readiness is answered from the last results: it
+    fails when a critical probe failed, when results are older than
+    staleAfterSeconds (the loop itself is stuck), and while the process is
+    shutting down. Non-critical probes are reported but never fail
+    readiness; an outage every instance shares (such as the SMS provider)
+    should not take them all out of rotation.
+    """
+
+    def __init__(
+        self,
+        intervalSeconds: float = 5.0,
+        timeoutSeconds: float = 2.0,
+        staleAfterSeconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.intervalSeconds = intervalSeconds
+        self.timeoutSeconds = timeoutSeconds
+        self.staleAfterSeconds = (
+            staleAfterSeconds
+            if staleAfterSeconds is not None
+            else 3 * intervalSeconds + timeoutSeconds
+        )
+        self.results: Dict[str, ProbeResult] = {}
+        self.lastRunAt: Optional[float] = None
+        self.clock = clock
+        self._probes: Dict[str, Tuple[Probe, bool]] = {}
+        getMetricsRegistry().gauge(
+            "health_probe_up",
+            "Whether the last run of a health probe succeeded",
+            ("probe",),
+        ).setCallback(
+            lambda: {(name,): float(result.ok) for name, result in self.results.items()}
+        )
+
+    def addProbe(self, name: str, probe: Probe, critical: bool = True) -> None:
+        self._probes[name] = (probe, critical)
+
+    async def runProbes(self) -> Dict[str, ProbeResult]:
+        """Run every probe once, concurrently, and cache the results"""
+        names = list(self._probes)
+        results = await asyncio.gather(*(self._runProbe(name) for name in names))
+        self.results = dict(zip(names, results))
+        self.lastRunAt = self.clock()
+        return self.results
+
+    async def _runProbe(self, name: str) -> ProbeResult:
+        probe, critical = self._probes[name]
+        startTime = self.clock()
+        detail: Dict[str, Any] = {}
+        error = None
+        try:
+            async with asyncio.timeout(self.timeoutSeconds):
+                detail = await probe()
+        except TimeoutError:
+            error = f"timed out after {self.timeoutSeconds}s"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        result = ProbeResult(
+            ok=error is None,
+            critical=critical,
+            checkedAt=self.clock(),
+            latencyMs=(self.clock() - startTime) * 1000,
+            detail=detail,
+            error=error,
+        )
+        previous = self.results.get(name)
+        if previous is not None and previous.ok != result.ok:
+            logger.log(
+                logging.INFO if result.ok else logging.WARNING,
+                f"Health probe {name} {'recovered' if result.ok else 'failed'}",
+                extra={"operation": "health_probe", "probe": name, "error": error},
+            )
+        return result
+
+    def readiness(self, draining: bool = False) -> Tuple[bool, str]:
+        """Whether to accept traffic, and the reason when not"""
+        if draining:
+            return False, "draining"
+        if self.lastRunAt is None:
+            return False, "starting"
+        if self.clock() - self.lastRunAt > self.staleAfterSeconds:
+            return False, "stale"
+        failed = sorted(
+            name for name, result in self.results.items() if result.critical and not result.ok
+        )
+        if failed:
+            return False, "failing: " + ", ".join(failed)
+        return True, "ok"
+
+    async def run(self) -> None:
+        """Refresh the results every intervalSeconds until cancelled"""
+        while True:
+            await asyncio.sleep(self.intervalSeconds)
+            try:
+                await self.runProbes()
+            except Exception as e:
+                logger.warning(
+                    f"Health probes failed to run: {e}",
+                    extra={"operation": "health_probe"},
+                )
+
+
+def databaseProbe(engineFactory: Callable[[], AsyncEngine]) -> Probe:
+    """Round trip to the database, plus connection pool usage"""
+
+    async def probe() -> Dict[str, Any]:
+        engine = engineFactory()
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        pool = engine.pool
+        detail: Dict[str, Any] = {}
+        for name in ("size", "checkedout", "overflow"):
+            # Not every pool class tracks these (NullPool, StaticPool)
+            method = getattr(pool, name, None)
+            if callable(method):
+                detail[f"pool_{name}"] = method()
+        return detail
+
+    return probe
+
+
+def migrationProbe(engineFactory: Callable[[], AsyncEngine]) -> Probe:
+    """The database schema is at the revision this code expects"""
+    from app.core.migrations import MigrationRunner, loadMigrations
+
+    migrations = loadMigrations()
+
+    async def probe() -> Dict[str, Any]:
+        runner = MigrationRunner(engineFactory(), migrations)
+        current = await runner.currentRevision()
+        if current != runner.headRevision:
+            raise ProbeFailed(
+                f"schema at revision {current}, expected {runner.headRevision}"
+            )
+        return {"revision": current}
+
+    return probe
+
+
+def smsProbe() -> Probe:
+    """Circuit breaker state of each SMS provider; fails when all are open"""
+    from app.provider.smsProvider import getSmsService
+
+    async def probe() -> Dict[str, Any]:
+        smsService = getSmsService.peek()
+        if smsService is None:
+            return {}
+        states = {name: breaker.state for name, breaker in smsService.breakers.items()}
+        if states and all(state == OPEN for state in states.values()):
+            raise ProbeFailed("every SMS provider circuit breaker is open")
+        return states
+
+    return probe
+
+
+def backlogProbe(limit: int) -> Probe:
+    """Work queued in this process: buffered audit events and background tasks"""
+    from app.core.audit import getAuditLog
+    from app.core.shutdown import getShutdownManager
+
+    async def probe() -> Dict[str, Any]:
+        auditLog = getAuditLog.peek()
+        shutdownManager = getShutdownManager.peek()
+        detail = {
+            "audit_buffered": len(auditLog) if auditLog is not None else 0,
+            "background_tasks": shutdownManager.pendingTasks if shutdownManager else 0,
+        }
+        backlog = sum(detail.values())
+        if backlog > limit:
+            raise ProbeFailed(f"backlog of {backlog} exceeds {limit}")
+        return detail
+
+    return probe
+
+
+def _createHealthMonitor() -> HealthMonitor:
+    """Create the health monitor and its probes from settings"""
+    from app.core.database import getDatabaseManager
+
+    def engineFactory() -> AsyncEngine:
+        return getDatabaseManager().asyncEngine
+
+    monitor = HealthMonitor(
+        intervalSeconds=getSettings.HEALTH_PROBE_INTERVAL_SECONDS,
+        timeoutSeconds=getSettings.HEALTH_PROBE_TIMEOUT_SECONDS,
+    )
+    monitor.addProbe("database", databaseProbe(engineFactory))
+    monitor.addProbe("migrations", migrationProbe(engineFactory))
+    monitor.addProbe("sms", smsProbe(), critical=False)
+    monitor.addProbe("backlog", backlogProbe(getSettings.HEALTH_MAX_BACKLOG))
+    return monitor
+
+
+# Process-wide health monitor, created on first use
+getHealthMonitor = LazySingleton(_createHealthMonitor)
@@ -0,0 +1,317 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.sharedState import SharedStateBackend, getSharedState
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+# Responses larger than this are not cached; the key is released instead
+MAX_CACHED_BODY_BYTES = 64 * 1024
+
+# How often a duplicate re-checks whether the first execution has finished
+POLL_INTERVAL_SECONDS = 0.05
+
+# Responses a retry should not get back; the key is released instead
+_RETRYABLE_STATUSES = {408, 429}
+
+# Hop-by-hop and per-response headers that must not be replayed
+_SKIPPED_HEADERS = {b"date", b"server", b"connection"}
+
+# Responses carrying credentials are never stored; the key is released instead
+_UNCACHEABLE_HEADERS = {b"set-cookie"}
+
+
+class IdempotencyStore:
+    """Idempotency records on the shared state backend
+
+    A key is claimed with an atomic add of a pending marker that expires
+    after lockSeconds, so a worker that dies mid-request does not block the
+    key forever. When the request finishes the marker is replaced by the
+    response, kept for ttlSeconds. Each record carries a keyed fingerprint
+    of the request so a key reused for a different body is rejected without
+    the store holding anything that could be used to recover the body.
+    """
+
+    def __init__(
+        self,
+        backend: SharedStateBackend,
+        ttlSeconds: float = 600,
+        lockSeconds: float = 60,
+        prefix: str = "idempotency",
+    ) -> None:
+        self.backend = backend
+        self.ttlSeconds = ttlSeconds
+        self.lockSeconds = lockSeconds
+        self.prefix = prefix
+
+    def _key(self, scopeName: str, key: str) -> str:
+        return f"{self.prefix}:{scopeName}:{key}"
+
+    async def claim(
+        self, scopeName: str, key: str, fingerprint: str
+    ) -> Optional[Dict[str, Any]]:
+        """Claim key for this request; return the existing record if already taken"""
+        storeKey = self._key(scopeName, key)
+        pending = json.dumps({"state": "pending", "fingerprint": fingerprint})
+        if await self.backend.add(storeKey, pending, ttlSeconds=self.lockSeconds):
+            return None
+        value = await self.backend.get(storeKey)
+        if value is None:
+            # Expired between the add and the get; try once more
+            if await self.backend.add(storeKey, pending, ttlSeconds=self.lockSeconds):
+                return None
+            value = await self.backend.get(storeKey)
+        if value is None:
+            return {"state": "pending", "fingerprint": fingerprint}
+        return json.loads(value)
+
+    async def waitForResult(
+        self, scopeName: str, key: str, deadline: float
+    ) -> Optional[Dict[str, Any]]:
+        """Poll until the record is done, released (None) or the deadline passes"""
+        storeKey = self._key(scopeName, key)
+        record: Optional[Dict[str, Any]] = None
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+            value = await self.backend.get(storeKey)
+            if value is None:
+                return None
+            record = json.loads(value)
+            if record["state"] == "done":
+                break
+        return record
+
+    async def complete(
+        self,
+        scopeName: str,
+        key: str,
+        fingerprint: str,
+        status: int,
+        headers: List[Tuple[bytes, bytes]],
+        body: bytes,
+    ) -> None:
+        record = {
+            "state": "done",
+            "fingerprint": fingerprint,
+            "status": status,
+            "headers": [
+                [name.decode("latin-1"), value.decode("latin-1")]
+                for name, value in headers
+            ],
+            "body": base64.b64encode(body).decode("ascii"),
+        }
+        await self.backend.set(
+            self._key(scopeName, key), json.dumps(record), ttlSeconds=self.ttlSeconds
+        )
+
+    async def release(self, scopeName: str, key: str) -> None:
+        """Give the key up so a retry runs the request again"""
+        await self.backend.delete(self._key(scopeName, key))
+
+
+class IdempotencyMiddleware:
+    """Execute a POST at most once per Idempotency-Key on the configured paths
+
+    A repeated key gets the stored response back with an Idempotent-Replayed
+    header. A duplicate that arrives while the first request is still
+    running waits for it instead of running again. Server errors and
+    exceptions release the key so the client can retry, and so do responses
+    that set cookies: session tokens must not sit in shared state, and a
+    replayed refresh token may already have been rotated.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Iterable[str],
+        secretKey: str,
+        ttlSeconds: float = 600,
+        waitSeconds: float = 10,
+    ) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+        self._secretKey = secretKey.encode()
+        self.ttlSeconds = ttlSeconds
+        self.waitSeconds = waitSeconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = Headers(scope=scope).get(IDEMPOTENCY_HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _sendJson(send, 400, "Invalid Idempotency-Key header")
+            return
+
+        body, receive = await _bufferBody(receive)
+        # Keyed, because the bodies hold passwords and phone numbers
+        fingerprint = hmac.new(
+            self._secretKey, scope["path"].encode() + b"\0" + body, hashlib.sha256
+        ).hexdigest()
+        store = IdempotencyStore(
+            getSharedState(),
+            ttlSeconds=self.ttlSeconds,
+            lockSeconds=max(self.waitSeconds * 2, 30),
+        )
+        scopeName = scope["path"]
+
+        deadline = time.monotonic() + self.waitSeconds
+        record = await store.claim(scopeName, key, fingerprint)
+        while (
+            record is not None
+            and record["state"] == "pending"
+            and record.get("fingerprint") == fingerprint
+            and time.monotonic() < deadline
+        ):
+            latest = await store.waitForResult(scopeName, key, deadline)
+            if latest is None:
+                # The first execution failed and gave the key up; run it here
+                # unless another duplicate claims it first
+                record = await store.claim(scopeName, key, fingerprint)
+            else:
+                record = latest
+        if record is not None:
+            await self._replay(send, record, fingerprint)
+            return
+
+        await self._execute(scope, receive, send, store, scopeName, key, fingerprint)
+
+    async def _replay(
+        self, send: Send, record: Dict[str, Any], fingerprint: str
+    ) -> None:
+        if record.get("fingerprint") != fingerprint:
+            await _sendJson(
+                send, 422, "Idempotency-Key was already used for a different request"
+            )
+            return
+        if record["state"] != "done":
+            await _sendJson(
+                send, 409, "A request with this Idempotency-Key is still in progress"
+            )
+            return
+        headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in record["headers"]
+        ]
+        headers.append((REPLAYED_HEADER, b"true"))
+        await send(
+            {"type": "http.response.start", "status": record["status"], "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": base64.b64decode(record["body"])})
+        logger.info(
+            "Replayed idempotent response",
+            extra={"operation": "idempotency_replay", "status": record["status"]},
+        )
+
+    async def _execute(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        store: IdempotencyStore,
+        scopeName: str,
+        key: str,
+        fingerprint: str,
+    ) -> None:
+        startMessage: Optional[Message] = None
+        chunks: List[bytes] = []
+        size = 0
+        cacheable = True
+
+        async def sendWrapper(message: Message) -> None:
+            nonlocal startMessage, size, cacheable
+            if message["type"] == "http.response.start":
+                startMessage = message
+            elif message["type"] == "http.response.body" and cacheable:
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                chunks.append(chunk)
+                if size > MAX_CACHED_BODY_BYTES:
+                    cacheable = False
+                    chunks.clear()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, sendWrapper)
+        except BaseException:
+            await asyncio.shield(store.release(scopeName, key))
+            raise
+
+        if (
+            startMessage is None
+            or startMessage["status"] in _RETRYABLE_STATUSES
+            or startMessage["status"] >= 500
+            or not cacheable
+            or any(
+                name.lower() in _UNCACHEABLE_HEADERS for name, _ in startMessage["headers"]
+            )
+        ):
+            await store.release(scopeName, key)
+            return
+        headers = [
+            (name, value)
+            for name, value in startMessage["headers"]
+            if name.lower() not in _SKIPPED_HEADERS
+        ]
+        await store.complete(
+            scopeName, key, fingerprint, startMessage["status"], headers, b"".join(chunks)
+        )
+
+
+async def _bufferBody(receive: Receive) -> Tuple[bytes, Receive]:
+    """Read the whole request body and return a receive that replays it"""
+    chunks: List[bytes] = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    body = b"".join(chunks)
+    replayed = False
+
+    async def replayReceive() -> Message:
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return body, replayReceive
+
+
+async def _sendJson(send: Send, status: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,41 @@
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LazySingleton(Generic[T]):
+    """Build a process-wide instance on first use instead of at import time"""
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def __call__(self) -> T:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+                instance = self._instance
+        return instance
+
+    @property
+    def isInitialized(self) -> bool:
+        """Whether the instance has been built"""
+        return self._instance is not None
+
+    def peek(self) -> Optional[T]:
+        """Return the instance if it has been built, without building it"""
+        return self._instance
+
+    def override(self, instance: T) -> None:
+        """Replace the instance, e.g. with a fake in benchmarks"""
+        with self._lock:
+            self._instance = instance
+
+    def reset(self) -> None:
+        """Drop the instance so the next call builds a fresh one"""
+        with self._lock:
+            self._instance = None
@@ -0,0 +1,195 @@
+import bisect
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.lazy import LazySingleton
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatLabels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _formatValue(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    """Common bookkeeping for a named metric with fixed label names"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labelNames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.description = description
+        self.labelNames = tuple(labelNames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelNames):
+            raise ValueError(f"{self.name} expects labels {self.labelNames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelNames)
+
+    def samples(self) -> Iterable[Tuple[str, LabelValues, Sequence[str], float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for suffix, values, names, value in self.samples():
+            lines.append(
+                f"{self.name}{suffix}{_formatLabels(names, values)} {_formatValue(value)}"
+            )
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelNames: Sequence[str] = ()) -> None:
+        super().__init__(name, description, labelNames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        for values, value in sorted(self._values.items()):
+            yield "", values, self.labelNames, value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, set directly or read from a callback"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, labelNames: Sequence[str] = ()) -> None:
+        super().__init__(name, description, labelNames)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback: Optional[Callable[[], Dict[LabelValues, float]]] = None
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def setCallback(self, callback: Callable[[], Dict[LabelValues, float]]) -> None:
+        """Read values at render time; the callback returns {labelValues: value}"""
+        self._callback = callback
+
+    def value(self, **labels: str) -> float:
+        values = self._callback() if self._callback else self._values
+        return values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        values = self._callback() if self._callback else self._values
+        for labelValues, value in sorted(values.items()):
+            yield "", labelValues, self.labelNames, value
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelNames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, description, labelNames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def samples(self):
+        bucketNames = self.labelNames + ("le",)
+        for values, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield "_bucket", values + (_formatValue(bound),), bucketNames, cumulative
+            yield "_sum", values, self.labelNames, self._sums[values]
+            yield "_count", values, self.labelNames, cumulative
+
+
+class MetricsRegistry:
+    """Process-local metrics rendered in the Prometheus text format
+
+    Metrics are registered by name on first use and the same instance is
+    returned afterwards, so call sites can look them up where they are
+    recorded. With several workers each process reports its own values.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metricType: type, name: str, *args, **kwargs) -> _Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = metricType(name, *args, **kwargs)
+                    self._metrics[name] = metric
+        if not isinstance(metric, metricType):
+            raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, description: str, labelNames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, description, labelNames)
+
+    def gauge(self, name: str, description: str, labelNames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, description, labelNames)
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labelNames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, description, labelNames, buckets)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide metrics registry
+getMetricsRegistry = LazySingleton(MetricsRegistry)
@@ -0,0 +1,171 @@
+import importlib
+import logging
+import pkgutil
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import Index, MetaData, Table, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.schemaVersionModel import SchemaVersion
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PACKAGE = "app.migrations"
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A single versioned schema revision"""
+
+    revision: str
+    description: str
+    upgrade: Callable[[Connection], None]
+    # Non-transactional revisions run in autocommit mode, which Postgres
+    # requires for CREATE INDEX CONCURRENTLY
+    transactional: bool = True
+
+
+def loadMigrations(package: str = MIGRATIONS_PACKAGE) -> List[Migration]:
+    """Import every revision module in the migrations package, ordered by revision"""
+    module = importlib.import_module(package)
+    migrations: List[Migration] = []
+    for info in pkgutil.iter_modules(module.__path__):
+        revisionModule = importlib.import_module(f"{package}.{info.name}")
+        migrations.append(
+            Migration(
+                revision=revisionModule.revision,
+                description=revisionModule.description,
+                upgrade=revisionModule.upgrade,
+                transactional=getattr(revisionModule, "transactional", True),
+            )
+        )
+    migrations.sort(key=lambda migration: migration.revision)
+
+    revisions = [migration.revision for migration in migrations]
+    if len(revisions) != len(set(revisions)):
+        raise ValueError(f"Duplicate migration revisions in {package}: {revisions}")
+    return migrations
+
+
+def createIndexOnline(
+    conn: Connection, table: Table, name: str, columns: Sequence[str], unique: bool = False
+) -> None:
+    """Create an index without blocking writes where the database supports it"""
+    if conn.dialect.name == "postgresql":
+        # A failed concurrent build leaves an invalid index behind; rebuild it
+        invalid = conn.execute(
+            text(
+                "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+                "WHERE c.relname = :name AND NOT i.indisvalid"
+            ),
+            {"name": name},
+        ).scalar()
+        if invalid:
+            conn.exec_driver_sql(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+        quotedColumns = ", ".join(f'"{column}"' for column in columns)
+        conn.exec_driver_sql(
+            f'CREATE {"UNIQUE " if unique else ""}INDEX CONCURRENTLY IF NOT EXISTS '
+            f'"{name}" ON "{table.name}" ({quotedColumns})'
+        )
+        return
+
+    Index(name, *(table.c[column] for column in columns), unique=unique).create(
+        conn, checkfirst=True
+    )
+
+
+def dropIndexOnline(conn: Connection, table: Table, name: str) -> None:
+    """Drop an index without blocking writes where the database supports it"""
+    if conn.dialect.name == "postgresql":
+        conn.exec_driver_sql(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+        return
+
+    existing = {index["name"] for index in inspect(conn).get_indexes(table.name)}
+    if name in existing:
+        Index(name, _table=table).drop(conn)
+
+
+def reflectTable(conn: Connection, name: str) -> Table:
+    """Reflect the current shape of a table"""
+    return Table(name, MetaData(), autoload_with=conn)
+
+
+class MigrationRunner:
+    """Apply pending revisions and report the schema version"""
+
+    def __init__(self, engine: AsyncEngine, migrations: Optional[List[Migration]] = None):
+        self.engine = engine
+        self.migrations = migrations if migrations is not None else loadMigrations()
+
+    @property
+    def headRevision(self) -> Optional[str]:
+        return self.migrations[-1].revision if self.migrations else None
+
+    async def currentRevision(self) -> Optional[str]:
+        """Latest applied revision, or None for an unversioned database"""
+        async with self.engine.connect() as conn:
+            return await conn.run_sync(self._readRevision)
+
+    async def pendingMigrations(self) -> List[Migration]:
+        """Revisions newer than the applied one"""
+        current = await self.currentRevision()
+        if current is None:
+            return list(self.migrations)
+        return [m for m in self.migrations if m.revision > current]
+
+    async def isUpToDate(self) -> bool:
+        """Whether the database is at the head revision"""
+        return await self.currentRevision() == self.headRevision
+
+    async def upgrade(self, target: Optional[str] = None) -> List[str]:
+        """Apply pending revisions up to target (default head) and return them"""
+        async with self.engine.begin() as conn:
+            await conn.run_sync(SchemaVersion.__table__.create, checkfirst=True)
+
+        applied: List[str] = []
+        for migration in await self.pendingMigrations():
+            if target is not None and migration.revision > target:
+                break
+            startTime = time.time()
+            if migration.transactional:
+                async with self.engine.begin() as conn:
+                    await conn.run_sync(migration.upgrade)
+                    await self._stamp(conn, migration.revision)
+            else:
+                async with self.engine.connect() as conn:
+                    autocommitConn = await conn.execution_options(
+                        isolation_level="AUTOCOMMIT"
+                    )
+                    await autocommitConn.run_sync(migration.upgrade)
+                    await self._stamp(autocommitConn, migration.revision)
+
+            applied.append(migration.revision)
+            logger.info(
+                "Applied database migration",
+                extra={
+                    "operation": "migrate",
+                    "revision": migration.revision,
+                    "description": migration.description,
+                    "duration_ms": int((time.time() - startTime) * 1000),
+                },
+            )
+        return applied
+
+    async def _stamp(self, conn, revision: str) -> None:
+        await conn.execute(SchemaVersion.__table__.insert().values(version=revision))
+
+    def _readRevision(self, conn: Connection) -> Optional[str]:
+        if not inspect(conn).has_table(SchemaVersion.__tablename__):
+            return None
+        known = {migration.revision for migration in self.migrations}
+        versions = conn.execute(
+            select(SchemaVersion.version).order_by(SchemaVersion.Id.desc())
+        ).scalars()
+        # Stamps written before versioned migrations existed are not revisions
+        for version in versions:
+            if version in known:
+                return version
+        return None
@@ -0,0 +1,341 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core import partitions
+from app.core.lazy import LazySingleton
+from app.core.settings import getSettings
+from app.models.orderModel import Order, OrderArchive
+
+if TYPE_CHECKING:
+    import pyarrow
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "orders"
+DEFAULT_PARTITION = partitions.defaultPartitionName(TABLE_NAME)
+
+PARQUET = "parquet"
+
+COLUMNS = ("Id", "userId", "productName", "quantity", "pricePerUnit", "totalPrice", "orderedAt")
+
+# Rows fetched from the database and written to the archive per step
+ARCHIVE_BATCH_SIZE = 10000
+
+
+def _asUtc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes; everything is stored in UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _parquetSchema() -> "pyarrow.Schema":
+    # pyarrow loads large native libraries; import it only when archiving
+    import pyarrow
+
+    return pyarrow.schema(
+        [
+            ("Id", pyarrow.int64()),
+            ("userId", pyarrow.int64()),
+            ("productName", pyarrow.string()),
+            ("quantity", pyarrow.int64()),
+            ("pricePerUnit", pyarrow.float64()),
+            ("totalPrice", pyarrow.float64()),
+            ("orderedAt", pyarrow.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+class _ArchiveWriter:
+    """Append batches of order rows to a Parquet file"""
+
+    def __init__(self, path: str) -> None:
+        import pyarrow.parquet as parquet
+
+        self.path = path
+        self._schema = _parquetSchema()
+        self._writer = parquet.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        import pyarrow
+
+        columns = {column: [row[column] for row in rows] for column in COLUMNS}
+        # One row group per batch; rows are sorted by userId so the
+        # row group statistics let readers skip most of the file
+        self._writer.write_table(pyarrow.Table.from_pydict(columns, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def readArchive(
+    path: str,
+    fileFormat: str,
+    userId: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Orders in an archive file, filtered by user and [since, until)"""
+    if fileFormat != PARQUET:
+        raise ValueError(f"Unsupported order archive format {fileFormat!r}")
+    import pyarrow.parquet as parquet
+
+    filters = []
+    if userId is not None:
+        filters.append(("userId", "=", userId))
+    if since is not None:
+        filters.append(("orderedAt", ">=", since))
+    if until is not None:
+        filters.append(("orderedAt", "<", until))
+    table = parquet.read_table(path, filters=filters or None)
+    return table.to_pylist()
+
+
+class OrderArchiver:
+    """Move months of orders out of the database into archive files
+
+    A month becomes archivable once it ended more than archiveAfterMonths
+    months ago. Its rows are streamed (sorted by user) into a compressed
+    columnar Parquet file. The file is written completely before anything is deleted;
+    the archive record and the removal of the rows then commit together,
+    and the month is skipped if its row count changed in between. On
+    PostgreSQL removal drops the month's partition, on SQLite it is a range
+    delete.
+    """
+
+    def __init__(
+        self,
+        engineFactory: Callable[[], AsyncEngine],
+        directory: str,
+        archiveAfterMonths: int = 12,
+    ) -> None:
+        self._engineFactory = engineFactory
+        self.directory = directory
+        self.archiveAfterMonths = archiveAfterMonths
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Months ending at or before this instant are archivable"""
+        current = partitions.monthStart(now or datetime.now(timezone.utc))
+        return partitions.addMonths(current, -self.archiveAfterMonths)
+
+    async def maintain(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Create upcoming partitions and archive every archivable month"""
+        async with self._engineFactory().connect() as conn:
+            autocommitConn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await autocommitConn.run_sync(
+                lambda syncConn: partitions.ensureMonthlyPartitions(syncConn, TABLE_NAME)
+            )
+
+        cutoff = self.cutoff(now)
+        archived = []
+        for periodStart in await self.archivableMonths(cutoff):
+            result = await self.archiveMonth(periodStart)
+            if result is not None:
+                archived.append(result)
+        return archived
+
+    async def archivableMonths(self, cutoff: datetime) -> List[datetime]:
+        """Start of every month before cutoff that still has orders or a partition"""
+        async with self._engineFactory().connect() as conn:
+            oldest = await conn.scalar(
+                select(func.min(Order.orderedAt)).where(Order.orderedAt < cutoff)
+            )
+            months = set()
+            if oldest is not None:
+                month = partitions.monthStart(_asUtc(oldest))
+                while month < cutoff:
+                    months.add(month)
+                    month = partitions.addMonths(month, 1)
+            if conn.dialect.name == "postgresql":
+                names = await conn.run_sync(partitions.listPartitions, TABLE_NAME)
+                months.update(
+                    partitions.partitionMonth(name)
+                    for name in names
+                    if partitions.partitionMonth(name) < cutoff
+                )
+        return sorted(months)
+
+    async def archiveMonth(self, periodStart: datetime) -> Optional[Dict[str, Any]]:
+        """Archive one month; None when it had nothing to archive or changed meanwhile"""
+        periodEnd = partitions.addMonths(periodStart, 1)
+        inPeriod = (Order.orderedAt >= periodStart, Order.orderedAt < periodEnd)
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(
+            self.directory,
+            f"orders_{periodStart:%Y%m}_{stamp}.{PARQUET}",
+        )
+
+        rowCount = await self._export(path, inPeriod)
+        try:
+            async with self._engineFactory().begin() as conn:
+                await self._lockPeriod(conn, periodStart)
+                current = await conn.scalar(
+                    select(func.count()).select_from(Order).where(*inPeriod)
+                )
+                if current != rowCount:
+                    raise _PeriodChanged(current)
+                sizeBytes = os.path.getsize(path) if rowCount else 0
+                if rowCount:
+                    await conn.execute(
+                        insert(OrderArchive).values(
+                            periodStart=periodStart,
+                            periodEnd=periodEnd,
+                            path=path,
+                            format=PARQUET,
+                            rowCount=rowCount,
+                            sizeBytes=sizeBytes,
+                            createdAt=datetime.now(timezone.utc),
+                        )
+                    )
+                removed = await self._remove(conn, periodStart, inPeriod)
+                if removed is not None and removed != rowCount:
+                    raise _PeriodChanged(removed)
+        except _PeriodChanged as e:
+            logger.warning(
+                "Orders changed while archiving; month skipped until the next run",
+                extra={
+                    "operation": "order_archival",
+                    "period_start": periodStart.isoformat(),
+                    "exported": rowCount,
+                    "current": e.args[0],
+                },
+            )
+            _removeFile(path)
+            return None
+        except BaseException:
+            _removeFile(path)
+            raise
+
+        if not rowCount:
+            _removeFile(path)
+            return None
+        logger.info(
+            "Orders archived",
+            extra={
+                "operation": "order_archival",
+                "period_start": periodStart.isoformat(),
+                "rows": rowCount,
+                "size_bytes": sizeBytes,
+                "path": path,
+            },
+        )
+        return {
+            "periodStart": periodStart,
+            "rowCount": rowCount,
+            "sizeBytes": sizeBytes,
+            "path": path,
+        }
+
+    async def _export(self, path: str, inPeriod: Sequence[Any]) -> int:
+        """Stream the period's orders into path; returns the number written"""
+        partialPath = f"{path}.partial"
+        rowCount = 0
+        writer = None
+        try:
+            async with self._engineFactory().connect() as conn:
+                result = await conn.stream(
+                    select(*(Order.__table__.c[column] for column in COLUMNS))
+                    .where(*inPeriod)
+                    .order_by(Order.userId, Order.orderedAt)
+                )
+                async for batch in result.mappings().partitions(ARCHIVE_BATCH_SIZE):
+                    rows = [
+                        {**row, "orderedAt": _asUtc(row["orderedAt"])} for row in batch
+                    ]
+                    if writer is None:
+                        writer = await asyncio.to_thread(_ArchiveWriter, partialPath)
+                    await asyncio.to_thread(writer.write, rows)
+                    rowCount += len(rows)
+            if writer is not None:
+                await asyncio.to_thread(writer.close)
+                await asyncio.to_thread(_fsyncReplace, partialPath, path)
+        except BaseException:
+            if writer is not None:
+                await asyncio.to_thread(writer.close)
+            _removeFile(partialPath)
+            raise
+        return rowCount
+
+    async def _lockPeriod(self, conn: AsyncConnection, periodStart: datetime) -> None:
+        """Block writes to the month until the transaction ends (PostgreSQL)
+
+        SQLite is not locked here and takes its write lock only at the
+        DELETE, so an order written after the count would be deleted with
+        the rest; archiveMonth checks the DELETE's row count there instead.
+        """
+        if conn.dialect.name != "postgresql":
+            return
+
+        def lock(syncConn: Connection) -> None:
+            name = partitions.partitionName(TABLE_NAME, periodStart)
+            tables = [DEFAULT_PARTITION]
+            if name in partitions.listPartitions(syncConn, TABLE_NAME):
+                tables.append(name)
+            tableList = ", ".join(f'"{table}"' for table in tables)
+            syncConn.exec_driver_sql(f"LOCK TABLE {tableList} IN EXCLUSIVE MODE")
+
+        await conn.run_sync(lock)
+
+    async def _remove(
+        self, conn: AsyncConnection, periodStart: datetime, inPeriod: Sequence[Any]
+    ) -> Optional[int]:
+        """Delete the month's orders; returns how many on SQLite, None on PostgreSQL"""
+        if conn.dialect.name != "postgresql":
+            result = await conn.execute(delete(Order).where(*inPeriod))
+            return result.rowcount
+
+        def dropMonth(syncConn: Connection) -> None:
+            name = partitions.partitionName(TABLE_NAME, periodStart)
+            if name in partitions.listPartitions(syncConn, TABLE_NAME):
+                partitions.dropPartition(syncConn, TABLE_NAME, name)
+
+        await conn.run_sync(dropMonth)
+        # Rows of months that had no partition of their own sit in the default one
+        await conn.execute(
+            text(
+                f'DELETE FROM "{DEFAULT_PARTITION}" '
+                'WHERE "orderedAt" >= :periodStart AND "orderedAt" < :periodEnd'
+            ),
+            {
+                "periodStart": periodStart,
+                "periodEnd": partitions.addMonths(periodStart, 1),
+            },
+        )
+
+
+class _PeriodChanged(Exception):
+    """Rows were added to or removed from the month after it was exported"""
+
+
+def _fsyncReplace(partialPath: str, path: str) -> None:
+    with open(partialPath, "rb") as fh:
+        os.fsync(fh.fileno())
+    os.replace(partialPath, path)
+
+
+def _removeFile(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _createOrderArchiver() -> OrderArchiver:
+    """Create the order archiver from settings"""
+    from app.core.database import getDatabaseManager
+
+    return OrderArchiver(
+        lambda: getDatabaseManager().asyncEngine,
+        directory=getSettings.ORDER_ARCHIVE_DIR,
+        archiveAfterMonths=getSettings.ORDER_ARCHIVE_AFTER_MONTHS,
+    )
+
+
+# Process-wide order archiver, created on first use
+getOrderArchiver = LazySingleton(_createOrderArchiver)
@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def monthStart(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+def addMonths(start: datetime, months: int) -> datetime:
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partitionName(table: str, start: datetime) -> str:
+    return f"{table}_p{start.year:04d}{start.month:02d}"
+
+
+def defaultPartitionName(table: str) -> str:
+    return f"{table}_default"
+
+
+def partitionMonth(name: str) -> datetime:
+    """First instant of the month a partition named by partitionName covers"""
+    return datetime(int(name[-6:-2]), int(name[-2:]), 1, tzinfo=timezone.utc)
+
+
+def ensureMonthlyPartitions(
+    conn: Connection, table: str, now: Optional[datetime] = None, monthsAhead: int = 2
+) -> List[str]:
+    """Create monthly range partitions of table up to monthsAhead months out
+
+    PostgreSQL only; on other databases the table is not partitioned.
+    """
+    if conn.dialect.name != "postgresql":
+        return []
+    current = monthStart(now or datetime.now(timezone.utc))
+    existing = set(listPartitions(conn, table))
+    created = []
+    for offset in range(monthsAhead + 1):
+        start = addMonths(current, offset)
+        name = partitionName(table, start)
+        if name in existing:
+            continue
+        createMonthlyPartition(conn, table, start)
+        created.append(name)
+    return created
+
+
+def createMonthlyPartition(conn: Connection, table: str, start: datetime) -> str:
+    """Create the partition of table covering the month starting at start"""
+    name = partitionName(table, start)
+    conn.exec_driver_sql(
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{addMonths(start, 1).isoformat()}')"
+    )
+    return name
+
+
+def dropPartition(conn: Connection, table: str, name: str) -> None:
+    """Detach and drop one partition; no row-level work"""
+    conn.exec_driver_sql(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+    conn.exec_driver_sql(f'DROP TABLE "{name}"')
+
+
+def listPartitions(conn: Connection, table: str) -> List[str]:
+    """Monthly partitions of table, oldest first (the default partition excluded)"""
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table AND c.relname LIKE :pattern"
+        ),
+        {"table": table, "pattern": f"{table}\\_p%"},
+    )
+    return sorted(row[0] for row in rows)
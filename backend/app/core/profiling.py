@@ -0,0 +1,251 @@
+import asyncio
+import cProfile
+import hmac
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile-request"
+
+_activeProfile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "activeProfile", default=None
+)
+
+
+@dataclass
+class RequestProfile:
+    """Everything captured while profiling one request"""
+
+    profileId: str
+    method: str
+    path: str
+    startedAt: float = field(default_factory=time.time)
+    statements: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def fileStem(self) -> str:
+        safePath = self.path.strip("/").replace("/", "_") or "root"
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(self.startedAt))
+        return f"{stamp}_{self.method}_{safePath}_{self.profileId}"
+
+
+class StackSampler:
+    """Sample one thread's Python stack at a fixed interval into folded stacks"""
+
+    def __init__(self, threadId: int, intervalSeconds: float) -> None:
+        self.threadId = threadId
+        self.intervalSeconds = intervalSeconds
+        self.stacks: Counter = Counter()
+        self._stopEvent = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopEvent.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        """Render samples in the collapsed format read by flamegraph tools"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def _run(self) -> None:
+        while not self._stopEvent.wait(self.intervalSeconds):
+            frame = sys._current_frames().get(self.threadId)
+            frames: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+                )
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+
+def installStatementTiming(engine: AsyncEngine) -> None:
+    """Record SQL statements and timings for requests that are being profiled"""
+    syncEngine = engine.sync_engine
+    if event.contains(syncEngine, "before_cursor_execute", _beforeCursorExecute):
+        return
+    event.listen(syncEngine, "before_cursor_execute", _beforeCursorExecute)
+    event.listen(syncEngine, "after_cursor_execute", _afterCursorExecute)
+
+
+def _beforeCursorExecute(conn, cursor, statement, parameters, context, executemany):
+    if _activeProfile.get() is not None:
+        conn.info.setdefault("profileStatementStart", []).append(time.perf_counter())
+
+
+def _afterCursorExecute(conn, cursor, statement, parameters, context, executemany):
+    profile = _activeProfile.get()
+    starts = conn.info.get("profileStatementStart")
+    if profile is None or not starts:
+        return
+    profile.statements.append(
+        {
+            "statement": statement,
+            "duration_ms": (time.perf_counter() - starts.pop()) * 1000,
+            "executemany": executemany,
+        }
+    )
+
+
+class ProfilingMiddleware:
+    """Profile opted-in or sampled requests and dump the results to a directory
+
+    A request is profiled when it carries the admin secret in the
+    X-Profile-Request header, or when it falls within the sampling rate.
+    Only one request is profiled at a time.
+
+    Both modes see the whole event loop, not just the profiled request:
+    the stack sampler samples the loop's thread and cProfile records every
+    call made on it, so other requests served meanwhile show up in the
+    profile too. Profile on an otherwise idle worker for a clean picture.
+    The SQL statements in the .json file are the profiled request's own.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        outputDir: str,
+        secret: str = "",
+        sampleRate: float = 0.0,
+        mode: str = "sampling",
+        sampleIntervalMs: float = 5.0,
+    ) -> None:
+        if mode not in ("sampling", "cprofile"):
+            raise ValueError(f"Unsupported PROFILING_MODE: {mode}")
+        self.app = app
+        self.outputDir = outputDir
+        self.secret = secret
+        self.sampleRate = sampleRate
+        self.mode = mode
+        self.sampleIntervalSeconds = sampleIntervalMs / 1000
+        self._slot = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._shouldProfile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._slot.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(
+            profileId=uuid.uuid4().hex[:12], method=scope["method"], path=scope["path"]
+        )
+        statusCode = 500
+
+        async def sendWrapper(message: Message) -> None:
+            nonlocal statusCode
+            if message["type"] == "http.response.start":
+                statusCode = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile.profileId
+            await send(message)
+
+        token = _activeProfile.set(profile)
+        sampler: Optional[StackSampler] = None
+        profiler: Optional[cProfile.Profile] = None
+        if self.mode == "sampling":
+            sampler = StackSampler(threading.get_ident(), self.sampleIntervalSeconds)
+            sampler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        startTime = time.perf_counter()
+        try:
+            await self.app(scope, receive, sendWrapper)
+        finally:
+            durationMs = (time.perf_counter() - startTime) * 1000
+            if sampler is not None:
+                sampler.stop()
+            if profiler is not None:
+                profiler.disable()
+            _activeProfile.reset(token)
+            self._slot.release()
+            # Writing pstats and folded stacks is file I/O; keep it off the loop
+            await asyncio.to_thread(
+                self._dump, profile, sampler, profiler, durationMs, statusCode
+            )
+
+    def _shouldProfile(self, scope: Scope) -> bool:
+        requested = Headers(scope=scope).get(PROFILE_HEADER)
+        if requested and self.secret:
+            return hmac.compare_digest(requested.encode(), self.secret.encode())
+        return self.sampleRate > 0 and random.random() < self.sampleRate
+
+    def _dump(
+        self,
+        profile: RequestProfile,
+        sampler: Optional[StackSampler],
+        profiler: Optional[cProfile.Profile],
+        durationMs: float,
+        statusCode: int,
+    ) -> None:
+        os.makedirs(self.outputDir, exist_ok=True)
+        basePath = os.path.join(self.outputDir, profile.fileStem)
+        if sampler is not None:
+            with open(f"{basePath}.folded", "w", encoding="utf-8") as fh:
+                fh.write(sampler.folded())
+        if profiler is not None:
+            profiler.dump_stats(f"{basePath}.pstats")
+
+        sqlDurationMs = sum(statement["duration_ms"] for statement in profile.statements)
+        with open(f"{basePath}.json", "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "profile_id": profile.profileId,
+                    "method": profile.method,
+                    "path": profile.path,
+                    "status_code": statusCode,
+                    "duration_ms": durationMs,
+                    "mode": self.mode,
+                    "sql_count": len(profile.statements),
+                    "sql_duration_ms": sqlDurationMs,
+                    "statements": profile.statements,
+                },
+                fh,
+                indent=2,
+            )
+        logger.info(
+            "Request profile captured",
+            extra={
+                "profile_id": profile.profileId,
+                "path": profile.path,
+                "duration_ms": int(durationMs),
+                "sql_count": len(profile.statements),
+                "sql_duration_ms": int(sqlDurationMs),
+            },
+        )
+
+
+def listProfiles(outputDir: str) -> List[Dict[str, Any]]:
+    """Describe captured profiles, newest first"""
+    if not os.path.isdir(outputDir):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(outputDir), reverse=True):
+        path = os.path.join(outputDir, name)
+        if os.path.isfile(path):
+            profiles.append({"name": name, "size": os.path.getsize(path)})
+    return profiles
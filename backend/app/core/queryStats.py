@@ -0,0 +1,185 @@
+import contextlib
+import contextvars
+import logging
+import re
+import time
+from collections import Counter
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.deadline import DEADLINE_STATEMENTS
+
+logger = logging.getLogger(__name__)
+
+# Query statistics of the current request, if it is being counted
+_currentStats: contextvars.ContextVar[Optional["QueryStats"]] = contextvars.ContextVar(
+    "queryStats", default=None
+)
+
+QUERY_COUNT_HEADER = "x-db-query-count"
+QUERY_TIME_HEADER = "x-db-query-time-ms"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """Statements executed in one request (or other unit of work) and their time
+
+    Statements are keyed by their SQL text. Parameters are bound separately,
+    so the same text run many times is the signature of an N+1 pattern:
+    one query per row of an earlier result, typically a lazy-loaded
+    relationship inside a loop. Nested trackers also report to the tracker
+    around them, so a budget inside a request still counts toward it.
+    """
+
+    def __init__(self, parent: Optional["QueryStats"] = None) -> None:
+        self.parent = parent
+        self.count = 0
+        self.totalSeconds = 0.0
+        self.statements: Counter = Counter()
+
+    @property
+    def totalMs(self) -> float:
+        return self.totalSeconds * 1000
+
+    def record(self, statement: str, durationSeconds: float) -> None:
+        statement = _WHITESPACE.sub(" ", statement).strip()
+        stats: Optional[QueryStats] = self
+        while stats is not None:
+            stats.count += 1
+            stats.totalSeconds += durationSeconds
+            stats.statements[statement] += 1
+            stats = stats.parent
+
+    def repeated(self, threshold: int = 2) -> List[Tuple[str, int]]:
+        """Statements run at least threshold times, most frequent first"""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A block of work ran more statements than its budget allows"""
+
+
+def installQueryStats(engine: AsyncEngine) -> None:
+    """Count statements and database time for work wrapped in trackQueries()"""
+    syncEngine = engine.sync_engine
+    if event.contains(syncEngine, "before_cursor_execute", _beforeCursorExecute):
+        return
+    event.listen(syncEngine, "before_cursor_execute", _beforeCursorExecute)
+    event.listen(syncEngine, "after_cursor_execute", _afterCursorExecute)
+    event.listen(syncEngine, "handle_error", _handleError)
+
+
+def _beforeCursorExecute(conn, cursor, statement, parameters, context, executemany):
+    if _currentStats.get() is not None:
+        conn.info.setdefault("queryStatsStart", []).append(time.perf_counter())
+
+
+def _afterCursorExecute(conn, cursor, statement, parameters, context, executemany):
+    stats = _currentStats.get()
+    starts = conn.info.get("queryStatsStart")
+    if stats is None or not starts:
+        return
+    duration = time.perf_counter() - starts.pop()
+    # Per-transaction deadline settings are bookkeeping, not queries
+    if not statement.startswith(DEADLINE_STATEMENTS):
+        stats.record(statement, duration)
+
+
+def _handleError(exceptionContext) -> None:
+    # A failed statement never reaches after_cursor_execute; still count it
+    conn = exceptionContext.connection
+    stats = _currentStats.get()
+    starts = conn.info.get("queryStatsStart") if conn is not None else None
+    if stats is None or not starts or exceptionContext.statement is None:
+        return
+    stats.record(exceptionContext.statement, time.perf_counter() - starts.pop())
+
+
+@contextlib.contextmanager
+def trackQueries() -> Iterator[QueryStats]:
+    """Collect the statements run inside the block
+
+    Only engines passed to installQueryStats() are counted.
+    """
+    stats = QueryStats(parent=_currentStats.get())
+    token = _currentStats.set(stats)
+    try:
+        yield stats
+    finally:
+        _currentStats.reset(token)
+
+
+@contextlib.contextmanager
+def queryBudget(
+    maxQueries: int, maxRepeats: Optional[int] = None, label: str = "block"
+) -> Iterator[QueryStats]:
+    """Fail when the block runs more than maxQueries statements
+
+    With maxRepeats set it also fails when any single statement runs more
+    than maxRepeats times, which catches N+1 patterns that still fit the
+    overall budget for small inputs.
+    """
+    with trackQueries() as stats:
+        yield stats
+    problems = []
+    if stats.count > maxQueries:
+        problems.append(f"{stats.count} queries, budget {maxQueries}")
+    if maxRepeats is not None:
+        for statement, count in stats.repeated(maxRepeats + 1):
+            problems.append(f"repeated {count}x: {statement[:200]}")
+    if problems:
+        raise QueryBudgetExceeded(f"{label}: " + "; ".join(problems))
+
+
+class QueryStatsMiddleware:
+    """Count the statements each request runs
+
+    With exposeHeaders (debug mode) the count and total database time are
+    sent as X-DB-Query-Count and X-DB-Query-Time-Ms. A request that runs the
+    same statement repeatThreshold times or more is logged as a likely N+1.
+    """
+
+    def __init__(
+        self, app: ASGIApp, exposeHeaders: bool = False, repeatThreshold: int = 5
+    ) -> None:
+        self.app = app
+        self.exposeHeaders = exposeHeaders
+        self.repeatThreshold = repeatThreshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def sendWrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.exposeHeaders:
+                headers = MutableHeaders(scope=message)
+                headers[QUERY_COUNT_HEADER] = str(stats.count)
+                headers[QUERY_TIME_HEADER] = f"{stats.totalMs:.2f}"
+            await send(message)
+
+        with trackQueries() as stats:
+            await self.app(scope, receive, sendWrapper)
+
+        repeated = stats.repeated(self.repeatThreshold)
+        if repeated:
+            statement, count = repeated[0]
+            logger.warning(
+                "Repeated identical queries in one request (possible N+1)",
+                extra={
+                    "operation": "query_stats",
+                    "path": scope["path"],
+                    "query_count": stats.count,
+                    "repeat_count": count,
+                    "statement": statement[:500],
+                },
+            )
@@ -0,0 +1,56 @@
+import json
+import logging
+from typing import Any, Type, Union
+
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class CompactJSONResponse(JSONResponse):
+    """JSON response rendered with the standard library without whitespace"""
+
+    def render(self, content: Any) -> bytes:
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def getDefaultResponseClass(
+    backend: str,
+) -> Union[Type[JSONResponse], DefaultPlaceholder]:
+    """Resolve the configured JSON backend to a response class
+
+    "pydantic" keeps FastAPI's own default, which serializes response
+    models straight to JSON bytes in pydantic-core. FastAPI only takes that
+    path when no response class is set, so any explicit class, orjson
+    included, renders through an intermediate dict instead
+    (benchmarks/serialization.py compares them on the order history route).
+    """
+    backend = backend.lower()
+    if backend == "pydantic":
+        return Default(JSONResponse)
+    if backend == "orjson":
+        if orjson is not None:
+            return OrjsonResponse
+        logger.warning(
+            "orjson is not installed, falling back to pydantic JSON responses",
+            extra={"json_backend": backend},
+        )
+        return Default(JSONResponse)
+    if backend == "json":
+        return CompactJSONResponse
+    raise ValueError(f"Unsupported JSON_RESPONSE_BACKEND: {backend}")
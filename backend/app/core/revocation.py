@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.lazy import LazySingleton
+from app.repository.sessionRepo import SessionRepository
+
+logger = logging.getLogger(__name__)
+
+# Overlap between incremental syncs so revocations committed late are not missed
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+def _asUtc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class RevocationList:
+    """In-memory set of revoked session Ids consulted on every request
+
+    A revoked session only matters until the last access token issued for it
+    expires, so entries are kept for one access-token lifetime after
+    revocation. The set is loaded at startup and kept in sync with the
+    sessions table by polling for newly revoked rows, which also picks up
+    revocations made by other workers.
+    """
+
+    def __init__(self) -> None:
+        self._revoked: Dict[str, float] = {}
+        self._syncedUntil: Optional[datetime] = None
+        self.accessTokenLifetime = timedelta(minutes=15)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def isRevoked(self, sessionId: str) -> bool:
+        """O(1) check without touching the database"""
+        return sessionId in self._revoked
+
+    def add(self, sessionId: str, revokedAt: Optional[datetime] = None) -> None:
+        """Record a revocation made by this process"""
+        revokedAt = _asUtc(revokedAt) if revokedAt else datetime.now(timezone.utc)
+        self._revoked[sessionId] = (revokedAt + self.accessTokenLifetime).timestamp()
+
+    def prune(self) -> int:
+        """Forget revocations whose access tokens have all expired"""
+        now = time.time()
+        expired = [sid for sid, until in self._revoked.items() if until <= now]
+        for sessionId in expired:
+            del self._revoked[sessionId]
+        return len(expired)
+
+    async def sync(self, sessionMaker: Callable[[], AsyncSession]) -> int:
+        """Load revocations newer than the last sync and return how many were seen"""
+        now = datetime.now(timezone.utc)
+        since = (
+            self._syncedUntil - SYNC_OVERLAP
+            if self._syncedUntil
+            else now - self.accessTokenLifetime
+        )
+        async with sessionMaker() as session:
+            revoked = await SessionRepository(session).listRevokedSince(since)
+        for sessionId, revokedAt in revoked:
+            self.add(sessionId, revokedAt)
+        self._syncedUntil = now
+        self.prune()
+        return len(revoked)
+
+    async def load(
+        self, sessionMaker: Callable[[], AsyncSession], accessTokenLifetime: timedelta
+    ) -> int:
+        """Initial load of every revocation that can still affect a live token"""
+        self.accessTokenLifetime = accessTokenLifetime
+        self._revoked.clear()
+        self._syncedUntil = None
+        count = await self.sync(sessionMaker)
+        logger.info(
+            "Session revocation list loaded",
+            extra={"operation": "load_revocations", "revoked_sessions": count},
+        )
+        return count
+
+    async def runSync(
+        self, sessionMaker: Callable[[], AsyncSession], intervalSeconds: float
+    ) -> None:
+        """Poll for revocations until cancelled"""
+        while True:
+            await asyncio.sleep(intervalSeconds)
+            try:
+                await self.sync(sessionMaker)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to sync session revocations: {e}",
+                    extra={"operation": "sync_revocations"},
+                )
+
+
+# Process-wide revocation list
+getRevocationList = LazySingleton(RevocationList)
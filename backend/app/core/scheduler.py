@@ -0,0 +1,348 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, FrozenSet, Optional
+
+from app.core.lazy import LazySingleton
+from app.core.metrics import getMetricsRegistry
+from app.core.sharedState import DatabaseStateBackend, SharedStateBackend
+
+logger = logging.getLogger(__name__)
+
+# Extra lifetime of a lease beyond the run it protects
+LEASE_MARGIN_SECONDS = 60
+
+# Jobs take from milliseconds (a sweep with nothing due) to many minutes
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600)
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_FAILURE = "failure"
+OUTCOME_TIMEOUT = "timeout"
+# Another worker claimed the run, or is still busy with an earlier one
+OUTCOME_SKIPPED = "skipped"
+
+
+def _cancelling() -> bool:
+    """Whether the current task is being cancelled
+
+    Database drivers can surface a cancellation as their own error (an
+    aborted connection), which an except Exception would swallow.
+    """
+    task = asyncio.current_task()
+    return task is not None and task.cancelling() > 0
+
+
+class Schedule(ABC):
+    """When a job is due; every worker computes the same run times"""
+
+    @abstractmethod
+    def nextRun(self, after: datetime) -> datetime:
+        """First run time strictly after the given UTC time"""
+
+    def period(self, runAt: datetime) -> float:
+        """Seconds from runAt to the run after it"""
+        return (self.nextRun(runAt) - runAt).total_seconds()
+
+
+class IntervalSchedule(Schedule):
+    """Every seconds seconds, aligned to the Unix epoch so workers agree on run times"""
+
+    def __init__(self, seconds: float) -> None:
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+
+    def nextRun(self, after: datetime) -> datetime:
+        slot = (int(after.timestamp() // self.seconds) + 1) * self.seconds
+        return datetime.fromtimestamp(slot, timezone.utc)
+
+    def __repr__(self) -> str:
+        return f"every {self.seconds:g}s"
+
+
+class CronSchedule(Schedule):
+    """Standard five-field cron expression (minute hour day month weekday), in UTC
+
+    Fields accept *, lists, ranges and steps ("*/15", "1-5", "0,30").
+    Weekdays run 0-6 from Sunday (7 is Sunday too). As in cron, when both
+    day of month and weekday are restricted a time matching either is due.
+    """
+
+    _FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str) -> None:
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        minutes, hours, days, months, weekdays = (
+            self._parseField(part, low, high) for part, (low, high) in zip(parts, self._FIELDS)
+        )
+        self.minutes = minutes
+        self.hours = hours
+        self.days = days
+        self.months = months
+        # Python counts Monday as 0; cron counts Sunday as 0 (and 7)
+        self.weekdays = frozenset((day - 1) % 7 for day in weekdays)
+        self._anyDay = parts[2] == "*"
+        self._anyWeekday = parts[4] == "*"
+
+    @staticmethod
+    def _parseField(field: str, low: int, high: int) -> FrozenSet[int]:
+        values = set()
+        for item in field.split(","):
+            rangePart, _, stepPart = item.partition("/")
+            step = int(stepPart) if stepPart else 1
+            if rangePart == "*":
+                start, end = low, high
+            elif "-" in rangePart:
+                start, end = (int(value) for value in rangePart.split("-", 1))
+            else:
+                start = int(rangePart)
+                end = high if stepPart else start
+            if not low <= start <= end <= high or step < 1:
+                raise ValueError(f"Invalid cron field {field!r}")
+            values.update(range(start, end + 1, step))
+        return frozenset(values)
+
+    def _dayMatches(self, value: datetime) -> bool:
+        dayMatches = value.day in self.days
+        weekdayMatches = value.weekday() in self.weekdays
+        if self._anyDay or self._anyWeekday:
+            return dayMatches and weekdayMatches
+        return dayMatches or weekdayMatches
+
+    def nextRun(self, after: datetime) -> datetime:
+        candidate = after.astimezone(timezone.utc).replace(second=0, microsecond=0)
+        candidate += timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(
+                    year=candidate.year + (month == 1), month=month, day=1, hour=0, minute=0
+                )
+            elif not self._dayMatches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def __repr__(self) -> str:
+        return f"cron {self.expression!r}"
+
+
+@dataclass
+class Job:
+    """A periodic task and how to run it"""
+
+    name: str
+    func: Callable[[], Awaitable[object]]
+    schedule: Schedule
+    timeoutSeconds: float
+    jitterSeconds: float = 0.0
+
+
+class Scheduler:
+    """Run registered jobs on their schedules, each run on exactly one worker
+
+    Every worker runs the same job loops. Run times come from the schedule,
+    so all workers agree on them; before a run a worker claims a lease row
+    for that run time in the shared state table and only the worker that
+    wins runs it. A second lease held for the duration of the run stops a
+    slow run from overlapping the next one on another worker. Random jitter
+    spreads workers (and jobs due at the same time) over a few seconds.
+    Runs are cut off at the job's timeout; durations and outcomes are
+    exported as scheduler_job_* metrics.
+    """
+
+    def __init__(self, leases: SharedStateBackend) -> None:
+        self.leases = leases
+        self.jobs: Dict[str, Job] = {}
+        self.workerId = f"{socket.gethostname()}:{os.getpid()}"
+        registry = getMetricsRegistry()
+        self._runs = registry.counter(
+            "scheduler_job_runs_total",
+            "Scheduled job runs by job and outcome",
+            ("job", "outcome"),
+        )
+        self._duration = registry.histogram(
+            "scheduler_job_duration_seconds",
+            "Duration of scheduled job runs",
+            ("job",),
+            buckets=DURATION_BUCKETS,
+        )
+        self._lastSuccess = registry.gauge(
+            "scheduler_job_last_success_timestamp_seconds",
+            "Unix time of the last successful run of each job on this worker",
+            ("job",),
+        )
+
+    def addJob(self, job: Job) -> None:
+        if job.name in self.jobs:
+            raise ValueError(f"Job {job.name} is already registered")
+        self.jobs[job.name] = job
+
+    def interval(
+        self,
+        name: str,
+        seconds: float,
+        func: Callable[[], Awaitable[object]],
+        timeoutSeconds: Optional[float] = None,
+        jitterSeconds: Optional[float] = None,
+    ) -> None:
+        """Register func to run every seconds seconds
+
+        The timeout defaults to the interval and the jitter to a tenth of it.
+        """
+        self.addJob(
+            Job(
+                name,
+                func,
+                IntervalSchedule(seconds),
+                timeoutSeconds if timeoutSeconds is not None else seconds,
+                jitterSeconds if jitterSeconds is not None else seconds / 10,
+            )
+        )
+
+    def cron(
+        self,
+        name: str,
+        expression: str,
+        func: Callable[[], Awaitable[object]],
+        timeoutSeconds: float,
+        jitterSeconds: float = 30.0,
+    ) -> None:
+        """Register func to run at the times matching a cron expression"""
+        self.addJob(Job(name, func, CronSchedule(expression), timeoutSeconds, jitterSeconds))
+
+    async def run(self) -> None:
+        """Run every job loop until cancelled"""
+        logger.info(
+            "Scheduler started",
+            extra={
+                "operation": "scheduler",
+                "jobs": {name: repr(job.schedule) for name, job in self.jobs.items()},
+            },
+        )
+        tasks = [
+            asyncio.create_task(self._loop(job), name=f"scheduler:{job.name}")
+            for job in self.jobs.values()
+        ]
+        try:
+            # The loops never return; this waits until the scheduler is cancelled
+            await asyncio.wait(tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _loop(self, job: Job) -> None:
+        while True:
+            runAt = job.schedule.nextRun(datetime.now(timezone.utc))
+            delay = (runAt - datetime.now(timezone.utc)).total_seconds()
+            await asyncio.sleep(max(0.0, delay) + random.uniform(0, job.jitterSeconds))
+            await self.runOnce(job, runAt)
+
+    async def runOnce(self, job: Job, runAt: datetime) -> str:
+        """Claim the run at runAt and execute it if this worker wins; returns the outcome"""
+        try:
+            claimed = await self._claim(job, runAt)
+        except Exception as e:
+            if _cancelling():
+                raise
+            logger.warning(
+                f"Could not claim job {job.name}: {e}",
+                extra={"operation": "scheduler", "job": job.name},
+            )
+            claimed = False
+        if not claimed:
+            self._runs.inc(job=job.name, outcome=OUTCOME_SKIPPED)
+            return OUTCOME_SKIPPED
+
+        runningKey = f"scheduler:{job.name}:running"
+        startTime = time.monotonic()
+        deadline = asyncio.timeout(job.timeoutSeconds)
+        try:
+            async with deadline:
+                await job.func()
+            outcome = OUTCOME_SUCCESS
+        except Exception as e:
+            if _cancelling():
+                raise
+            # The driver may report the cut-off as its own error
+            if isinstance(e, TimeoutError) or deadline.expired():
+                outcome = OUTCOME_TIMEOUT
+                logger.warning(
+                    f"Job {job.name} timed out after {job.timeoutSeconds}s",
+                    extra={"operation": "scheduler", "job": job.name},
+                )
+            else:
+                outcome = OUTCOME_FAILURE
+                logger.warning(
+                    f"Job {job.name} failed: {e}",
+                    extra={"operation": "scheduler", "job": job.name},
+                )
+        finally:
+            duration = time.monotonic() - startTime
+            self._duration.observe(duration, job=job.name)
+            try:
+                await self.leases.delete(runningKey)
+            except Exception as e:
+                if _cancelling():
+                    raise
+                logger.warning(
+                    f"Could not release job {job.name}: {e}",
+                    extra={"operation": "scheduler", "job": job.name},
+                )
+
+        self._runs.inc(job=job.name, outcome=outcome)
+        if outcome == OUTCOME_SUCCESS:
+            self._lastSuccess.set(time.time(), job=job.name)
+        logger.debug(
+            f"Job {job.name} finished",
+            extra={
+                "operation": "scheduler",
+                "job": job.name,
+                "outcome": outcome,
+                "duration_ms": int(duration * 1000),
+            },
+        )
+        return outcome
+
+    async def _claim(self, job: Job, runAt: datetime) -> bool:
+        """Take the lease for this run time, then the lease against overlapping runs"""
+        runKey = f"scheduler:{job.name}:{runAt.isoformat()}"
+        # Kept past the run time so a late worker cannot claim the same run
+        runTtl = max(job.schedule.period(runAt), job.jitterSeconds) + LEASE_MARGIN_SECONDS
+        if not await self.leases.add(runKey, self.workerId, ttlSeconds=runTtl):
+            return False
+        return await self.leases.add(
+            f"scheduler:{job.name}:running",
+            self.workerId,
+            ttlSeconds=job.timeoutSeconds + LEASE_MARGIN_SECONDS,
+        )
+
+
+def _createScheduler() -> Scheduler:
+    """Create the scheduler with leases in the database and every job registered"""
+    from app.core.database import getDatabaseManager
+    from app.jobs import registerJobs
+
+    scheduler = Scheduler(DatabaseStateBackend(lambda: getDatabaseManager().asyncEngine))
+    registerJobs(scheduler)
+    return scheduler
+
+
+# Process-wide scheduler, created on first use
+getScheduler = LazySingleton(_createScheduler)
@@ -1,8 +1,29 @@
 from random import randint
+from typing import Any, Dict, Optional, Tuple
 
-from passlib.context import CryptContext
+from app.core.lazy import LazySingleton
+from app.core.settings import getSettings
 
-pwdContext = CryptContext(schemes=["argon2"], deprecated="auto")
+
+def argon2Options() -> Dict[str, Any]:
+    """Configured argon2 cost parameters, omitting any left at library defaults"""
+    options = {
+        "argon2__time_cost": getSettings.ARGON2_TIME_COST,
+        "argon2__memory_cost": getSettings.ARGON2_MEMORY_COST,
+        "argon2__parallelism": getSettings.ARGON2_PARALLELISM,
+    }
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def _createPwdContext():
+    """Create the password hashing context"""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["argon2"], deprecated="auto", **argon2Options())
+
+
+# Password hashing context, created on first hash or verify
+getPwdContext = LazySingleton(_createPwdContext)
 
 
 class SecurityManager:
@@ -11,12 +32,19 @@ class SecurityManager:
     @staticmethod
     def hashPassword(password: str) -> str:
         """Hash a plaintext password"""
-        return pwdContext.hash(password)
+        return getPwdContext().hash(password)
 
     @staticmethod
     def verifyPassword(plainPassword: str, hashedPassword: str) -> bool:
         """Verify a plaintext password against a hashed password"""
-        return pwdContext.verify(plainPassword, hashedPassword)
+        return getPwdContext().verify(plainPassword, hashedPassword)
+
+    @staticmethod
+    def verifyAndUpdatePassword(
+        plainPassword: str, hashedPassword: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify a password and return a new hash if its parameters are outdated"""
+        return getPwdContext().verify_and_update(plainPassword, hashedPassword)
 
     @staticmethod
     def generateOTP() -> str:
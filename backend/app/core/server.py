@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import socket
+import time
+from types import FrameType
+from typing import List, Optional
+
+import uvicorn
+
+from app.core.settings import getSettings
+from app.core.shutdown import getShutdownManager
+
+logger = logging.getLogger(__name__)
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that drains requests before it stops listening
+
+    On SIGTERM uvicorn closes its sockets and waits for open connections
+    before the application's lifespan shutdown runs, which is too late to
+    fail readiness while traffic is still arriving. Here the first SIGINT or
+    SIGTERM runs ShutdownManager.drainRequests with the sockets still open,
+    and uvicorn's own shutdown follows once requests have drained. A second
+    signal stops waiting, as it does in uvicorn.
+    """
+
+    def __init__(self, config: uvicorn.Config) -> None:
+        super().__init__(config)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._draining = False
+        self._drainTask: Optional["asyncio.Task[None]"] = None
+
+    async def startup(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        self._loop = asyncio.get_running_loop()
+        await super().startup(sockets=sockets)
+
+    def handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+        if self._draining or self._loop is None or not self.started:
+            super().handle_exit(sig, frame)
+            return
+        self._draining = True
+        # Signal handlers run between bytecodes; hand the drain to the loop
+        self._loop.call_soon_threadsafe(self._startDrain, sig)
+
+    def _startDrain(self, sig: int) -> None:
+        self._drainTask = asyncio.create_task(self._drain(sig))
+
+    async def _drain(self, sig: int) -> None:
+        startTime = time.monotonic()
+        try:
+            drained = await getShutdownManager().drainRequests(
+                getSettings.SHUTDOWN_READINESS_DELAY_SECONDS,
+                getSettings.SHUTDOWN_TIMEOUT_SECONDS,
+            )
+            logger.info(
+                "Requests drained" if drained else "Requests still running at drain deadline",
+                extra={
+                    "operation": "shutdown_drain",
+                    "duration_ms": int((time.monotonic() - startTime) * 1000),
+                    "in_flight": getShutdownManager().inFlight,
+                },
+            )
+        except Exception as e:
+            logger.error(
+                f"Request drain failed: {e}",
+                extra={"operation": "shutdown_drain"},
+            )
+        finally:
+            super().handle_exit(sig, None)
+
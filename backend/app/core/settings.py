@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -11,11 +11,14 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DATABASE_AUTO_MIGRATE: bool = False
 
     # JWT
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    SESSION_REVOCATION_SYNC_SECONDS: float = 5.0
 
     # CORS
     CORS_ORIGINS: List[str]
@@ -23,6 +26,113 @@ class Settings(BaseSettings):
     CORS_METHODS: List[str]
     CORS_HEADERS: List[str]
 
+    # Serving
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WEB_CONCURRENCY: Optional[int] = None
+    MAX_WORKERS: Optional[int] = None
+    # Request time budgets; paths not listed get REQUEST_TIMEOUT_SECONDS
+    REQUEST_TIMEOUT_SECONDS: float = 10.0
+    REQUEST_ROUTE_TIMEOUTS: Dict[str, float] = {
+        "/api/v1/users/login": 5.0,
+        "/api/v1/users/refresh": 3.0,
+        "/api/v1/users/me": 2.0,
+    }
+    # Budget for draining requests and background tasks on shutdown
+    SHUTDOWN_TIMEOUT_SECONDS: float = 20.0
+    # How long /health/ready reports not-ready before new requests are
+    # refused; set to the load balancer's probe period times its threshold
+    SHUTDOWN_READINESS_DELAY_SECONDS: float = 0.0
+
+    # Health probes (served cached from /health/ready)
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 5.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_MAX_BACKLOG: int = 10000
+
+    # Shared state across workers ("memory" or "database")
+    SHARED_STATE_BACKEND: str = "memory"
+
+    # Responses; JSON_RESPONSE_BACKEND is "pydantic", "orjson" or "json"
+    JSON_RESPONSE_BACKEND: str = "pydantic"
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Password hashing (argon2 library defaults when unset)
+    ARGON2_TIME_COST: Optional[int] = None
+    ARGON2_MEMORY_COST: Optional[int] = None
+    ARGON2_PARALLELISM: Optional[int] = None
+
+    # OTP
+    OTP_MAX_ATTEMPTS: int = 5
+
+    # Bulk SMS
+    SMS_RATE_LIMIT_PER_SECOND: int = 10
+    SMS_BULK_CONCURRENCY: int = 8
+    SMS_BULK_BATCH_SIZE: int = 500
+
+    # SMS providers, in failover order ("twilio", "gateway", "fake")
+    SMS_PROVIDERS: List[str] = ["twilio"]
+    SMS_PROVIDER_TIMEOUT_SECONDS: float = 5.0
+    SMS_SLOW_CALL_SECONDS: float = 2.0
+    SMS_BREAKER_FAILURE_THRESHOLD: int = 5
+    SMS_BREAKER_RESET_SECONDS: float = 30.0
+    SMS_GATEWAY_URL: str = ""
+    SMS_GATEWAY_TOKEN: str = ""
+    SMS_FAKE_LATENCY_SECONDS: float = 0.0
+    SMS_FAKE_ERROR_RATE: float = 0.0
+
+    # Metrics
+    METRICS_ENABLED: bool = True
+
+    # Per-request query counting; always on in DEBUG, which also adds headers
+    QUERY_STATS_ENABLED: bool = False
+    QUERY_STATS_REPEAT_THRESHOLD: int = 5
+
+    # Idempotency-Key support for retried POSTs. Login is not listed: its
+    # response is the session cookies, which are never stored
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_PATHS: List[str] = [
+        "/api/v1/users/register",
+        "/api/v1/users/forgotPassword",
+    ]
+    IDEMPOTENCY_TTL_SECONDS: float = 600
+    IDEMPOTENCY_WAIT_SECONDS: float = 10
+
+    # Audit log
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_BUFFER_LIMIT: int = 50000
+    AUDIT_RETENTION_DAYS: int = 365
+
+    # Inventory reservations
+    RESERVATION_TTL_SECONDS: float = 600
+    RESERVATION_SWEEP_INTERVAL_SECONDS: float = 30
+
+    # Order partitioning and archival
+    ORDER_ARCHIVE_DIR: str = "archives/orders"
+    ORDER_ARCHIVE_AFTER_MONTHS: int = 12
+    ORDER_MAINTENANCE_INTERVAL_SECONDS: float = 3600
+
+    # Background jobs (app/jobs); each run happens on one worker, cron times are UTC
+    SCHEDULER_ENABLED: bool = True
+    OTP_CLEANUP_INTERVAL_SECONDS: float = 3600
+    OTP_RETENTION_HOURS: float = 24
+    SESSION_PRUNE_CRON: str = "15 3 * * *"
+    AUDIT_MAINTENANCE_INTERVAL_SECONDS: float = 3600
+    SHARED_STATE_PURGE_INTERVAL_SECONDS: float = 3600
+
+    # Admin
+    ADMIN_SECRET: str = ""
+
+    # Profiling
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_MODE: str = "sampling"
+    PROFILING_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILING_OUTPUT_DIR: str = "profiles"
+
     # Twilio SMS Configuration
     TWILIO_ACCOUNT_SID: str
     TWILIO_AUTH_TOKEN: str
@@ -35,5 +145,25 @@ class Settings(BaseSettings):
         extra = "ignore"
 
 
+class _LazySettings:
+    """Proxy that reads the environment on first attribute access"""
+
+    def __init__(self) -> None:
+        self._settings: Optional[Settings] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+    def load(self) -> Settings:
+        """Build the settings once and return them"""
+        if self._settings is None:
+            self._settings = Settings()
+        return self._settings
+
+    def reset(self) -> None:
+        """Forget the loaded settings so the environment is read again"""
+        self._settings = None
+
+
 # Global settings instance
-getSettings = Settings()
+getSettings = _LazySettings()
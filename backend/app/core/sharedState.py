@@ -0,0 +1,327 @@
+import asyncio
+import heapq
+import logging
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Integer, Text, and_, case, cast, delete, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.lazy import LazySingleton
+from app.core.settings import getSettings
+from app.models.sharedStateModel import SharedStateEntry
+
+logger = logging.getLogger(__name__)
+
+
+class SharedStateBackend(ABC):
+    """Key/value store that is consistent across worker processes
+
+    Values are strings; callers serialize structured data themselves.
+    A ttlSeconds of None means the key never expires.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Return the value for key, or None if missing or expired"""
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttlSeconds: Optional[float] = None) -> None:
+        """Store value under key, replacing any previous value"""
+
+    @abstractmethod
+    async def add(self, key: str, value: str, ttlSeconds: Optional[float] = None) -> bool:
+        """Store value only if key is absent or expired; return whether it was stored"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove key"""
+
+    @abstractmethod
+    async def refresh(self, key: str, value: str, ttlSeconds: Optional[float] = None) -> bool:
+        """Restart key's TTL only if it still holds value; return whether it did
+
+        Lets the owner of a lease extend it without taking it back from a
+        process that acquired it after it expired.
+        """
+
+    @abstractmethod
+    async def deleteIfValue(self, key: str, value: str) -> bool:
+        """Remove key only if it still holds value; return whether it did"""
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int = 1, ttlSeconds: Optional[float] = None) -> int:
+        """Atomically add amount to an integer counter and return the new value
+
+        The TTL is applied when the counter is created, so a counter acts as
+        a fixed window that restarts from amount once it expires.
+        """
+
+    @abstractmethod
+    async def purgeExpired(self) -> int:
+        """Delete expired entries and return how many were removed"""
+
+    async def close(self) -> None:
+        """Release backend resources"""
+
+
+class MemoryStateBackend(SharedStateBackend):
+    """In-process stand-in, only consistent within a single worker
+
+    Expired entries are evicted from an expiry heap on every write, so keys
+    that are never read again (one per rate limit window) do not pile up.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[str, Optional[float]]] = {}
+        # (expiresAt, key); entries whose key was since rewritten are stale
+        self._expiries: List[Tuple[float, str]] = []
+        self._lock = asyncio.Lock()
+
+    def _live(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expiresAt = entry
+        if expiresAt is not None and expiresAt <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    @staticmethod
+    def _expiry(ttlSeconds: Optional[float]) -> Optional[float]:
+        return time.monotonic() + ttlSeconds if ttlSeconds is not None else None
+
+    def _store(self, key: str, value: str, expiresAt: Optional[float]) -> None:
+        self._sweep()
+        previous = self._entries.get(key)
+        self._entries[key] = (value, expiresAt)
+        if expiresAt is not None and (previous is None or previous[1] != expiresAt):
+            heapq.heappush(self._expiries, (expiresAt, key))
+            if len(self._expiries) > 2 * len(self._entries) + 64:
+                # Keys rewritten with fresh TTLs leave stale heap entries behind
+                self._expiries = [
+                    (entryExpiry, entryKey)
+                    for entryKey, (_, entryExpiry) in self._entries.items()
+                    if entryExpiry is not None
+                ]
+                heapq.heapify(self._expiries)
+
+    def _sweep(self) -> int:
+        now = time.monotonic()
+        removed = 0
+        while self._expiries and self._expiries[0][0] <= now:
+            expiresAt, key = heapq.heappop(self._expiries)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == expiresAt:
+                del self._entries[key]
+                removed += 1
+        return removed
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._live(key)
+
+    async def set(self, key: str, value: str, ttlSeconds: Optional[float] = None) -> None:
+        self._store(key, value, self._expiry(ttlSeconds))
+
+    async def add(self, key: str, value: str, ttlSeconds: Optional[float] = None) -> bool:
+        async with self._lock:
+            if self._live(key) is not None:
+                return False
+            self._store(key, value, self._expiry(ttlSeconds))
+            return True
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def refresh(self, key: str, value: str, ttlSeconds: Optional[float] = None) -> bool:
+        async with self._lock:
+            if self._live(key) != value:
+                return False
+            self._store(key, value, self._expiry(ttlSeconds))
+            return True
+
+    async def deleteIfValue(self, key: str, value: str) -> bool:
+        async with self._lock:
+            if self._live(key) != value:
+                return False
+            del self._entries[key]
+            return True
+
+    async def incr(self, key: str, amount: int = 1, ttlSeconds: Optional[float] = None) -> int:
+        async with self._lock:
+            current = self._live(key)
+            if current is None:
+                self._store(key, str(amount), self._expiry(ttlSeconds))
+                return amount
+            value = int(current) + amount
+            self._store(key, str(value), self._entries[key][1])
+            return value
+
+    async def purgeExpired(self) -> int:
+        """Evict expired entries and return how many were removed"""
+        return self._sweep()
+
+
+class DatabaseStateBackend(SharedStateBackend):
+    """Shared state kept in the shared_state table of the service database"""
+
+    def __init__(self, engineFactory: Callable[[], AsyncEngine]) -> None:
+        # Resolve the engine per call so workers use their own post-fork engine
+        self._engineFactory = engineFactory
+        self._table = SharedStateEntry.__table__
+
+    def _insert(self, engine: AsyncEngine):
+        if engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(self._table)
+
+    @staticmethod
+    def _expiry(now: datetime, ttlSeconds: Optional[float]) -> Optional[datetime]:
+        return now + timedelta(seconds=ttlSeconds) if ttlSeconds is not None else None
+
+    def _expired(self, now: datetime):
+        table = self._table
+        return and_(table.c.expiresAt.is_not(None), table.c.expiresAt <= now)
+
+    async def get(self, key: str) -> Optional[str]:
+        table = self._table
+        now = datetime.now(timezone.utc)
+        async with self._engineFactory().connect() as conn:
+            result = await conn.execute(
+                select(table.c.value).where(
+                    table.c.key == key,
+                    or_(table.c.expiresAt.is_(None), table.c.expiresAt > now),
+                )
+            )
+            return result.scalar_one_or_none()
+
+    async def set(self, key: str, value: str, ttlSeconds: Optional[float] = None) -> None:
+        engine = self._engineFactory()
+        expiresAt = self._expiry(datetime.now(timezone.utc), ttlSeconds)
+        stmt = self._insert(engine).values(key=key, value=value, expiresAt=expiresAt)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self._table.c.key],
+            set_={"value": value, "expiresAt": expiresAt},
+        )
+        async with engine.begin() as conn:
+            await conn.execute(stmt)
+
+    async def add(self, key: str, value: str, ttlSeconds: Optional[float] = None) -> bool:
+        engine = self._engineFactory()
+        now = datetime.now(timezone.utc)
+        expiresAt = self._expiry(now, ttlSeconds)
+        stmt = self._insert(engine).values(key=key, value=value, expiresAt=expiresAt)
+        # Only take over an existing key once it has expired
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self._table.c.key],
+            set_={"value": value, "expiresAt": expiresAt},
+            where=self._expired(now),
+        ).returning(self._table.c.key)
+        async with engine.begin() as conn:
+            result = await conn.execute(stmt)
+            return result.first() is not None
+
+    async def delete(self, key: str) -> None:
+        async with self._engineFactory().begin() as conn:
+            await conn.execute(delete(self._table).where(self._table.c.key == key))
+
+    def _holds(self, key: str, value: str, now: datetime):
+        table = self._table
+        return and_(
+            table.c.key == key,
+            table.c.value == value,
+            or_(table.c.expiresAt.is_(None), table.c.expiresAt > now),
+        )
+
+    async def refresh(self, key: str, value: str, ttlSeconds: Optional[float] = None) -> bool:
+        now = datetime.now(timezone.utc)
+        async with self._engineFactory().begin() as conn:
+            result = await conn.execute(
+                update(self._table)
+                .where(self._holds(key, value, now))
+                .values(expiresAt=self._expiry(now, ttlSeconds))
+            )
+            return result.rowcount > 0
+
+    async def deleteIfValue(self, key: str, value: str) -> bool:
+        now = datetime.now(timezone.utc)
+        async with self._engineFactory().begin() as conn:
+            result = await conn.execute(
+                delete(self._table).where(self._holds(key, value, now))
+            )
+            return result.rowcount > 0
+
+    async def incr(self, key: str, amount: int = 1, ttlSeconds: Optional[float] = None) -> int:
+        engine = self._engineFactory()
+        table = self._table
+        now = datetime.now(timezone.utc)
+        expiresAt = self._expiry(now, ttlSeconds)
+        expired = self._expired(now)
+        stmt = self._insert(engine).values(key=key, value=str(amount), expiresAt=expiresAt)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={
+                "value": case(
+                    (expired, str(amount)),
+                    else_=cast(cast(table.c.value, Integer) + amount, Text),
+                ),
+                "expiresAt": case(
+                    (expired, literal(expiresAt, DateTime(timezone=True))),
+                    else_=table.c.expiresAt,
+                ),
+            },
+        ).returning(table.c.value)
+        async with engine.begin() as conn:
+            result = await conn.execute(stmt)
+            return int(result.scalar_one())
+
+    async def purgeExpired(self) -> int:
+        """Delete expired entries and return how many were removed"""
+        async with self._engineFactory().begin() as conn:
+            result = await conn.execute(
+                delete(self._table).where(self._expired(datetime.now(timezone.utc)))
+            )
+            return result.rowcount
+
+
+class RateLimiter:
+    """Fixed-window rate limiter on top of a shared state backend"""
+
+    def __init__(self, backend: SharedStateBackend, prefix: str = "ratelimit") -> None:
+        self.backend = backend
+        self.prefix = prefix
+
+    async def hit(self, key: str, limit: int, windowSeconds: float) -> bool:
+        """Count one hit for key; return False once limit is exceeded in the window"""
+        # One counter per key, expiring at the end of the current window, so
+        # a key never leaves a row or entry behind for every window it used
+        remaining = windowSeconds - (time.time() % windowSeconds)
+        count = await self.backend.incr(f"{self.prefix}:{key}", ttlSeconds=remaining)
+        return count <= limit
+
+    async def acquire(self, key: str, limit: int, windowSeconds: float) -> None:
+        """Wait until a hit for key fits within limit, sleeping out full windows"""
+        while not await self.hit(key, limit, windowSeconds):
+            remaining = windowSeconds - (time.time() % windowSeconds)
+            await asyncio.sleep(remaining)
+
+
+def _createSharedState() -> SharedStateBackend:
+    """Create the configured shared state backend"""
+    backend = getSettings.SHARED_STATE_BACKEND.lower()
+    if backend == "memory":
+        return MemoryStateBackend()
+    if backend == "database":
+        from app.core.database import getDatabaseManager
+
+        return DatabaseStateBackend(lambda: getDatabaseManager().asyncEngine)
+    raise ValueError(f"Unsupported SHARED_STATE_BACKEND: {backend}")
+
+
+# Global shared state backend, created on first use
+getSharedState = LazySingleton(_createSharedState)
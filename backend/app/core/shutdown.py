@@ -0,0 +1,203 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Coroutine, Dict, Optional, Sequence, Set
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.deadline import detachedContext
+from app.core.lazy import LazySingleton
+
+logger = logging.getLogger(__name__)
+
+# How often shutdown re-checks the in-flight request count
+DRAIN_POLL_SECONDS = 0.05
+
+
+class ShutdownManager:
+    """Track in-flight requests and background work so shutdown can wait for them
+
+    Requests are drained on the shutdown signal, while the server still
+    listens (see drainRequests and app.core.server): readiness is withdrawn
+    so load balancers stop sending traffic, then new requests are refused
+    with 503 and those already running are given time to finish. Tracked
+    background tasks are awaited and then cancelled by the lifespan
+    shutdown, which also stops the untracked service loops.
+    """
+
+    def __init__(self) -> None:
+        self.ready = True
+        self.draining = False
+        self.inFlight = 0
+        # Outcome of drainRequests; None when it never ran
+        self.requestsDrained: Optional[bool] = None
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+
+    @property
+    def pendingTasks(self) -> int:
+        return sum(1 for task in self._tasks if not task.done())
+
+    def requestStarted(self) -> None:
+        self.inFlight += 1
+
+    def requestFinished(self) -> None:
+        self.inFlight -= 1
+
+    def withdrawReadiness(self) -> None:
+        """Report not-ready from now on, while still serving requests"""
+        if self.ready:
+            self.ready = False
+            logger.info(
+                "Readiness withdrawn ahead of shutdown",
+                extra={"operation": "shutdown_drain", "in_flight": self.inFlight},
+            )
+
+    def startDraining(self) -> None:
+        self.ready = False
+        if not self.draining:
+            self.draining = True
+            logger.info(
+                "Draining: refusing new requests",
+                extra={"operation": "shutdown_drain", "in_flight": self.inFlight},
+            )
+
+    def createTask(
+        self, coro: Coroutine[Any, Any, Any], name: Optional[str] = None
+    ) -> "asyncio.Task[Any]":
+        """Start background work that shutdown should wait for
+
+        The task does not inherit the deadline of the request that started it.
+        """
+        task = asyncio.create_task(coro, name=name, context=detachedContext())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def drainRequests(
+        self, readinessDelaySeconds: float, timeoutSeconds: float
+    ) -> bool:
+        """Take the process out of rotation, then let in-flight requests finish
+
+        Readiness is withdrawn at once; requests keep being served for
+        readinessDelaySeconds so load balancers notice, after which new ones
+        are refused and running ones get timeoutSeconds. Returns False if
+        requests were still running at the deadline.
+        """
+        self.withdrawReadiness()
+        if readinessDelaySeconds > 0:
+            await asyncio.sleep(readinessDelaySeconds)
+        self.startDraining()
+        self.requestsDrained = await self.waitForRequests(
+            time.monotonic() + timeoutSeconds
+        )
+        return self.requestsDrained
+
+    async def waitForRequests(self, deadline: float) -> bool:
+        """Wait until no request is in flight; False if the deadline passed first"""
+        while self.inFlight > 0:
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(DRAIN_POLL_SECONDS)
+        return True
+
+    async def waitForTasks(self, deadline: float) -> int:
+        """Wait for tracked tasks, cancel those still running at the deadline
+
+        Returns the number of tasks that had to be cancelled.
+        """
+        pending = {task for task in self._tasks if not task.done()}
+        if not pending:
+            return 0
+        _, stillRunning = await asyncio.wait(
+            pending, timeout=max(0.0, deadline - time.monotonic())
+        )
+        for task in stillRunning:
+            task.cancel()
+        if stillRunning:
+            await asyncio.gather(*stillRunning, return_exceptions=True)
+            logger.warning(
+                "Background tasks cancelled at shutdown deadline",
+                extra={
+                    "operation": "shutdown_drain",
+                    "tasks": sorted(task.get_name() for task in stillRunning),
+                },
+            )
+        return len(stillRunning)
+
+
+class InFlightMiddleware:
+    """Count requests for the shutdown drain and refuse new ones while draining
+
+    Paths starting with one of exemptPaths (health probes) are neither
+    counted nor refused, so probes keep getting real answers during a drain.
+    """
+
+    def __init__(self, app: ASGIApp, exemptPaths: Sequence[str] = ()) -> None:
+        self.app = app
+        self.exemptPaths = tuple(exemptPaths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (
+            self.exemptPaths and scope["path"].startswith(self.exemptPaths)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        shutdownManager = getShutdownManager()
+        if shutdownManager.draining:
+            await _sendUnavailable(send)
+            return
+
+        shutdownManager.requestStarted()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            shutdownManager.requestFinished()
+
+
+async def _sendUnavailable(send: Send) -> None:
+    body = json.dumps({"detail": "Service is shutting down"}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", b"1"),
+                (b"connection", b"close"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class ShutdownTimer:
+    """Collect how long each shutdown phase took, in milliseconds"""
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, int] = {}
+        self._start = time.monotonic()
+
+    async def phase(self, name: str, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run one phase; a failure is logged so the remaining phases still run"""
+        startTime = time.monotonic()
+        try:
+            return await coro
+        except Exception as e:
+            logger.error(
+                f"Shutdown phase {name} failed: {e}",
+                extra={"operation": "shutdown", "phase": name},
+            )
+            return None
+        finally:
+            self.timings[f"{name}_ms"] = int((time.monotonic() - startTime) * 1000)
+
+    @property
+    def totalMs(self) -> int:
+        return int((time.monotonic() - self._start) * 1000)
+
+
+# Process-wide shutdown state, consulted by the middleware on every request
+getShutdownManager = LazySingleton(ShutdownManager)
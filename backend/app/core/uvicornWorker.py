@@ -0,0 +1,36 @@
+"""Gunicorn worker class that serves the app with DrainingServer.
+
+    worker_class = "app.core.uvicornWorker.DrainingUvicornWorker"
+"""
+
+import sys
+
+from gunicorn.arbiter import Arbiter
+
+from app.core.server import DrainingServer
+from app.core.settings import getSettings
+
+try:
+    from uvicorn_worker import UvicornWorker
+except ImportError:  # pragma: no cover - optional dependency
+    from uvicorn.workers import UvicornWorker
+
+
+class DrainingUvicornWorker(UvicornWorker):
+    """uvicorn worker that drains requests on SIGTERM before it stops listening"""
+
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        # The worker otherwise leaves uvicorn's wait for open connections
+        # unbounded, so a slow request would hold shutdown until gunicorn's
+        # graceful_timeout kill and skip the lifespan shutdown entirely
+        "timeout_graceful_shutdown": int(getSettings.SHUTDOWN_TIMEOUT_SECONDS),
+    }
+
+    async def _serve(self) -> None:
+        self.config.app = self.wsgi
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
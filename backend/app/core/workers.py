@@ -0,0 +1,86 @@
+import logging
+import math
+import os
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def availableCpus() -> int:
+    """CPUs this process may use, honouring affinity masks and cgroup quotas"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+
+    quota = _cgroupCpuQuota()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return max(1, cpus)
+
+
+def _cgroupCpuQuota() -> Optional[float]:
+    """CPU limit from cgroup v2 cpu.max or cgroup v1 cfs files, if any"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max", encoding="utf-8") as fh:
+            quota, period = fh.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", encoding="utf-8") as fh:
+            quota = int(fh.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us", encoding="utf-8") as fh:
+            period = int(fh.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def defaultWorkerCount(
+    configured: Optional[int] = None, maxWorkers: Optional[int] = None
+) -> int:
+    """Number of worker processes to run
+
+    Login and registration are dominated by CPU-bound argon2 hashing on the
+    event loop, so one worker per available CPU is the baseline.
+    """
+    workers = configured if configured else availableCpus()
+    if maxWorkers:
+        workers = min(workers, maxWorkers)
+    return max(1, workers)
+
+
+def resetAfterFork() -> None:
+    """Drop process-wide singletons inherited from the parent process
+
+    Connections and client sockets must never be shared across a fork, so a
+    worker builds its own engine, SMS client and shared state on first use.
+    """
+    from app.core.audit import getAuditLog
+    from app.core.database import getDatabaseManager
+    from app.core.sharedState import getSharedState
+    from app.core.shutdown import getShutdownManager
+    from app.provider.smsProvider import getSmsService
+
+    databaseManager = getDatabaseManager.peek()
+    if databaseManager is not None:
+        # Forget inherited pooled connections without closing the parent's sockets
+        databaseManager.asyncEngine.sync_engine.dispose(close=False)
+    for singleton in (
+        getDatabaseManager,
+        getSmsService,
+        getSharedState,
+        getAuditLog,
+        getShutdownManager,
+    ):
+        singleton.reset()
+
+    logger.info(
+        "Worker process state reset after fork",
+        extra={"operation": "reset_after_fork", "pid": os.getpid()},
+    )
@@ -0,0 +1,29 @@
+"""Periodic background jobs run by app.core.scheduler
+
+Each module exposes register(scheduler), which reads its schedule from
+settings when called, so importing this package has no side effects.
+"""
+
+from app.core.scheduler import Scheduler
+from app.jobs import (
+    auditRetention,
+    orderArchival,
+    otpCleanup,
+    reservationSweep,
+    sessionPruning,
+    sharedStatePurge,
+)
+
+JOB_MODULES = (
+    reservationSweep,
+    otpCleanup,
+    sessionPruning,
+    auditRetention,
+    orderArchival,
+    sharedStatePurge,
+)
+
+
+def registerJobs(scheduler: Scheduler) -> None:
+    for module in JOB_MODULES:
+        module.register(scheduler)
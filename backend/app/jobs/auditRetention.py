@@ -0,0 +1,14 @@
+from app.core.audit import getAuditLog
+from app.core.scheduler import Scheduler
+from app.core.settings import getSettings
+
+
+async def maintainAuditLog() -> None:
+    """Create upcoming audit partitions and drop events past AUDIT_RETENTION_DAYS"""
+    await getAuditLog().maintain()
+
+
+def register(scheduler: Scheduler) -> None:
+    scheduler.interval(
+        "audit_retention", getSettings.AUDIT_MAINTENANCE_INTERVAL_SECONDS, maintainAuditLog
+    )
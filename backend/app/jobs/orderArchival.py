@@ -0,0 +1,14 @@
+from app.core.orderArchive import getOrderArchiver
+from app.core.scheduler import Scheduler
+from app.core.settings import getSettings
+
+
+async def archiveOrders() -> None:
+    """Create upcoming order partitions and archive months past the cutoff"""
+    await getOrderArchiver().maintain()
+
+
+def register(scheduler: Scheduler) -> None:
+    scheduler.interval(
+        "order_archival", getSettings.ORDER_MAINTENANCE_INTERVAL_SECONDS, archiveOrders
+    )
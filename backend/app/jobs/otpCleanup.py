@@ -0,0 +1,28 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app.core.database import getDatabaseManager
+from app.core.scheduler import Scheduler
+from app.core.settings import getSettings
+from app.repository.otpRepo import OTPRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def cleanupOtps() -> int:
+    """Delete OTPs that expired more than OTP_RETENTION_HOURS ago"""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=getSettings.OTP_RETENTION_HOURS)
+    async with getDatabaseManager().asyncSessionMaker() as session:
+        deleted = await OTPRepository(session).deleteExpired(cutoff)
+    if deleted:
+        logger.info(
+            "Expired OTPs deleted",
+            extra={"operation": "otp_cleanup", "deleted": deleted},
+        )
+    return deleted
+
+
+def register(scheduler: Scheduler) -> None:
+    scheduler.interval(
+        "otp_cleanup", getSettings.OTP_CLEANUP_INTERVAL_SECONDS, cleanupOtps, timeoutSeconds=300
+    )
@@ -0,0 +1,15 @@
+from app.core.database import getDatabaseManager
+from app.core.scheduler import Scheduler
+from app.core.settings import getSettings
+from app.services.inventoryService import expireReservations
+
+
+async def sweepReservations() -> None:
+    """Return expired stock reservations to available stock"""
+    await expireReservations(getDatabaseManager().asyncSessionMaker)
+
+
+def register(scheduler: Scheduler) -> None:
+    scheduler.interval(
+        "reservation_sweep", getSettings.RESERVATION_SWEEP_INTERVAL_SECONDS, sweepReservations
+    )
@@ -0,0 +1,30 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app.core.database import getDatabaseManager
+from app.core.revocation import SYNC_OVERLAP
+from app.core.scheduler import Scheduler
+from app.core.settings import getSettings
+from app.repository.sessionRepo import SessionRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def pruneSessions() -> int:
+    """Delete expired sessions, and revoked ones no live access token can refer to"""
+    now = datetime.now(timezone.utc)
+    revokedBefore = now - timedelta(minutes=getSettings.ACCESS_TOKEN_EXPIRE_MINUTES) - SYNC_OVERLAP
+    async with getDatabaseManager().asyncSessionMaker() as session:
+        deleted = await SessionRepository(session).deleteFinished(now, revokedBefore)
+    if deleted:
+        logger.info(
+            "Finished sessions deleted",
+            extra={"operation": "session_pruning", "deleted": deleted},
+        )
+    return deleted
+
+
+def register(scheduler: Scheduler) -> None:
+    scheduler.cron(
+        "session_pruning", getSettings.SESSION_PRUNE_CRON, pruneSessions, timeoutSeconds=600
+    )
@@ -0,0 +1,32 @@
+import logging
+
+from app.core.database import getDatabaseManager
+from app.core.scheduler import Scheduler
+from app.core.settings import getSettings
+from app.core.sharedState import DatabaseStateBackend, getSharedState
+
+logger = logging.getLogger(__name__)
+
+
+async def purgeSharedState() -> int:
+    """Delete expired shared state rows, including the scheduler's own run leases
+
+    A memory backend is swept too, though only on the worker that runs the
+    job; every worker also evicts its own expired entries as it writes.
+    """
+    purged = await DatabaseStateBackend(lambda: getDatabaseManager().asyncEngine).purgeExpired()
+    backend = getSharedState()
+    if not isinstance(backend, DatabaseStateBackend):
+        purged += await backend.purgeExpired()
+    if purged:
+        logger.info(
+            "Expired shared state purged",
+            extra={"operation": "shared_state_purge", "purged": purged},
+        )
+    return purged
+
+
+def register(scheduler: Scheduler) -> None:
+    scheduler.interval(
+        "shared_state_purge", getSettings.SHARED_STATE_PURGE_INTERVAL_SECONDS, purgeSharedState
+    )
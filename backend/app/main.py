@@ -1,15 +1,46 @@
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
+from datetime import timedelta
 from typing import Any, List
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.v1.adminRoute import adminRoutes
+from app.api.v1.healthRoute import healthRoutes
+from app.api.v1.inventoryRoute import inventoryRoutes
+from app.api.v1.metricsRoute import metricsRoutes
+from app.api.v1.orderRoute import orderRoutes
 from app.api.v1.userRoute import userRoutes
-from app.core.database import databaseManager
+from app.core.audit import getAuditLog
+from app.core.compression import CompressionMiddleware
+from app.core.database import getDatabaseManager
+from app.core.deadline import DeadlineMiddleware, installStatementTimeouts
+from app.core.health import getHealthMonitor
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.profiling import ProfilingMiddleware, installStatementTiming
+from app.core.queryStats import QueryStatsMiddleware, installQueryStats
+from app.core.responses import getDefaultResponseClass
+from app.core.revocation import getRevocationList
+from app.core.security import getPwdContext
+from app.core.scheduler import getScheduler
 from app.core.settings import getSettings
-from app.models import orderModel, otpModel, userModel  # noqa: F401
+from app.core.sharedState import getSharedState
+from app.core.shutdown import InFlightMiddleware, ShutdownTimer, getShutdownManager
+from app.models import (  # noqa: F401
+    auditEventModel,
+    inventoryModel,
+    orderModel,
+    otpModel,
+    schemaVersionModel,
+    sessionModel,
+    sharedStateModel,
+    userModel,
+)
+from app.provider.smsProvider import getSmsService
+from app.utils.jwtHandler import getJwtHandler
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +55,18 @@ async def lifespan(app: FastAPI):
         await _handleStartupError(startupStart, e)
         raise
     yield
+    await _shutdownServices(app)
 
 
 async def _initializeServices(app: FastAPI, startupStart: float):
     """initialize all application services during startup"""
 
     databaseDuration = await _initDatabase()
+    singletonsDuration = _initSingletons()
+    sessionsDuration = await _initSessions(app)
+    _initAudit(app)
+    _initScheduler(app)
+    healthDuration = await _initHealth(app)
 
     totalStartupDuration = int((time.time() - startupStart) * 1000)
     logger.info(
@@ -37,22 +74,165 @@ async def _initializeServices(app: FastAPI, startupStart: float):
         extra={
             "total_startup_duration_ms": totalStartupDuration,
             "database_init_ms": databaseDuration,
+            "singletons_init_ms": singletonsDuration,
+            "sessions_init_ms": sessionsDuration,
+            "health_init_ms": healthDuration,
         },
     )
 
 
 async def _initDatabase() -> int:
-    """Initialize database"""
+    """Initialize database and verify the schema version"""
     startTime = time.time()
-    await databaseManager.createTables()
+    await getDatabaseManager().checkSchemaVersion(
+        autoMigrate=getSettings.DATABASE_AUTO_MIGRATE
+    )
+    installStatementTimeouts(getDatabaseManager().asyncEngine)
+    if getSettings.PROFILING_ENABLED:
+        installStatementTiming(getDatabaseManager().asyncEngine)
+    if _queryStatsEnabled():
+        installQueryStats(getDatabaseManager().asyncEngine)
     duration = int((time.time() - startTime) * 1000)
     logger.info(
-        "Database tables created",
+        "Database schema verified",
         extra={"duration_ms": duration},
     )
     return duration
 
 
+def _initSingletons() -> int:
+    """Build the lazily created service singletons before serving traffic"""
+    startTime = time.time()
+    getJwtHandler()
+    getPwdContext()
+    getSmsService()
+    return int((time.time() - startTime) * 1000)
+
+
+async def _initSessions(app: FastAPI) -> int:
+    """Load session revocations and keep them in sync in the background"""
+    startTime = time.time()
+    revocationList = getRevocationList()
+    sessionMaker = getDatabaseManager().asyncSessionMaker
+    await revocationList.load(
+        sessionMaker, timedelta(minutes=getSettings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    app.state.revocationSyncTask = asyncio.create_task(
+        revocationList.runSync(
+            sessionMaker, getSettings.SESSION_REVOCATION_SYNC_SECONDS
+        ),
+        name="revocationSync",
+    )
+    return int((time.time() - startTime) * 1000)
+
+
+def _initAudit(app: FastAPI) -> None:
+    """Start flushing buffered audit events in the background"""
+    app.state.auditFlushTask = asyncio.create_task(
+        getAuditLog().run(), name="auditFlush"
+    )
+
+
+def _initScheduler(app: FastAPI) -> None:
+    """Run the periodic jobs in app/jobs, each run on one worker"""
+    if not getSettings.SCHEDULER_ENABLED:
+        return
+    app.state.schedulerTask = asyncio.create_task(
+        getScheduler().run(), name="scheduler"
+    )
+
+
+async def _initHealth(app: FastAPI) -> int:
+    """Run the health probes once before serving, then keep them fresh"""
+    startTime = time.time()
+    healthMonitor = getHealthMonitor()
+    await healthMonitor.runProbes()
+    app.state.healthProbeTask = asyncio.create_task(
+        healthMonitor.run(), name="healthProbes"
+    )
+    return int((time.time() - startTime) * 1000)
+
+
+async def _shutdownServices(app: FastAPI) -> None:
+    """Drain background work, then release service resources
+
+    Requests were already drained on the shutdown signal, before the server
+    stopped listening (app.core.server.DrainingServer). Every phase here
+    shares one deadline of SHUTDOWN_TIMEOUT_SECONDS; resources are released
+    even when draining runs out of time.
+    """
+    shutdownManager = getShutdownManager()
+    # Servers without the signal-time drain: refuse anything that still arrives
+    shutdownManager.startDraining()
+    deadline = time.monotonic() + getSettings.SHUTDOWN_TIMEOUT_SECONDS
+    timer = ShutdownTimer()
+
+    tasksCancelled = await timer.phase(
+        "background_tasks", shutdownManager.waitForTasks(deadline)
+    )
+    await timer.phase("service_loops", _stopServiceLoops(app, deadline))
+    if getAuditLog.isInitialized:
+        # Write out buffered events while the database is still available
+        await timer.phase("audit", getAuditLog().drain())
+    if getSmsService.isInitialized:
+        await timer.phase("sms", getSmsService().close())
+    if getSharedState.isInitialized:
+        await timer.phase("shared_state", getSharedState().close())
+        getSharedState.reset()
+    if getDatabaseManager.isInitialized:
+        await timer.phase("database", getDatabaseManager().close())
+        getDatabaseManager.reset()
+
+    logger.info(
+        "Service shut down",
+        extra={
+            "total_shutdown_duration_ms": timer.totalMs,
+            "requests_drained": shutdownManager.requestsDrained,
+            "requests_abandoned": shutdownManager.inFlight,
+            "tasks_cancelled": tasksCancelled or 0,
+            **timer.timings,
+        },
+    )
+    getShutdownManager.reset()
+
+
+async def _stopServiceLoops(app: FastAPI, deadline: float) -> None:
+    """Cancel the periodic loops started at startup
+
+    Waits for them until the shared shutdown deadline; a loop that ignores
+    its cancellation is logged and left behind so the remaining phases
+    still release their resources.
+    """
+    tasks = {
+        task
+        for task in (
+            getattr(app.state, taskName, None)
+            for taskName in (
+                "revocationSyncTask",
+                "auditFlushTask",
+                "schedulerTask",
+                "healthProbeTask",
+            )
+        )
+        if task is not None and not task.done()
+    }
+    if not tasks:
+        return
+    for task in tasks:
+        task.cancel()
+    _, stillRunning = await asyncio.wait(
+        tasks, timeout=max(0.0, deadline - time.monotonic())
+    )
+    if stillRunning:
+        logger.warning(
+            "Service loops still running at shutdown deadline",
+            extra={
+                "operation": "shutdown",
+                "tasks": sorted(task.get_name() for task in stillRunning),
+            },
+        )
+
+
 async def _handleStartupError(startupStart: float, error: Exception) -> None:
     """Handle startup error with logging"""
     logger.error(
@@ -73,18 +253,100 @@ def createApp() -> FastAPI:
         version=getSettings.APP_VERSION,
         debug=getSettings.DEBUG,
         lifespan=lifespan,
+        default_response_class=getDefaultResponseClass(
+            getSettings.JSON_RESPONSE_BACKEND
+        ),
         openapi_url="/openapi.json" if getSettings.DEBUG else None,
         docs_url="/docs" if getSettings.DEBUG else None,
         redoc_url="/redoc" if getSettings.DEBUG else None,
     )
 
     # Setup application components
+    _setupIdempotency(app)
+    _setupDeadlines(app)
+    _setupQueryStats(app)
     _setupCors(app)
+    _setupCompression(app)
+    _setupProfiling(app)
+    _setupShutdownDrain(app)
     _setupRoutes(app)
 
     return app
 
 
+def _setupIdempotency(app: FastAPI) -> None:
+    """Configure Idempotency-Key handling
+
+    Added first so it is the innermost middleware and caches responses
+    before CORS headers and compression are applied.
+    """
+    if not getSettings.IDEMPOTENCY_ENABLED:
+        return
+    app.add_middleware(
+        IdempotencyMiddleware,
+        paths=getSettings.IDEMPOTENCY_PATHS,
+        secretKey=getSettings.SECRET_KEY,
+        ttlSeconds=getSettings.IDEMPOTENCY_TTL_SECONDS,
+        waitSeconds=getSettings.IDEMPOTENCY_WAIT_SECONDS,
+    )
+
+    logger.info(
+        "Idempotency Middleware configured",
+        extra={
+            "paths": getSettings.IDEMPOTENCY_PATHS,
+            "ttl_seconds": getSettings.IDEMPOTENCY_TTL_SECONDS,
+        },
+    )
+
+
+def _setupDeadlines(app: FastAPI) -> None:
+    """Configure per-request time budgets
+
+    Sits just outside idempotency so a duplicate waiting on the first
+    execution is bounded too.
+    """
+    app.add_middleware(
+        DeadlineMiddleware,
+        defaultSeconds=getSettings.REQUEST_TIMEOUT_SECONDS,
+        routeTimeouts=getSettings.REQUEST_ROUTE_TIMEOUTS,
+    )
+
+    logger.info(
+        "Deadline Middleware configured",
+        extra={
+            "default_seconds": getSettings.REQUEST_TIMEOUT_SECONDS,
+            "route_timeouts": getSettings.REQUEST_ROUTE_TIMEOUTS,
+        },
+    )
+
+
+def _queryStatsEnabled() -> bool:
+    return getSettings.DEBUG or getSettings.QUERY_STATS_ENABLED
+
+
+def _setupQueryStats(app: FastAPI) -> None:
+    """Configure per-request statement counting and N+1 warnings
+
+    Sits outside idempotency so replayed responses report their own
+    (zero) query count rather than the cached one.
+    """
+    if not _queryStatsEnabled():
+        return
+    app.add_middleware(
+        QueryStatsMiddleware,
+        exposeHeaders=getSettings.DEBUG,
+        repeatThreshold=getSettings.QUERY_STATS_REPEAT_THRESHOLD,
+    )
+
+    logger.info(
+        "Query Stats Middleware configured",
+        extra={
+            "expose_headers": getSettings.DEBUG,
+            "repeat_threshold": getSettings.QUERY_STATS_REPEAT_THRESHOLD,
+        },
+    )
+
+
 def _setupCors(app: FastAPI) -> None:
     """Configure CORS settings"""
     app.add_middleware(
@@ -104,6 +366,54 @@ def _setupCors(app: FastAPI) -> None:
     )
 
 
+def _setupCompression(app: FastAPI) -> None:
+    """Configure response compression"""
+    if not getSettings.COMPRESSION_ENABLED:
+        return
+    app.add_middleware(
+        CompressionMiddleware,
+        minimumSize=getSettings.COMPRESSION_MINIMUM_SIZE,
+        gzipLevel=getSettings.COMPRESSION_GZIP_LEVEL,
+        brotliQuality=getSettings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+    logger.info(
+        "Compression Middleware configured",
+        extra={
+            "minimum_size": getSettings.COMPRESSION_MINIMUM_SIZE,
+            "json_backend": getSettings.JSON_RESPONSE_BACKEND,
+        },
+    )
+
+
+def _setupProfiling(app: FastAPI) -> None:
+    """Configure opt-in per-request profiling"""
+    if not getSettings.PROFILING_ENABLED:
+        return
+    app.add_middleware(
+        ProfilingMiddleware,
+        outputDir=getSettings.PROFILING_OUTPUT_DIR,
+        secret=getSettings.ADMIN_SECRET,
+        sampleRate=getSettings.PROFILING_SAMPLE_RATE,
+        mode=getSettings.PROFILING_MODE,
+        sampleIntervalMs=getSettings.PROFILING_SAMPLE_INTERVAL_MS,
+    )
+
+    logger.info(
+        "Profiling Middleware configured",
+        extra={
+            "mode": getSettings.PROFILING_MODE,
+            "sample_rate": getSettings.PROFILING_SAMPLE_RATE,
+            "output_dir": getSettings.PROFILING_OUTPUT_DIR,
+        },
+    )
+
+
+def _setupShutdownDrain(app: FastAPI) -> None:
+    """Track in-flight requests; added last so it is the outermost middleware"""
+    app.add_middleware(InFlightMiddleware, exemptPaths=["/health/"])
+
+
 def _setupRoutes(app: FastAPI) -> None:
     """Register application routes."""
     routerInfo: List[dict[str, Any]] = []
@@ -118,6 +428,47 @@ def _setupRoutes(app: FastAPI) -> None:
         }
     )
 
+    # Order routes
+    app.include_router(orderRoutes, prefix="/api/v1/orders", tags=["Orders"])
+    routerInfo.append(
+        {
+            "route": "order",
+            "prefix": "/api/v1/orders",
+            "tags": ["Orders"],
+        }
+    )
+
+    # Inventory routes
+    app.include_router(
+        inventoryRoutes, prefix="/api/v1/inventory", tags=["Inventory"]
+    )
+    routerInfo.append(
+        {
+            "route": "inventory",
+            "prefix": "/api/v1/inventory",
+            "tags": ["Inventory"],
+        }
+    )
+
+    # Admin routes
+    app.include_router(adminRoutes, prefix="/api/v1/admin", tags=["Admin"])
+    routerInfo.append(
+        {
+            "route": "admin",
+            "prefix": "/api/v1/admin",
+            "tags": ["Admin"],
+        }
+    )
+
+    # Health probes, outside the versioned API for load balancers
+    app.include_router(healthRoutes, prefix="/health", tags=["Health"])
+    routerInfo.append({"route": "health", "prefix": "/health", "tags": ["Health"]})
+
+    # Metrics
+    if getSettings.METRICS_ENABLED:
+        app.include_router(metricsRoutes, tags=["Metrics"])
+        routerInfo.append({"route": "metrics", "prefix": "", "tags": ["Metrics"]})
+
     logger.info(
         "Registering application routes",
         extra={
@@ -0,0 +1,6 @@
+"""Versioned schema revisions.
+
+Each module defines ``revision``, ``description``, ``upgrade(conn)`` and
+optionally ``transactional = False`` for online (concurrent) index builds.
+Revisions are applied in lexical order of ``revision``.
+"""
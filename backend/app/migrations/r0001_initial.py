@@ -0,0 +1,57 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+)
+from sqlalchemy.engine import Connection
+
+revision = "0001"
+description = "Initial users, otps and orders tables"
+
+metadata = MetaData()
+
+users = Table(
+    "users",
+    metadata,
+    Column("Id", Integer, primary_key=True, autoincrement=True),
+    Column("fullName", String, unique=True, index=True, nullable=False),
+    Column("phoneNumber", String, unique=True, index=True, nullable=False),
+    Column("hashedPassword", String, nullable=False),
+    Column("isVerified", Boolean, nullable=False),
+    Column("createdAt", DateTime, nullable=False),
+    Column("lastLoginAt", DateTime, nullable=True),
+)
+
+otps = Table(
+    "otps",
+    metadata,
+    Column("Id", Integer, primary_key=True, index=True),
+    Column("phoneNumber", String, nullable=False, index=True),
+    Column("otpCode", String(6), nullable=False),
+    Column("createdAt", DateTime, nullable=False),
+    Column("expiresAt", DateTime, nullable=False),
+    Column("isUsed", Boolean, nullable=False),
+)
+
+orders = Table(
+    "orders",
+    metadata,
+    Column("Id", Integer, primary_key=True, autoincrement=True),
+    Column("userId", Integer, ForeignKey("users.Id"), unique=True, nullable=False),
+    Column("productName", String, nullable=False),
+    Column("quantity", Integer, nullable=False),
+    Column("pricePerUnit", Float, nullable=False),
+    Column("totalPrice", Float, nullable=False),
+    Column("orderedAt", DateTime, nullable=False),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    # checkfirst keeps this safe for databases created by the old create_all boot
+    metadata.create_all(conn, checkfirst=True)
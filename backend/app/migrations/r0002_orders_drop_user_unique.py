@@ -0,0 +1,71 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    inspect,
+)
+from sqlalchemy.engine import Connection
+
+revision = "0002"
+description = "Allow several orders per user by dropping the unique orders.userId"
+
+COLUMNS = ["Id", "userId", "productName", "quantity", "pricePerUnit", "totalPrice", "orderedAt"]
+
+
+def upgrade(conn: Connection) -> None:
+    inspector = inspect(conn)
+    uniqueConstraints = [
+        constraint
+        for constraint in inspector.get_unique_constraints("orders")
+        if constraint["column_names"] == ["userId"]
+    ]
+    constraintNames = {constraint["name"] for constraint in uniqueConstraints}
+    # Postgres also reports the index backing a unique constraint
+    uniqueIndexes = [
+        index
+        for index in inspector.get_indexes("orders")
+        if index["unique"]
+        and index["column_names"] == ["userId"]
+        and index["name"] not in constraintNames
+        and "duplicates_constraint" not in index
+    ]
+    if not uniqueConstraints and not uniqueIndexes:
+        return
+
+    if conn.dialect.name == "sqlite":
+        _rebuildSqliteOrders(conn)
+        return
+
+    for constraint in uniqueConstraints:
+        conn.exec_driver_sql(f'ALTER TABLE orders DROP CONSTRAINT "{constraint["name"]}"')
+    for index in uniqueIndexes:
+        conn.exec_driver_sql(f'DROP INDEX "{index["name"]}"')
+
+
+def _rebuildSqliteOrders(conn: Connection) -> None:
+    """SQLite cannot drop an inline UNIQUE constraint, so copy into a new table"""
+    metadata = MetaData()
+    Table("users", metadata, Column("Id", Integer, primary_key=True))
+    rebuilt = Table(
+        "orders_rebuild",
+        metadata,
+        Column("Id", Integer, primary_key=True, autoincrement=True),
+        Column("userId", Integer, ForeignKey("users.Id"), nullable=False),
+        Column("productName", String, nullable=False),
+        Column("quantity", Integer, nullable=False),
+        Column("pricePerUnit", Float, nullable=False),
+        Column("totalPrice", Float, nullable=False),
+        Column("orderedAt", DateTime, nullable=False),
+    )
+    rebuilt.create(conn)
+    columnList = ", ".join(f'"{column}"' for column in COLUMNS)
+    conn.exec_driver_sql(
+        f"INSERT INTO orders_rebuild ({columnList}) SELECT {columnList} FROM orders"
+    )
+    conn.exec_driver_sql("DROP TABLE orders")
+    conn.exec_driver_sql("ALTER TABLE orders_rebuild RENAME TO orders")
@@ -0,0 +1,16 @@
+from sqlalchemy.engine import Connection
+
+from app.core.migrations import createIndexOnline, reflectTable
+
+revision = "0003"
+description = "Index orders by user and order time for order history lookups"
+transactional = False
+
+
+def upgrade(conn: Connection) -> None:
+    createIndexOnline(
+        conn,
+        reflectTable(conn, "orders"),
+        "ix_orders_userId_orderedAt",
+        ["userId", "orderedAt"],
+    )
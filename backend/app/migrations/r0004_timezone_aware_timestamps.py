@@ -0,0 +1,23 @@
+from sqlalchemy.engine import Connection
+
+revision = "0004"
+description = "Store timestamps as timestamptz so timezone-aware UTC values round-trip"
+
+COLUMNS = {
+    "users": ["createdAt", "lastLoginAt"],
+    "otps": ["createdAt", "expiresAt"],
+    "orders": ["orderedAt"],
+}
+
+
+def upgrade(conn: Connection) -> None:
+    # SQLite has no timestamp types; values are already stored as UTC text
+    if conn.dialect.name != "postgresql":
+        return
+    for table, columns in COLUMNS.items():
+        alterations = ", ".join(
+            f'ALTER COLUMN "{column}" TYPE TIMESTAMP WITH TIME ZONE '
+            f"USING \"{column}\" AT TIME ZONE 'UTC'"
+            for column in columns
+        )
+        conn.exec_driver_sql(f"ALTER TABLE {table} {alterations}")
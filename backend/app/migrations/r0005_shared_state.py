@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, MetaData, String, Table, Text
+from sqlalchemy.engine import Connection
+
+revision = "0005"
+description = "Key/value table for state shared across worker processes"
+
+metadata = MetaData()
+
+sharedState = Table(
+    "shared_state",
+    metadata,
+    Column("key", String(255), primary_key=True),
+    Column("value", Text, nullable=False),
+    Column("expiresAt", DateTime(timezone=True), nullable=True, index=True),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    metadata.create_all(conn, checkfirst=True)
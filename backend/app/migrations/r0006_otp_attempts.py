@@ -0,0 +1,13 @@
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+
+revision = "0006"
+description = "Count failed verification attempts per OTP"
+
+
+def upgrade(conn: Connection) -> None:
+    columns = {column["name"] for column in inspect(conn).get_columns("otps")}
+    if "attempts" not in columns:
+        conn.exec_driver_sql(
+            'ALTER TABLE otps ADD COLUMN "attempts" INTEGER NOT NULL DEFAULT 0'
+        )
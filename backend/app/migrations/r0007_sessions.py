@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+revision = "0007"
+description = "Login sessions for refresh-token rotation and revocation"
+
+metadata = MetaData()
+
+Table("users", metadata, Column("Id", Integer, primary_key=True))
+
+sessions = Table(
+    "sessions",
+    metadata,
+    Column("Id", String(32), primary_key=True),
+    Column("userId", Integer, ForeignKey("users.Id"), nullable=False, index=True),
+    Column("refreshTokenHash", String(64), nullable=False),
+    Column("createdAt", DateTime(timezone=True), nullable=False),
+    Column("lastUsedAt", DateTime(timezone=True), nullable=False),
+    Column("expiresAt", DateTime(timezone=True), nullable=False, index=True),
+    Column("revokedAt", DateTime(timezone=True), nullable=True, index=True),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    sessions.create(conn, checkfirst=True)
@@ -0,0 +1,26 @@
+from sqlalchemy import Boolean, Column, DateTime, Integer, MetaData, String, Table, Text
+from sqlalchemy.engine import Connection
+
+revision = "0008"
+description = "Bulk SMS campaigns with resumable progress"
+
+metadata = MetaData()
+
+smsCampaigns = Table(
+    "sms_campaigns",
+    metadata,
+    Column("Id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(100), unique=True, nullable=False),
+    Column("message", Text, nullable=False),
+    Column("verifiedOnly", Boolean, nullable=False),
+    Column("lastUserId", Integer, nullable=False),
+    Column("sentCount", Integer, nullable=False),
+    Column("failedCount", Integer, nullable=False),
+    Column("createdAt", DateTime(timezone=True), nullable=False),
+    Column("updatedAt", DateTime(timezone=True), nullable=False),
+    Column("completedAt", DateTime(timezone=True), nullable=True),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    smsCampaigns.create(conn, checkfirst=True)
@@ -0,0 +1,93 @@
+import logging
+from typing import Dict
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.engine import Connection
+
+from app.core.migrations import createIndexOnline, reflectTable
+from app.utils.phoneNumber import normalizePhoneNumbers
+
+revision = "0009"
+description = "Store phone numbers in canonical E.164 form"
+transactional = False
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def backfillTable(conn: Connection, tableName: str, unique: bool, batchSize: int = BATCH_SIZE) -> Dict[str, int]:
+    """Rewrite phoneNumber to its canonical form in Id-ordered batches
+
+    Safe to re-run. Rows whose number is invalid are left untouched. On a
+    unique column, a row whose canonical number already belongs to another
+    row is a duplicate account; it is left untouched and reported so it can
+    be merged by hand.
+    """
+    table = reflectTable(conn, tableName)
+    stats = {"scanned": 0, "updated": 0, "invalid": 0, "conflicts": 0}
+    lastId = 0
+    while True:
+        rows = conn.execute(
+            select(table.c.Id, table.c.phoneNumber)
+            .where(table.c.Id > lastId)
+            .order_by(table.c.Id)
+            .limit(batchSize)
+        ).all()
+        if not rows:
+            break
+        lastId = rows[-1].Id
+        stats["scanned"] += len(rows)
+
+        changes = []
+        for row, canonical in zip(rows, normalizePhoneNumbers([row.phoneNumber for row in rows])):
+            if canonical is None:
+                stats["invalid"] += 1
+            elif canonical != row.phoneNumber:
+                changes.append({"rowId": row.Id, "canonical": canonical})
+
+        if unique and changes:
+            taken = set(
+                conn.execute(
+                    select(table.c.phoneNumber).where(
+                        table.c.phoneNumber.in_([change["canonical"] for change in changes])
+                    )
+                ).scalars()
+            )
+            accepted = []
+            for change in changes:
+                if change["canonical"] in taken:
+                    stats["conflicts"] += 1
+                    logger.warning(
+                        "Duplicate phone number left unnormalized",
+                        extra={"table": tableName, "rowId": change["rowId"], "phone_number": change["canonical"]},
+                    )
+                    continue
+                taken.add(change["canonical"])
+                accepted.append(change)
+            changes = accepted
+
+        if changes:
+            conn.execute(
+                update(table)
+                .where(table.c.Id == bindparam("rowId"))
+                .values(phoneNumber=bindparam("canonical")),
+                changes,
+            )
+            stats["updated"] += len(changes)
+    return stats
+
+
+def upgrade(conn: Connection) -> None:
+    for tableName, unique in (("users", True), ("otps", False)):
+        stats = backfillTable(conn, tableName, unique)
+        logger.info(
+            "Phone numbers normalized",
+            extra={"operation": "normalize_phone_numbers", "table": tableName, **stats},
+        )
+    createIndexOnline(
+        conn,
+        reflectTable(conn, "otps"),
+        "ix_otps_phoneNumber_createdAt",
+        ["phoneNumber", "createdAt"],
+    )
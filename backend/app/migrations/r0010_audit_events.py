@@ -0,0 +1,53 @@
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, Text
+from sqlalchemy.engine import Connection
+
+from app.core.audit import DEFAULT_PARTITION, ensurePartitions
+
+revision = "0010"
+description = "Append-only audit events, partitioned by month on PostgreSQL"
+
+metadata = MetaData()
+
+auditEvents = Table(
+    "audit_events",
+    metadata,
+    Column("Id", Integer, primary_key=True, autoincrement=True),
+    Column("occurredAt", DateTime(timezone=True), nullable=False, index=True),
+    Column("eventType", String(50), nullable=False),
+    Column("outcome", String(20), nullable=False),
+    Column("userId", Integer, nullable=True),
+    Column("phoneNumber", String(20), nullable=True),
+    Column("details", Text, nullable=True),
+    Index("ix_audit_events_userId_occurredAt", "userId", "occurredAt"),
+    Index("ix_audit_events_eventType_occurredAt", "eventType", "occurredAt"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    if conn.dialect.name != "postgresql":
+        auditEvents.create(conn, checkfirst=True)
+        return
+
+    # The partition key must be part of the primary key
+    conn.exec_driver_sql(
+        'CREATE TABLE IF NOT EXISTS audit_events ('
+        '"Id" BIGSERIAL NOT NULL, '
+        '"occurredAt" TIMESTAMP WITH TIME ZONE NOT NULL, '
+        '"eventType" VARCHAR(50) NOT NULL, '
+        '"outcome" VARCHAR(20) NOT NULL, '
+        '"userId" INTEGER, '
+        '"phoneNumber" VARCHAR(20), '
+        '"details" TEXT, '
+        'PRIMARY KEY ("Id", "occurredAt")'
+        ') PARTITION BY RANGE ("occurredAt")'
+    )
+    for index in auditEvents.indexes:
+        columns = ", ".join(f'"{column.name}"' for column in index.columns)
+        conn.exec_driver_sql(
+            f'CREATE INDEX IF NOT EXISTS "{index.name}" ON audit_events ({columns})'
+        )
+    # Catches rows outside the pre-created months instead of failing the insert
+    conn.exec_driver_sql(
+        f'CREATE TABLE IF NOT EXISTS "{DEFAULT_PARTITION}" PARTITION OF audit_events DEFAULT'
+    )
+    ensurePartitions(conn)
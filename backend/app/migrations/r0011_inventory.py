@@ -0,0 +1,50 @@
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+)
+from sqlalchemy.engine import Connection
+
+revision = "0011"
+description = "Product stock and TTL stock reservations"
+
+metadata = MetaData()
+
+Table("users", metadata, Column("Id", Integer, primary_key=True))
+
+productStock = Table(
+    "product_stock",
+    metadata,
+    Column("sku", String(64), primary_key=True),
+    Column("productName", String, nullable=False),
+    Column("pricePerUnit", Float, nullable=False),
+    Column("available", Integer, nullable=False),
+    Column("updatedAt", DateTime(timezone=True), nullable=False),
+    CheckConstraint('"available" >= 0', name="ck_product_stock_available"),
+)
+
+stockReservations = Table(
+    "stock_reservations",
+    metadata,
+    Column("Id", Integer, primary_key=True, autoincrement=True),
+    Column("sku", String(64), ForeignKey("product_stock.sku"), nullable=False),
+    Column("userId", Integer, ForeignKey("users.Id"), nullable=False, index=True),
+    Column("quantity", Integer, nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("orderId", Integer, nullable=True),
+    Column("createdAt", DateTime(timezone=True), nullable=False),
+    Column("expiresAt", DateTime(timezone=True), nullable=False),
+    Index("ix_stock_reservations_status_expiresAt", "status", "expiresAt"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    productStock.create(conn, checkfirst=True)
+    stockReservations.create(conn, checkfirst=True)
@@ -0,0 +1,123 @@
+from datetime import timezone
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+from app.core import partitions
+from app.core.migrations import reflectTable
+
+revision = "0012"
+description = "Partition orders by month on PostgreSQL and track order archives"
+
+COLUMNS = ["Id", "userId", "productName", "quantity", "pricePerUnit", "totalPrice", "orderedAt"]
+
+metadata = MetaData()
+
+orderArchives = Table(
+    "order_archives",
+    metadata,
+    Column("Id", Integer, primary_key=True, autoincrement=True),
+    Column("periodStart", DateTime(timezone=True), nullable=False),
+    Column("periodEnd", DateTime(timezone=True), nullable=False),
+    Column("path", String, nullable=False),
+    Column("format", String(20), nullable=False),
+    Column("rowCount", Integer, nullable=False),
+    Column("sizeBytes", BigInteger, nullable=False),
+    Column("createdAt", DateTime(timezone=True), nullable=False),
+    Index("ix_order_archives_periodStart", "periodStart"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    orderArchives.create(conn, checkfirst=True)
+    if conn.dialect.name != "postgresql":
+        Index("ix_orders_orderedAt", reflectTable(conn, "orders").c.orderedAt).create(
+            conn, checkfirst=True
+        )
+        return
+
+    relkind = conn.exec_driver_sql(
+        "SELECT relkind::text FROM pg_class WHERE oid = 'orders'::regclass"
+    ).scalar()
+    if relkind != "p":
+        _partitionOrders(conn)
+
+
+def _partitionOrders(conn: Connection) -> None:
+    """Rebuild orders as a partitioned table and copy the rows across
+
+    The existing Id sequence is handed to the new table so order Ids keep
+    counting from where they were. The copy holds an exclusive lock on
+    orders for its duration.
+    """
+    sequence = conn.exec_driver_sql(
+        "SELECT pg_get_serial_sequence('orders', 'Id')"
+    ).scalar()
+    conn.exec_driver_sql("ALTER TABLE orders RENAME TO orders_unpartitioned")
+    primaryKey = conn.exec_driver_sql(
+        "SELECT conname FROM pg_constraint "
+        "WHERE conrelid = 'orders_unpartitioned'::regclass AND contype = 'p'"
+    ).scalar()
+    if primaryKey:
+        conn.exec_driver_sql(
+            f'ALTER TABLE orders_unpartitioned RENAME CONSTRAINT "{primaryKey}" '
+            "TO orders_unpartitioned_pkey"
+        )
+    indexNames = conn.exec_driver_sql(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE i.indrelid = 'orders_unpartitioned'::regclass AND NOT i.indisprimary"
+    ).scalars().all()
+    for name in indexNames:
+        conn.exec_driver_sql(f'DROP INDEX "{name}"')
+
+    # The partition key must be part of the primary key
+    conn.exec_driver_sql(
+        "CREATE TABLE orders ("
+        f"\"Id\" INTEGER NOT NULL DEFAULT nextval('{sequence}'::regclass), "
+        '"userId" INTEGER NOT NULL REFERENCES users ("Id"), '
+        '"productName" VARCHAR NOT NULL, '
+        '"quantity" INTEGER NOT NULL, '
+        '"pricePerUnit" FLOAT NOT NULL, '
+        '"totalPrice" FLOAT NOT NULL, '
+        '"orderedAt" TIMESTAMP WITH TIME ZONE NOT NULL, '
+        'CONSTRAINT orders_pkey PRIMARY KEY ("Id", "orderedAt")'
+        ') PARTITION BY RANGE ("orderedAt")'
+    )
+    conn.exec_driver_sql(f'ALTER SEQUENCE {sequence} OWNED BY orders."Id"')
+    conn.exec_driver_sql(
+        f'CREATE TABLE IF NOT EXISTS "{partitions.defaultPartitionName("orders")}" '
+        "PARTITION OF orders DEFAULT"
+    )
+
+    # One partition per month that already has orders, plus the months ahead
+    months = conn.execute(
+        text(
+            "SELECT DISTINCT date_trunc('month', \"orderedAt\" AT TIME ZONE 'UTC') "
+            "FROM orders_unpartitioned"
+        )
+    ).scalars().all()
+    for month in months:
+        partitions.createMonthlyPartition(
+            conn, "orders", month.replace(tzinfo=timezone.utc)
+        )
+    partitions.ensureMonthlyPartitions(conn, "orders")
+
+    columnList = ", ".join(f'"{column}"' for column in COLUMNS)
+    conn.exec_driver_sql(
+        f"INSERT INTO orders ({columnList}) SELECT {columnList} FROM orders_unpartitioned"
+    )
+    conn.exec_driver_sql("DROP TABLE orders_unpartitioned")
+    conn.exec_driver_sql(
+        'CREATE INDEX "ix_orders_userId_orderedAt" ON orders ("userId", "orderedAt")'
+    )
+    conn.exec_driver_sql('CREATE INDEX "ix_orders_orderedAt" ON orders ("orderedAt")')
@@ -1,7 +1,27 @@
 """Models package - Import all models here to ensure they are registered with SQLAlchemy"""
 
+from app.models.auditEventModel import AuditEvent
 from app.models.base import ServiceBase
-from app.models.orderModel import Order
+from app.models.inventoryModel import ProductStock, StockReservation
+from app.models.orderModel import Order, OrderArchive
+from app.models.otpModel import OTP
+from app.models.schemaVersionModel import SchemaVersion
+from app.models.sessionModel import UserSession
+from app.models.sharedStateModel import SharedStateEntry
+from app.models.smsCampaignModel import SmsCampaign
 from app.models.userModel import User
 
-__all__ = ["ServiceBase", "User", "Order"]
+__all__ = [
+    "ServiceBase",
+    "User",
+    "Order",
+    "OrderArchive",
+    "OTP",
+    "SchemaVersion",
+    "SharedStateEntry",
+    "SmsCampaign",
+    "AuditEvent",
+    "ProductStock",
+    "StockReservation",
+    "UserSession",
+]
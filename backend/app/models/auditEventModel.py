@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import ServiceBase
+
+
+class AuditEvent(ServiceBase):
+    """Append-only record of a security-relevant user action
+
+    On PostgreSQL the table is range-partitioned by month on occurredAt
+    (see migration 0010), so the primary key there is (Id, occurredAt).
+    """
+
+    __tablename__ = "audit_events"
+    __table_args__ = (
+        Index("ix_audit_events_userId_occurredAt", "userId", "occurredAt"),
+        Index("ix_audit_events_eventType_occurredAt", "eventType", "occurredAt"),
+    )
+
+    Id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    occurredAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True,
+    )
+    eventType: Mapped[str] = mapped_column(String(50), nullable=False)
+    outcome: Mapped[str] = mapped_column(String(20), nullable=False)
+    userId: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    phoneNumber: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    details: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<AuditEvent Id={self.Id} eventType={self.eventType} outcome={self.outcome} userId={self.userId} occurredAt={self.occurredAt}>"
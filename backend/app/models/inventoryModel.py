@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import CheckConstraint, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import ServiceBase
+
+# Reservation lifecycle
+RESERVATION_HELD = "held"
+RESERVATION_COMMITTED = "committed"
+RESERVATION_RELEASED = "released"
+RESERVATION_EXPIRED = "expired"
+
+
+class ProductStock(ServiceBase):
+    """Sellable stock of one product; available never goes below zero"""
+
+    __tablename__ = "product_stock"
+    __table_args__ = (
+        CheckConstraint('"available" >= 0', name="ck_product_stock_available"),
+    )
+
+    sku: Mapped[str] = mapped_column(String(64), primary_key=True)
+    productName: Mapped[str] = mapped_column(String, nullable=False)
+    pricePerUnit: Mapped[float] = mapped_column(Float, nullable=False)
+    available: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    updatedAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<ProductStock sku={self.sku} productName={self.productName} available={self.available}>"
+
+
+class StockReservation(ServiceBase):
+    """Units taken out of available stock for a user until checkout or expiry"""
+
+    __tablename__ = "stock_reservations"
+    __table_args__ = (
+        Index("ix_stock_reservations_status_expiresAt", "status", "expiresAt"),
+    )
+
+    Id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    sku: Mapped[str] = mapped_column(
+        String(64), ForeignKey("product_stock.sku"), nullable=False
+    )
+    userId: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.Id"), nullable=False, index=True
+    )
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(20), default=RESERVATION_HELD, nullable=False
+    )
+    # Set at checkout; no foreign key so orders can be partitioned and archived
+    orderId: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    # Timestamps
+    createdAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    expiresAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<StockReservation Id={self.Id} sku={self.sku} userId={self.userId} quantity={self.quantity} status={self.status} expiresAt={self.expiresAt}>"
@@ -1,16 +1,30 @@
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import ServiceBase
 
 
 class Order(ServiceBase):
+    """A purchased product line
+
+    On PostgreSQL the table is range-partitioned by month on orderedAt
+    (see migration 0012), so the primary key there is (Id, orderedAt).
+    Months older than ORDER_ARCHIVE_AFTER_MONTHS are moved to archive files
+    and listed in order_archives.
+    """
+
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_userId_orderedAt", "userId", "orderedAt"),
+        Index("ix_orders_orderedAt", "orderedAt"),
+    )
 
     # Order fields
     Id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     userId: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.Id"), unique=True, nullable=False
+        Integer, ForeignKey("users.Id"), nullable=False
     )
     productName: Mapped[str] = mapped_column(String, nullable=False)
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -18,7 +32,9 @@ class Order(ServiceBase):
     totalPrice: Mapped[float] = mapped_column(Float, nullable=False)
 
     # Timestamps
-    orderedAt: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+    orderedAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
 
     # Relationships
     users = relationship("User", back_populates="orders")
@@ -26,3 +42,28 @@ class Order(ServiceBase):
     # Representation
     def __repr__(self) -> str:
         return f"<Order Id={self.Id} userId={self.userId} productName={self.productName} quantity={self.quantity} totalPrice={self.totalPrice} orderedAt={self.orderedAt}>"
+
+
+class OrderArchive(ServiceBase):
+    """One archive file holding the orders of a month removed from the database"""
+
+    __tablename__ = "order_archives"
+    __table_args__ = (Index("ix_order_archives_periodStart", "periodStart"),)
+
+    Id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    periodStart: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    periodEnd: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    path: Mapped[str] = mapped_column(String, nullable=False)
+    format: Mapped[str] = mapped_column(String(20), nullable=False)
+    rowCount: Mapped[int] = mapped_column(Integer, nullable=False)
+    sizeBytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    createdAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<OrderArchive Id={self.Id} periodStart={self.periodStart} rowCount={self.rowCount} path={self.path}>"
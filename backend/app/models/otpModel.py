@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import String
+from sqlalchemy import DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import ServiceBase
@@ -10,15 +10,23 @@ class OTP(ServiceBase):
     """Simple OTP model for phone verification"""
 
     __tablename__ = "otps"
+    __table_args__ = (
+        # Latest OTP for a phone number is an exact-match range scan
+        Index("ix_otps_phoneNumber_createdAt", "phoneNumber", "createdAt"),
+    )
 
     Id: Mapped[int] = mapped_column(primary_key=True, index=True)
     phoneNumber: Mapped[str] = mapped_column(String, nullable=False, index=True)
     otpCode: Mapped[str] = mapped_column(String(6), nullable=False)
     createdAt: Mapped[datetime] = mapped_column(
-        nullable=False, default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
     )
     expiresAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
         nullable=False,
         default=lambda: datetime.now(timezone.utc) + timedelta(minutes=5),
     )
     isUsed: Mapped[bool] = mapped_column(nullable=False, default=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
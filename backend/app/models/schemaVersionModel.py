@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import ServiceBase
+
+
+class SchemaVersion(ServiceBase):
+    """Version stamp of the schema applied to the database"""
+
+    __tablename__ = "schema_version"
+
+    Id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    version: Mapped[str] = mapped_column(String(64), nullable=False)
+    appliedAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+    )
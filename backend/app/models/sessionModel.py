@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import ServiceBase
+
+
+class UserSession(ServiceBase):
+    """Login session backing a rotating refresh token"""
+
+    __tablename__ = "sessions"
+
+    Id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    userId: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.Id"), nullable=False, index=True
+    )
+    refreshTokenHash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    # Timestamps
+    createdAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    lastUsedAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    expiresAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+    revokedAt: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<UserSession Id={self.Id} userId={self.userId} expiresAt={self.expiresAt} revokedAt={self.revokedAt}>"
@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import Boolean, DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import ServiceBase
+
+
+class SmsCampaign(ServiceBase):
+    """Bulk SMS send with a checkpoint so an interrupted run can resume"""
+
+    __tablename__ = "sms_campaigns"
+
+    Id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    verifiedOnly: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+
+    # Progress; recipients are walked in users.Id order
+    lastUserId: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    sentCount: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    failedCount: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Timestamps
+    createdAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    updatedAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    completedAt: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<SmsCampaign Id={self.Id} name={self.name} lastUserId={self.lastUserId} sent={self.sentCount} failed={self.failedCount}>"
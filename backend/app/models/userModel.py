@@ -24,10 +24,14 @@ class User(ServiceBase):
 
     # Timestamps
     createdAt: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.now(timezone.utc), nullable=False
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
     )
     lastLoginAt: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.now(timezone.utc), nullable=True
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=True,
     )
 
     # Relationships
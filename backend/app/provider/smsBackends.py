@@ -0,0 +1,143 @@
+import asyncio
+import base64
+import logging
+import random
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class SmsProviderError(Exception):
+    """The provider could not take the message (transport error, 5xx, throttling)
+
+    Raised errors count against the provider's circuit breaker and move the
+    send on to the next provider. A provider that answers but refuses the
+    message (for example an invalid number) returns False instead.
+    """
+
+
+class SmsBackend(ABC):
+    """One SMS provider that messages can be delivered through"""
+
+    name: str = "backend"
+
+    @abstractmethod
+    async def deliver(self, phone: str, message: str) -> bool:
+        """Send one E.164 formatted message; False if the provider refused it"""
+
+    async def close(self) -> None:
+        """Release provider resources"""
+
+
+class _HttpBackend(SmsBackend):
+    """Backend that talks to its provider through a pooled httpx client"""
+
+    def __init__(self, maxConnections: int = 8, timeoutSeconds: float = 10.0) -> None:
+        self.maxConnections = maxConnections
+        self.timeoutSeconds = timeoutSeconds
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    def _httpClient(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeoutSeconds, connect=min(5.0, self.timeoutSeconds)),
+                limits=httpx.Limits(max_connections=self.maxConnections),
+            )
+        return self._client
+
+    async def _post(self, url: str, **kwargs) -> "httpx.Response":
+        import httpx
+
+        try:
+            response = await self._httpClient().post(url, **kwargs)
+        except httpx.HTTPError as e:
+            raise SmsProviderError(f"{self.name}: {type(e).__name__}: {e}") from e
+        if response.status_code >= 500 or response.status_code == 429:
+            raise SmsProviderError(f"{self.name}: HTTP {response.status_code}")
+        return response
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class TwilioBackend(_HttpBackend):
+    """Twilio Messages API; without credentials sends are skipped (development)"""
+
+    name = "twilio"
+
+    def __init__(
+        self, accountSid: str, authToken: str, fromNumber: str, **kwargs
+    ) -> None:
+        super().__init__(**kwargs)
+        self.accountSid = accountSid
+        self.authToken = authToken
+        self.fromNumber = fromNumber
+
+    async def deliver(self, phone: str, message: str) -> bool:
+        if not self.accountSid:
+            return True
+
+        auth = base64.b64encode(f"{self.accountSid}:{self.authToken}".encode()).decode()
+        response = await self._post(
+            f"https://api.twilio.com/2010-04-01/Accounts/{self.accountSid}/Messages.json",
+            data={"To": phone, "From": self.fromNumber, "Body": message},
+            headers={"Authorization": f"Basic {auth}"},
+        )
+        return response.status_code == 201
+
+
+class HttpGatewayBackend(_HttpBackend):
+    """Generic JSON SMS gateway, used as the secondary provider"""
+
+    name = "gateway"
+
+    def __init__(self, url: str, token: str, senderId: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.url = url
+        self.token = token
+        self.senderId = senderId
+
+    async def deliver(self, phone: str, message: str) -> bool:
+        response = await self._post(
+            self.url,
+            json={"to": phone, "from": self.senderId, "text": message},
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+        return 200 <= response.status_code < 300
+
+
+class FakeSmsBackend(SmsBackend):
+    """Local provider with injectable latency and errors, for testing failover
+
+    latencySeconds and errorRate can be changed while running to simulate a
+    provider that degrades and recovers.
+    """
+
+    def __init__(
+        self,
+        name: str = "fake",
+        latencySeconds: float = 0.0,
+        errorRate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self.latencySeconds = latencySeconds
+        self.errorRate = errorRate
+        self.sent: List[Tuple[str, str]] = []
+        self._random = random.Random(seed)
+
+    async def deliver(self, phone: str, message: str) -> bool:
+        if self.latencySeconds:
+            await asyncio.sleep(self.latencySeconds)
+        if self.errorRate and self._random.random() < self.errorRate:
+            raise SmsProviderError(f"{self.name}: injected failure")
+        self.sent.append((phone, message))
+        return True
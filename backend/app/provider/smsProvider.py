@@ -1,22 +1,79 @@
-import base64
+import asyncio
 import logging
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
-import requests
+from app.core.circuitBreaker import STATE_VALUES, CircuitBreaker
+from app.core.deadline import DeadlineExceeded, boundedTimeout
+from app.core.lazy import LazySingleton
+from app.core.metrics import getMetricsRegistry
 from app.core.security import SecurityManager
 from app.core.settings import getSettings
+from app.provider.smsBackends import (
+    FakeSmsBackend,
+    HttpGatewayBackend,
+    SmsBackend,
+    TwilioBackend,
+)
+from app.utils.phoneNumber import normalizePhoneNumbers
+
+if TYPE_CHECKING:
+    from app.core.sharedState import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Key of the provider-wide send rate limit in shared state
+PROVIDER_RATE_LIMIT_KEY = "sms:provider"
+
+
+def createBackends(
+    accountSid: str, authToken: str, senderId: str
+) -> List[SmsBackend]:
+    """Build the providers named in SMS_PROVIDERS, in failover order"""
+    httpOptions = {
+        "maxConnections": getSettings.SMS_BULK_CONCURRENCY,
+        "timeoutSeconds": getSettings.SMS_PROVIDER_TIMEOUT_SECONDS,
+    }
+    backends: List[SmsBackend] = []
+    for name in getSettings.SMS_PROVIDERS:
+        if name == "twilio":
+            backends.append(TwilioBackend(accountSid, authToken, senderId, **httpOptions))
+        elif name == "gateway":
+            backends.append(
+                HttpGatewayBackend(
+                    getSettings.SMS_GATEWAY_URL,
+                    getSettings.SMS_GATEWAY_TOKEN,
+                    getSettings.SMS_SENDER_ID,
+                    **httpOptions,
+                )
+            )
+        elif name == "fake":
+            backends.append(
+                FakeSmsBackend(
+                    latencySeconds=getSettings.SMS_FAKE_LATENCY_SECONDS,
+                    errorRate=getSettings.SMS_FAKE_ERROR_RATE,
+                )
+            )
+        else:
+            raise ValueError(f"Unsupported SMS provider: {name}")
+    return backends
+
 
 class SMSService:
-    """Simple SMS service for sending SMS to users."""
+    """Simple SMS service for sending SMS to users.
+
+    Messages go to the first provider whose circuit breaker allows it. An
+    attempt that errors or exceeds SMS_PROVIDER_TIMEOUT_SECONDS moves on to
+    the next provider; slow and failed attempts trip that provider's breaker
+    so later sends skip it until it recovers.
+    """
 
     def __init__(
         self,
         apiKey: Optional[str] = None,
         apiSecret: Optional[str] = None,
         senderId: str = "Vireakbo RC Store",
+        backends: Optional[List[SmsBackend]] = None,
     ):
         """Initialize SMS service."""
         self.apiKey = apiKey or getSettings.TWILIO_ACCOUNT_SID
@@ -26,39 +83,176 @@ class SMSService:
             if senderId != "Vireakbo RC Store"
             else getSettings.TWILIO_PHONE_NUMBER
         )
+        self.backends = (
+            backends
+            if backends is not None
+            else createBackends(self.apiKey, self.apiSecret, self.senderId)
+        )
+        self.timeoutSeconds = getSettings.SMS_PROVIDER_TIMEOUT_SECONDS
+        self.breakers: Dict[str, CircuitBreaker] = {
+            backend.name: CircuitBreaker(
+                f"sms:{backend.name}",
+                failureThreshold=getSettings.SMS_BREAKER_FAILURE_THRESHOLD,
+                resetTimeoutSeconds=getSettings.SMS_BREAKER_RESET_SECONDS,
+                slowCallSeconds=getSettings.SMS_SLOW_CALL_SECONDS,
+            )
+            for backend in self.backends
+        }
+        self._registerMetrics()
+
+    def _registerMetrics(self) -> None:
+        registry = getMetricsRegistry()
+        self._attempts = registry.counter(
+            "sms_provider_attempts_total",
+            "SMS delivery attempts by provider and outcome",
+            ("provider", "outcome"),
+        )
+        self._latency = registry.histogram(
+            "sms_provider_latency_seconds",
+            "Latency of SMS delivery attempts that got an answer",
+            ("provider",),
+        )
+        self._undeliverable = registry.counter(
+            "sms_undeliverable_total",
+            "Messages no provider could take",
+        )
+        registry.gauge(
+            "sms_circuit_breaker_state",
+            "SMS provider breaker state (0 closed, 1 half open, 2 open)",
+            ("provider",),
+        ).setCallback(
+            lambda: {
+                (name,): STATE_VALUES[breaker.state]
+                for name, breaker in self.breakers.items()
+            }
+        )
 
     async def sendSms(self, phoneNumber: str, message: str) -> bool:
         """Send SMS to phone number using Twilio API."""
 
         phone = self._formatPhoneNumber(phoneNumber)
-        if not self.apiKey:
-            return True
-        auth = base64.b64encode(f"{self.apiKey}:{self.apiSecret}".encode()).decode()
-        response = requests.post(
-            f"https://api.twilio.com/2010-04-01/Accounts/{self.apiKey}/Messages.json",
-            data={"To": phone, "From": self.senderId, "Body": message},
-            headers={"Authorization": f"Basic {auth}"},
-        )
-        return response.status_code == 201
+        return await self._deliver(phone, message)
 
-    async def sendOtpSms(self, phoneNumber: str) -> str:
-        """Generate and send OTP SMS to phone number."""
-        otp = SecurityManager.generateOTP()
-        message = f"Your Vireakbo RC Store verification code is: {otp}."
+    async def sendOtpSms(self, phoneNumber: str, otpCode: Optional[str] = None) -> str:
+        """Send an OTP SMS, generating the code unless the caller already stored one."""
+        otp = otpCode or SecurityManager.generateOTP()
+        message = (
+            f"Your Vireakbo RC Store verification code is: {otp}. Valid for 5 minutes."
+        )
 
         smsSent = await self.sendSms(phoneNumber, message)
         return otp if smsSent else ""
 
+    async def sendBulk(
+        self,
+        messages: Iterable[Tuple[str, str]],
+        rateLimiter: Optional["RateLimiter"] = None,
+        concurrency: Optional[int] = None,
+    ) -> List[bool]:
+        """Send (phoneNumber, message) pairs concurrently under the provider rate limit.
+
+        Numbers are formatted as one batch up front. Returns one delivery
+        flag per message, in input order; failures are logged, not raised.
+        """
+        pairs = list(messages)
+        phones = self._formatPhoneNumbers([phoneNumber for phoneNumber, _ in pairs])
+        semaphore = asyncio.Semaphore(concurrency or getSettings.SMS_BULK_CONCURRENCY)
+
+        async def sendOne(phone: str, message: str) -> bool:
+            async with semaphore:
+                if rateLimiter is not None:
+                    await rateLimiter.acquire(
+                        PROVIDER_RATE_LIMIT_KEY, getSettings.SMS_RATE_LIMIT_PER_SECOND, 1.0
+                    )
+                try:
+                    return await self._deliver(phone, message)
+                except Exception as e:
+                    logger.warning(
+                        f"Bulk SMS delivery failed: {e}",
+                        extra={"phone_number": phone},
+                    )
+                    return False
+
+        return list(
+            await asyncio.gather(
+                *(sendOne(phone, message) for phone, (_, message) in zip(phones, pairs))
+            )
+        )
+
+    async def close(self) -> None:
+        """Close the providers' pooled HTTP clients."""
+        for backend in self.backends:
+            await backend.close()
+
+    async def _deliver(self, phone: str, message: str) -> bool:
+        """Deliver one already formatted message, failing over between providers."""
+        for backend in self.backends:
+            breaker = self.breakers[backend.name]
+            if not breaker.allow():
+                self._attempts.inc(provider=backend.name, outcome="skipped")
+                continue
+
+            # A request deadline shorter than the provider timeout caps the attempt
+            timeoutSeconds = boundedTimeout(self.timeoutSeconds)
+            startTime = time.monotonic()
+            try:
+                delivered = await asyncio.wait_for(
+                    backend.deliver(phone, message), timeoutSeconds
+                )
+            except asyncio.CancelledError:
+                breaker.abandon()
+                raise
+            except asyncio.TimeoutError:
+                if timeoutSeconds < self.timeoutSeconds:
+                    # The request ran out of time, not the provider
+                    breaker.abandon()
+                    raise DeadlineExceeded("Request deadline exceeded while sending SMS")
+                breaker.record(False)
+                self._attempts.inc(provider=backend.name, outcome="timeout")
+                logger.warning(
+                    f"SMS provider {backend.name} timed out, trying next provider",
+                    extra={"provider": backend.name, "outcome": "timeout"},
+                )
+                continue
+            except Exception as e:
+                breaker.record(False)
+                self._attempts.inc(provider=backend.name, outcome="error")
+                logger.warning(
+                    f"SMS provider {backend.name} failed, trying next provider: {e!r}",
+                    extra={"provider": backend.name, "outcome": "error"},
+                )
+                continue
+
+            duration = time.monotonic() - startTime
+            breaker.record(True, duration)
+            self._latency.observe(duration, provider=backend.name)
+            self._attempts.inc(
+                provider=backend.name, outcome="delivered" if delivered else "rejected"
+            )
+            return delivered
+
+        self._undeliverable.inc()
+        logger.error(
+            "No SMS provider available to deliver message",
+            extra={"phone_number": phone},
+        )
+        return False
+
     def _formatPhoneNumber(self, phoneNumber: str) -> str:
         """Format phone number for Cambodia (+855)."""
-        cleanPhone = "".join(c for c in phoneNumber if c.isdigit() or c == "+")
+        return self._formatPhoneNumbers([phoneNumber])[0]
 
-        if cleanPhone.startswith("0"):
-            return "+855" + cleanPhone[1:]
-        elif not cleanPhone.startswith("+"):
-            return "+855" + cleanPhone
-        return cleanPhone
+    @staticmethod
+    def _formatPhoneNumbers(phoneNumbers: List[str]) -> List[str]:
+        """Format a batch of phone numbers for Cambodia (+855)."""
+        # Invalid legacy values are passed through and rejected by the provider
+        return [
+            formatted or phoneNumber
+            for phoneNumber, formatted in zip(
+                phoneNumbers, normalizePhoneNumbers(phoneNumbers)
+            )
+        ]
 
 
-# Global SMS service instance
-smsService = SMSService()
+# Global SMS service instance, created on first use
+getSmsService = LazySingleton(SMSService)
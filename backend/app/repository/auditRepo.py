@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.auditEventModel import AuditEvent
+
+
+class AuditRepository:
+    """Read side of the audit log; writes go through AuditLog"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def query(
+        self,
+        userId: Optional[int] = None,
+        eventType: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[AuditEvent]:
+        """Newest events first; a time range lets PostgreSQL prune partitions"""
+        stmt = select(AuditEvent)
+        if userId is not None:
+            stmt = stmt.where(AuditEvent.userId == userId)
+        if eventType is not None:
+            stmt = stmt.where(AuditEvent.eventType == eventType)
+        if since is not None:
+            stmt = stmt.where(AuditEvent.occurredAt >= since)
+        if until is not None:
+            stmt = stmt.where(AuditEvent.occurredAt < until)
+        result = await self.session.execute(
+            stmt.order_by(AuditEvent.occurredAt.desc(), AuditEvent.Id.desc()).limit(limit)
+        )
+        return list(result.scalars().all())
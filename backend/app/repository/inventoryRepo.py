@@ -0,0 +1,194 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.inventoryModel import (
+    RESERVATION_COMMITTED,
+    RESERVATION_EXPIRED,
+    RESERVATION_HELD,
+    RESERVATION_RELEASED,
+    ProductStock,
+    StockReservation,
+)
+from app.models.orderModel import Order
+
+
+class InventoryRepository:
+    """Repository for product stock and reservations
+
+    Stock is only ever changed by conditional UPDATE statements, so
+    concurrent checkouts serialize on the product row inside the database
+    instead of racing on a value read into Python.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def queryStock(self, sku: str) -> Optional[ProductStock]:
+        result = await self.session.execute(
+            select(ProductStock).where(ProductStock.sku == sku)
+        )
+        return result.scalar_one_or_none()
+
+    async def setStock(
+        self, sku: str, productName: str, pricePerUnit: float, available: int
+    ) -> ProductStock:
+        """Create the product or overwrite its name, price and available count"""
+        stock = await self.queryStock(sku)
+        if stock is None:
+            stock = ProductStock(sku=sku)
+            self.session.add(stock)
+        stock.productName = productName
+        stock.pricePerUnit = pricePerUnit
+        stock.available = available
+        stock.updatedAt = datetime.now(timezone.utc)
+        await self.session.commit()
+        return stock
+
+    async def reserve(
+        self, sku: str, userId: int, quantity: int, ttlSeconds: float
+    ) -> Optional[StockReservation]:
+        """Take quantity out of available stock and hold it for the user
+
+        Returns None when the product is unknown or has too little stock.
+        The decrement and the hold commit together.
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.session.execute(
+            update(ProductStock)
+            .where(ProductStock.sku == sku, ProductStock.available >= quantity)
+            .values(available=ProductStock.available - quantity, updatedAt=now)
+            .returning(ProductStock.available)
+        )
+        if result.scalar_one_or_none() is None:
+            await self.session.rollback()
+            return None
+
+        reservation = StockReservation(
+            sku=sku,
+            userId=userId,
+            quantity=quantity,
+            status=RESERVATION_HELD,
+            createdAt=now,
+            expiresAt=now + timedelta(seconds=ttlSeconds),
+        )
+        self.session.add(reservation)
+        await self.session.commit()
+        return reservation
+
+    async def checkout(
+        self, reservationId: int, userId: int
+    ) -> Optional[Order]:
+        """Turn a live hold into an order
+
+        Returns None when the reservation is not the user's, was already
+        checked out or released, or has expired.
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.session.execute(
+            update(StockReservation)
+            .where(
+                StockReservation.Id == reservationId,
+                StockReservation.userId == userId,
+                StockReservation.status == RESERVATION_HELD,
+                StockReservation.expiresAt > now,
+            )
+            .values(status=RESERVATION_COMMITTED)
+            .returning(StockReservation.sku, StockReservation.quantity)
+        )
+        row = result.one_or_none()
+        if row is None:
+            await self.session.rollback()
+            return None
+
+        stock = await self.queryStock(row.sku)
+        order = Order(
+            userId=userId,
+            productName=stock.productName,
+            quantity=row.quantity,
+            pricePerUnit=stock.pricePerUnit,
+            totalPrice=stock.pricePerUnit * row.quantity,
+            orderedAt=now,
+        )
+        self.session.add(order)
+        await self.session.flush()
+        await self.session.execute(
+            update(StockReservation)
+            .where(StockReservation.Id == reservationId)
+            .values(orderId=order.Id)
+        )
+        await self.session.commit()
+        return order
+
+    async def release(self, reservationId: int, userId: int) -> bool:
+        """Give a live hold back to available stock; False if it was not held"""
+        result = await self.session.execute(
+            update(StockReservation)
+            .where(
+                StockReservation.Id == reservationId,
+                StockReservation.userId == userId,
+                StockReservation.status == RESERVATION_HELD,
+            )
+            .values(status=RESERVATION_RELEASED)
+            .returning(StockReservation.sku, StockReservation.quantity)
+        )
+        row = result.one_or_none()
+        if row is None:
+            await self.session.rollback()
+            return False
+        await self._restock({row.sku: row.quantity})
+        await self.session.commit()
+        return True
+
+    async def expireHeld(self, batchSize: int = 500) -> Tuple[int, Dict[str, int]]:
+        """Expire up to batchSize overdue holds and restock them
+
+        The status condition is repeated in the UPDATE so a hold checked out
+        between the SELECT and the UPDATE is left alone. Returns the number
+        of holds expired and the units returned per SKU.
+        """
+        now = datetime.now(timezone.utc)
+        overdue = (
+            select(StockReservation.Id)
+            .where(
+                StockReservation.status == RESERVATION_HELD,
+                StockReservation.expiresAt <= now,
+            )
+            .order_by(StockReservation.expiresAt)
+            .limit(batchSize)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(StockReservation)
+            .where(
+                StockReservation.Id.in_(overdue),
+                StockReservation.status == RESERVATION_HELD,
+            )
+            .values(status=RESERVATION_EXPIRED)
+            .returning(StockReservation.sku, StockReservation.quantity)
+            .execution_options(synchronize_session=False)
+        )
+        expired = 0
+        restocked: Counter = Counter()
+        for sku, quantity in result:
+            expired += 1
+            restocked[sku] += quantity
+        if restocked:
+            await self._restock(restocked)
+        await self.session.commit()
+        return expired, dict(restocked)
+
+    async def _restock(self, quantities: Dict[str, int]) -> None:
+        now = datetime.now(timezone.utc)
+        # Sorted so concurrent restocks lock product rows in the same order
+        for sku in sorted(quantities):
+            await self.session.execute(
+                update(ProductStock)
+                .where(ProductStock.sku == sku)
+                .values(
+                    available=ProductStock.available + quantities[sku], updatedAt=now
+                )
+            )
@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.orderModel import Order, OrderArchive
+
+
+class OrderRepository:
+    """Repository for orders still held in the database and their archives"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def queryHistory(
+        self,
+        userId: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Order], int]:
+        """Newest orders of a user in [since, until) and how many there are in total"""
+        conditions = [Order.userId == userId]
+        if since is not None:
+            conditions.append(Order.orderedAt >= since)
+        if until is not None:
+            conditions.append(Order.orderedAt < until)
+        result = await self.session.execute(
+            select(Order)
+            .where(*conditions)
+            .order_by(Order.orderedAt.desc(), Order.Id.desc())
+            .limit(limit)
+        )
+        total = await self.session.scalar(
+            select(func.count()).select_from(Order).where(*conditions)
+        )
+        return list(result.scalars()), total or 0
+
+    async def listArchives(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[OrderArchive]:
+        """Archive files whose month overlaps [since, until), oldest first"""
+        stmt = select(OrderArchive).order_by(OrderArchive.periodStart, OrderArchive.Id)
+        if since is not None:
+            stmt = stmt.where(OrderArchive.periodEnd > since)
+        if until is not None:
+            stmt = stmt.where(OrderArchive.periodStart < until)
+        result = await self.session.execute(stmt)
+        return list(result.scalars())
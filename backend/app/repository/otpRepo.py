@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
-from sqlalchemy import and_, delete, select
+from sqlalchemy import and_, case, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.otpModel import OTP
@@ -37,8 +37,78 @@ class OTPRepository:
         result = await self.session.execute(query)
         return result.scalars().first()
 
+    async def consumeValidOTP(
+        self, phoneNumber: str, otpCode: str, maxAttempts: int
+    ) -> Optional[int]:
+        """Delete the latest valid OTP in one statement if the code matches
+
+        Returns the consumed OTP Id, or None when there is no valid OTP or the
+        code is wrong. Concurrent callers cannot both consume the same OTP.
+        The caller commits.
+        """
+        query = (
+            delete(OTP)
+            .where(
+                OTP.Id == self._latestValidOtpId(phoneNumber),
+                OTP.otpCode == otpCode,
+                OTP.attempts < maxAttempts,
+            )
+            .returning(OTP.Id)
+        )
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def recordFailedAttempt(
+        self, phoneNumber: str, maxAttempts: int
+    ) -> Optional[Tuple[int, bool]]:
+        """Count a failed attempt against the latest valid OTP
+
+        The OTP is invalidated once it reaches maxAttempts. Returns
+        (attempts, invalidated), or None when there is no valid OTP.
+        The caller commits.
+        """
+        query = (
+            update(OTP)
+            .where(OTP.Id == self._latestValidOtpId(phoneNumber))
+            .values(
+                attempts=OTP.attempts + 1,
+                isUsed=case((OTP.attempts + 1 >= maxAttempts, True), else_=OTP.isUsed),
+            )
+            .returning(OTP.attempts, OTP.isUsed)
+        )
+        result = await self.session.execute(query)
+        row = result.first()
+        return (row.attempts, row.isUsed) if row else None
+
     async def deleteOTP(self, otpId: int) -> None:
         """Delete OTP by ID"""
         query = delete(OTP).where(OTP.Id == otpId)
         await self.session.execute(query)
         await self.session.commit()
+
+    async def deleteExpired(self, before: datetime, batchSize: int = 5000) -> int:
+        """Delete OTPs that expired before the cutoff, one batch per transaction"""
+        deleted = 0
+        while True:
+            expiredIds = (
+                select(OTP.Id).where(OTP.expiresAt < before).limit(batchSize).scalar_subquery()
+            )
+            result = await self.session.execute(delete(OTP).where(OTP.Id.in_(expiredIds)))
+            await self.session.commit()
+            deleted += result.rowcount
+            if result.rowcount < batchSize:
+                return deleted
+
+    def _latestValidOtpId(self, phoneNumber: str):
+        """Scalar subquery selecting the most recent valid OTP for phone number"""
+        return (
+            select(OTP.Id)
+            .where(
+                OTP.phoneNumber == phoneNumber,
+                OTP.isUsed.is_(False),
+                OTP.expiresAt > datetime.now(timezone.utc),
+            )
+            .order_by(OTP.createdAt.desc(), OTP.Id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sessionModel import UserSession
+
+
+class SessionRepository:
+    """Repository for login session operations"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, userSession: UserSession) -> UserSession:
+        """Create a new session record"""
+        self.session.add(userSession)
+        await self.session.commit()
+        return userSession
+
+    async def queryId(self, sessionId: str) -> Optional[UserSession]:
+        result = await self.session.execute(
+            select(UserSession).where(UserSession.Id == sessionId)
+        )
+        return result.scalar_one_or_none()
+
+    async def rotate(
+        self, sessionId: str, currentHash: str, newHash: str
+    ) -> Optional[int]:
+        """Swap the refresh token hash if currentHash is still the live one
+
+        Returns the session's userId, or None when the session is unknown,
+        revoked, expired or the presented token was already rotated away.
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.session.execute(
+            update(UserSession)
+            .where(
+                UserSession.Id == sessionId,
+                UserSession.refreshTokenHash == currentHash,
+                UserSession.revokedAt.is_(None),
+                UserSession.expiresAt > now,
+            )
+            .values(refreshTokenHash=newHash, lastUsedAt=now)
+            .returning(UserSession.userId)
+        )
+        userId = result.scalar_one_or_none()
+        await self.session.commit()
+        return userId
+
+    async def revoke(self, sessionId: str) -> Optional[datetime]:
+        """Revoke a session and return its revocation time, if it was live"""
+        now = datetime.now(timezone.utc)
+        result = await self.session.execute(
+            update(UserSession)
+            .where(UserSession.Id == sessionId, UserSession.revokedAt.is_(None))
+            .values(revokedAt=now)
+            .returning(UserSession.Id)
+        )
+        revoked = result.scalar_one_or_none()
+        await self.session.commit()
+        return now if revoked else None
+
+    async def revokeAllForUser(
+        self, userId: int, exceptSessionId: Optional[str] = None
+    ) -> List[str]:
+        """Revoke every live session of a user, but exceptSessionId, and return their Ids"""
+        now = datetime.now(timezone.utc)
+        conditions = [UserSession.userId == userId, UserSession.revokedAt.is_(None)]
+        if exceptSessionId is not None:
+            conditions.append(UserSession.Id != exceptSessionId)
+        result = await self.session.execute(
+            update(UserSession)
+            .where(*conditions)
+            .values(revokedAt=now)
+            .returning(UserSession.Id)
+        )
+        sessionIds = list(result.scalars())
+        await self.session.commit()
+        return sessionIds
+
+    async def listRevokedSince(self, since: datetime) -> List[Tuple[str, datetime]]:
+        """Ids and revocation times of sessions revoked after since"""
+        result = await self.session.execute(
+            select(UserSession.Id, UserSession.revokedAt)
+            .where(UserSession.revokedAt > since)
+            .order_by(UserSession.revokedAt)
+        )
+        return [(row.Id, row.revokedAt) for row in result]
+
+    async def deleteFinished(
+        self, expiredBefore: datetime, revokedBefore: datetime, batchSize: int = 5000
+    ) -> int:
+        """Delete sessions that expired or were revoked before the cutoffs
+
+        One batch per transaction. Revoked sessions must outlive the access
+        tokens issued for them, since workers learn of revocations from
+        these rows (listRevokedSince).
+        """
+        deleted = 0
+        while True:
+            finishedIds = (
+                select(UserSession.Id)
+                .where(
+                    or_(
+                        UserSession.expiresAt < expiredBefore,
+                        UserSession.revokedAt < revokedBefore,
+                    )
+                )
+                .limit(batchSize)
+                .scalar_subquery()
+            )
+            result = await self.session.execute(
+                delete(UserSession).where(UserSession.Id.in_(finishedIds))
+            )
+            await self.session.commit()
+            deleted += result.rowcount
+            if result.rowcount < batchSize:
+                return deleted
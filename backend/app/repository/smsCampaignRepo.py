@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.smsCampaignModel import SmsCampaign
+
+
+class SmsCampaignRepository:
+    """Repository for bulk SMS campaign bookkeeping"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def queryName(self, name: str) -> Optional[SmsCampaign]:
+        result = await self.session.execute(
+            select(SmsCampaign).where(SmsCampaign.name == name)
+        )
+        return result.scalar_one_or_none()
+
+    async def create(self, campaign: SmsCampaign) -> SmsCampaign:
+        self.session.add(campaign)
+        await self.session.commit()
+        await self.session.refresh(campaign)
+        return campaign
+
+    async def saveProgress(
+        self, campaignId: int, lastUserId: int, sent: int, failed: int
+    ) -> None:
+        """Checkpoint one finished batch"""
+        await self.session.execute(
+            update(SmsCampaign)
+            .where(SmsCampaign.Id == campaignId)
+            .values(
+                lastUserId=lastUserId,
+                sentCount=SmsCampaign.sentCount + sent,
+                failedCount=SmsCampaign.failedCount + failed,
+                updatedAt=datetime.now(timezone.utc),
+            )
+        )
+        await self.session.commit()
+
+    async def markCompleted(self, campaignId: int) -> None:
+        now = datetime.now(timezone.utc)
+        await self.session.execute(
+            update(SmsCampaign)
+            .where(SmsCampaign.Id == campaignId)
+            .values(completedAt=now, updatedAt=now)
+        )
+        await self.session.commit()
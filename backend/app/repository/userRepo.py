@@ -1,10 +1,45 @@
+from dataclasses import dataclass
 from typing import Optional
 
+from sqlalchemy import bindparam, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.models.userModel import User
 
+_users = User.__table__
+
+
+@dataclass(frozen=True, slots=True)
+class UserAuthRow:
+    """Read-only columns needed to authenticate a user and issue tokens"""
+
+    Id: int
+    phoneNumber: str
+    fullName: str
+    hashedPassword: str
+    isVerified: bool
+
+
+# Core statements built once; the compiled form is reused from the engine's
+# statement cache and rows never enter the session's identity map
+_AUTH_COLUMNS = (
+    _users.c.Id,
+    _users.c.phoneNumber,
+    _users.c.fullName,
+    _users.c.hashedPassword,
+    _users.c.isVerified,
+)
+_AUTH_BY_PHONE_NUMBER = select(*_AUTH_COLUMNS).where(
+    _users.c.phoneNumber == bindparam("phoneNumber")
+)
+_AUTH_BY_ID = select(*_AUTH_COLUMNS).where(_users.c.Id == bindparam("userId"))
+_UPDATE_PASSWORD_HASH = (
+    update(_users)
+    .where(_users.c.Id == bindparam("userId"))
+    .values(hashedPassword=bindparam("hashedPassword"))
+)
+
 
 class UserRepository:
     """Repository for user-related database operations"""
@@ -22,6 +57,33 @@ class UserRepository:
         )
         return result.scalar_one_or_none()
 
+    async def queryAuthByPhoneNumber(self, phoneNumber: str) -> Optional[UserAuthRow]:
+        """ORM-free lookup for login checks"""
+        result = await self.session.execute(
+            _AUTH_BY_PHONE_NUMBER, {"phoneNumber": phoneNumber}
+        )
+        row = result.first()
+        return UserAuthRow(*row) if row else None
+
+    async def queryAuthById(self, userId: int) -> Optional[UserAuthRow]:
+        """ORM-free lookup for token issuance"""
+        result = await self.session.execute(_AUTH_BY_ID, {"userId": userId})
+        row = result.first()
+        return UserAuthRow(*row) if row else None
+
+    async def updatePasswordHash(self, userId: int, hashedPassword: str) -> None:
+        await self.session.execute(
+            _UPDATE_PASSWORD_HASH, {"userId": userId, "hashedPassword": hashedPassword}
+        )
+        await self.session.commit()
+
+    async def markVerified(self, phoneNumber: str) -> bool:
+        """Flag the user as verified without loading it; the caller commits"""
+        result = await self.session.execute(
+            update(User).where(User.phoneNumber == phoneNumber).values(isVerified=True)
+        )
+        return result.rowcount > 0
+
     async def create(self, userData: User) -> User:
         user = User(**userData)
         self.session.add(user)
@@ -30,8 +92,9 @@ class UserRepository:
         return user
 
     async def update(self, userData: User) -> User:
+        # Sessions do not expire on commit and users have no server-side
+        # defaults, so the loaded attributes are already current
         await self.session.commit()
-        await self.session.refresh(userData)
         return userData
 
     async def delete(self, userData: User) -> None:
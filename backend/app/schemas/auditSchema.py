@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class AuditEventResponseSchema(BaseModel):
+    Id: int
+    occurredAt: datetime
+    eventType: str
+    outcome: str
+    userId: Optional[int]
+    phoneNumber: Optional[str]
+    details: Optional[str]
+
+    class Config:
+        from_attributes = True
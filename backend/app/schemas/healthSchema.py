@@ -0,0 +1,22 @@
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+
+class LivenessResponseSchema(BaseModel):
+    status: str
+
+
+class ProbeResultSchema(BaseModel):
+    ok: bool
+    critical: bool
+    latencyMs: float
+    ageSeconds: float
+    detail: Dict[str, Any]
+    error: Optional[str]
+
+
+class ReadinessResponseSchema(BaseModel):
+    status: str
+    reason: str
+    checks: Dict[str, ProbeResultSchema]
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Annotated, Optional
+
+from pydantic import BaseModel, Field
+
+
+class StockUpdateSchema(BaseModel):
+    productName: Annotated[str, Field(..., min_length=1, example="Rice 5kg")]
+    pricePerUnit: Annotated[float, Field(..., ge=0, example=6.5)]
+    available: Annotated[int, Field(..., ge=0, example=100)]
+
+
+class StockResponseSchema(BaseModel):
+    sku: str
+    productName: str
+    pricePerUnit: float
+    available: int
+    updatedAt: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ReservationCreateSchema(BaseModel):
+    quantity: Annotated[int, Field(..., ge=1, le=1000, example=1)]
+
+
+class ReservationResponseSchema(BaseModel):
+    Id: int
+    sku: str
+    quantity: int
+    status: str
+    expiresAt: datetime
+    orderId: Optional[int] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+
+class OrderResponseSchema(BaseModel):
+    Id: int
+    userId: int
+    productName: str
+    quantity: int
+    pricePerUnit: float
+    totalPrice: float
+    orderedAt: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class OrderHistoryResponseSchema(BaseModel):
+    orders: List[OrderResponseSchema]
+    total: int
+
+
+class OrderArchiveResponseSchema(BaseModel):
+    Id: int
+    periodStart: datetime
+    periodEnd: datetime
+    path: str
+    format: str
+    rowCount: int
+    sizeBytes: int
+    createdAt: datetime
+
+    class Config:
+        from_attributes = True
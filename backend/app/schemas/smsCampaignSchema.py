@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Annotated, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SmsCampaignCreateSchema(BaseModel):
+    name: Annotated[str, Field(..., max_length=100, example="promo-2024-10")]
+    message: Annotated[
+        str, Field(..., min_length=1, max_length=1600, example="20% off all RC cars!")
+    ]
+    verifiedOnly: Annotated[bool, Field(True, example=True)]
+
+
+class SmsCampaignResponseSchema(BaseModel):
+    name: str
+    message: str
+    verifiedOnly: bool
+    lastUserId: int
+    sentCount: int
+    failedCount: int
+    createdAt: datetime
+    updatedAt: datetime
+    completedAt: Optional[datetime]
+
+    class Config:
+        from_attributes = True
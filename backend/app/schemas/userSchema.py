@@ -1,6 +1,11 @@
 from typing import Annotated
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, BaseModel, Field
+
+from app.utils.phoneNumber import normalizePhoneNumber
+
+# Phone numbers are stored and looked up in canonical E.164 form
+PhoneNumber = Annotated[str, AfterValidator(normalizePhoneNumber)]
 
 
 class MessageResponseSchema(BaseModel):
@@ -8,14 +13,14 @@ class MessageResponseSchema(BaseModel):
 
 
 class UserCreateSchema(BaseModel):
-    phoneNumber: Annotated[str, Field(..., example="+1234567890")]
+    phoneNumber: Annotated[PhoneNumber, Field(..., example="+85512345678")]
     fullName: Annotated[str, Field(..., example="John Doe")]
     password: Annotated[str, Field(..., min_length=8, example="strongpassword123")]
 
 
 class UserUpdateSchema(BaseModel):
     fullName: Annotated[str, Field(None, example="John Doe")]
-    phoneNumber: Annotated[str, Field(None, example="+1234567890")]
+    phoneNumber: Annotated[PhoneNumber, Field(None, example="+85512345678")]
     isVerified: Annotated[bool, Field(None, example=True)]
 
 
@@ -30,13 +35,19 @@ class UserResponseSchema(BaseModel):
         from_attributes = True
 
 
+class CurrentUserSchema(BaseModel):
+    userId: str
+    phoneNumber: str
+    fullName: str
+
+
 class UserLoginSchema(BaseModel):
-    phoneNumber: Annotated[str, Field(..., example="+1234567890")]
+    phoneNumber: Annotated[PhoneNumber, Field(..., example="+85512345678")]
     password: Annotated[str, Field(..., min_length=8, example="strongpassword123")]
 
 
 class UserForgotPasswordSchema(BaseModel):
-    phoneNumber: Annotated[str, Field(..., example="+1234567890")]
+    phoneNumber: Annotated[PhoneNumber, Field(..., example="+85512345678")]
 
 
 class UserChangePasswordSchema(BaseModel):
@@ -47,12 +58,12 @@ class UserChangePasswordSchema(BaseModel):
 
 
 class UserResetPasswordSchema(BaseModel):
-    phoneNumber: Annotated[str, Field(..., example="+1234567890")]
+    phoneNumber: Annotated[PhoneNumber, Field(..., example="+85512345678")]
     newPassword: Annotated[
         str, Field(..., min_length=8, example="newstrongpassword456")
     ]
 
 
 class VerifyOtpSchema(BaseModel):
-    phoneNumber: Annotated[str, Field(..., example="+1234567890")]
+    phoneNumber: Annotated[PhoneNumber, Field(..., example="+85512345678")]
     otpCode: Annotated[str, Field(..., min_length=6, max_length=6, example="123456")]
@@ -0,0 +1,66 @@
+"""Multi-process serving entry point.
+
+    python -m app.serve
+
+Runs gunicorn with uvicorn workers (pre-forking, see gunicorn.conf.py) when
+gunicorn is installed, and falls back to uvicorn's own process manager.
+Requests are drained on SIGTERM before the server stops listening (see
+app.core.server), except under uvicorn's process manager, which cannot be
+given a server class.
+"""
+
+import logging
+import os
+import sys
+
+from app.core.settings import getSettings
+from app.core.workers import defaultWorkerCount
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    workers = defaultWorkerCount(getSettings.WEB_CONCURRENCY, getSettings.MAX_WORKERS)
+    if workers > 1 and getSettings.SHARED_STATE_BACKEND == "memory":
+        logger.warning(
+            "SHARED_STATE_BACKEND=memory is per-process; rate limits and caches "
+            "will not be shared across workers",
+            extra={"workers": workers},
+        )
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        gunicorn = None
+
+    if gunicorn is not None and sys.platform != "win32":
+        configPath = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gunicorn.conf.py")
+        os.execvp(
+            sys.executable,
+            [sys.executable, "-m", "gunicorn", "-c", configPath, "app.main:app"],
+        )
+
+    import uvicorn
+
+    from app.core.server import DrainingServer
+
+    options = {
+        "host": getSettings.HOST,
+        "port": getSettings.PORT,
+        "proxy_headers": True,
+        "timeout_graceful_shutdown": int(getSettings.SHUTDOWN_TIMEOUT_SECONDS),
+    }
+    if workers == 1:
+        DrainingServer(uvicorn.Config("app.main:app", **options)).run()
+        return
+    logger.warning(
+        "uvicorn's process manager stops listening before readiness is withdrawn; "
+        "install gunicorn to drain requests on shutdown",
+        extra={"workers": workers},
+    )
+    uvicorn.run("app.main:app", workers=workers, **options)
+
+
+if __name__ == "__main__":
+    main()
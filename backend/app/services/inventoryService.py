@@ -0,0 +1,174 @@
+import logging
+from typing import Callable, Dict
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.audit import getAuditLog
+from app.core.metrics import getMetricsRegistry
+from app.core.settings import getSettings
+from app.models.inventoryModel import ProductStock, StockReservation
+from app.models.orderModel import Order
+from app.repository.inventoryRepo import InventoryRepository
+from app.schemas.inventorySchema import StockUpdateSchema
+
+logger = logging.getLogger(__name__)
+
+
+def _reservationCounter():
+    return getMetricsRegistry().counter(
+        "inventory_reservations_total",
+        "Stock reservation operations by outcome",
+        ("outcome",),
+    )
+
+
+class InventoryService:
+    """Service for stock levels, reservations and checkout"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.inventoryRepository = InventoryRepository(session)
+        self._reservations = _reservationCounter()
+
+    async def getStock(self, sku: str) -> ProductStock:
+        stock = await self.inventoryRepository.queryStock(sku)
+        if stock is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found",
+            )
+        return stock
+
+    async def setStock(self, sku: str, data: StockUpdateSchema) -> ProductStock:
+        """Create or overwrite a product's stock level (admin)"""
+        try:
+            stock = await self.inventoryRepository.setStock(
+                sku, data.productName, data.pricePerUnit, data.available
+            )
+            logger.info(
+                "Stock level set",
+                extra={"sku": sku, "available": data.available},
+            )
+            return stock
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error setting stock: {e}", extra={"sku": sku})
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error while setting stock: {e}",
+            )
+
+    async def reserve(self, sku: str, userId: int, quantity: int) -> StockReservation:
+        """Hold quantity units for the user for RESERVATION_TTL_SECONDS"""
+        try:
+            reservation = await self.inventoryRepository.reserve(
+                sku, userId, quantity, getSettings.RESERVATION_TTL_SECONDS
+            )
+            if reservation is None:
+                # Unknown SKU and sold out look the same to the UPDATE; tell them apart
+                await self.getStock(sku)
+                self._reservations.inc(outcome="out_of_stock")
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Not enough stock",
+                )
+            self._reservations.inc(outcome="held")
+            return reservation
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            await self.session.rollback()
+            self._reservations.inc(outcome="error")
+            logger.error(
+                f"Error reserving stock: {e}",
+                extra={"sku": sku, "userId": userId, "quantity": quantity},
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error while reserving stock: {e}",
+            )
+
+    async def checkout(self, reservationId: int, userId: int) -> Order:
+        """Turn the user's live reservation into an order"""
+        try:
+            order = await self.inventoryRepository.checkout(reservationId, userId)
+            if order is None:
+                self._reservations.inc(outcome="checkout_rejected")
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Reservation is not held or has expired",
+                )
+            self._reservations.inc(outcome="committed")
+            getAuditLog().record(
+                "order.created",
+                userId=userId,
+                orderId=order.Id,
+                reservationId=reservationId,
+            )
+            return order
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            await self.session.rollback()
+            self._reservations.inc(outcome="error")
+            logger.error(
+                f"Error checking out reservation: {e}",
+                extra={"reservationId": reservationId, "userId": userId},
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error during checkout: {e}",
+            )
+
+    async def release(self, reservationId: int, userId: int) -> None:
+        """Cancel the user's live reservation and restock it"""
+        try:
+            if not await self.inventoryRepository.release(reservationId, userId):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="No held reservation with this id",
+                )
+            self._reservations.inc(outcome="released")
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(
+                f"Error releasing reservation: {e}",
+                extra={"reservationId": reservationId, "userId": userId},
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error while releasing reservation: {e}",
+            )
+
+
+async def expireReservations(
+    sessionMaker: Callable[[], AsyncSession], batchSize: int = 500
+) -> Dict[str, int]:
+    """Restock every overdue hold, one batch per transaction"""
+    expired = 0
+    restocked: Dict[str, int] = {}
+    while True:
+        async with sessionMaker() as session:
+            count, batch = await InventoryRepository(session).expireHeld(batchSize)
+        expired += count
+        for sku, quantity in batch.items():
+            restocked[sku] = restocked.get(sku, 0) + quantity
+        if count < batchSize:
+            break
+    if expired:
+        _reservationCounter().inc(expired, outcome="expired")
+        logger.info(
+            "Expired stock reservations",
+            extra={
+                "operation": "expire_reservations",
+                "expired": expired,
+                "restocked": restocked,
+            },
+        )
+    return restocked
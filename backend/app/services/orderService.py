@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.orderArchive import readArchive
+from app.repository.orderRepo import OrderRepository
+from app.schemas.orderSchema import OrderHistoryResponseSchema, OrderResponseSchema
+
+logger = logging.getLogger(__name__)
+
+
+def _newestFirst(order: OrderResponseSchema) -> tuple:
+    orderedAt = order.orderedAt
+    # SQLite hands back naive datetimes, archives aware ones; both are UTC
+    if orderedAt.tzinfo is None:
+        orderedAt = orderedAt.replace(tzinfo=timezone.utc)
+    return orderedAt, order.Id
+
+
+class OrderService:
+    """Service for reading a user's order history"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.orderRepository = OrderRepository(session)
+
+    async def getHistory(
+        self,
+        userId: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        includeArchived: bool = False,
+        limit: int = 100,
+    ) -> OrderHistoryResponseSchema:
+        """Newest orders first; archived months are read only when asked for
+
+        Archive files are filtered by user and time range while reading, so
+        a request touches only the row groups that can match.
+        """
+        # Times without an offset are taken as UTC, the storage timezone
+        since, until = (
+            value.replace(tzinfo=timezone.utc)
+            if value is not None and value.tzinfo is None
+            else value
+            for value in (since, until)
+        )
+        try:
+            orders, total = await self.orderRepository.queryHistory(
+                userId, since, until, limit
+            )
+            history = [OrderResponseSchema.model_validate(order) for order in orders]
+            if includeArchived:
+                for archive in await self.orderRepository.listArchives(since, until):
+                    rows = await asyncio.to_thread(
+                        readArchive, archive.path, archive.format, userId, since, until
+                    )
+                    total += len(rows)
+                    history.extend(OrderResponseSchema.model_validate(row) for row in rows)
+                history.sort(key=_newestFirst, reverse=True)
+                history = history[:limit]
+            return OrderHistoryResponseSchema(orders=history, total=total)
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(
+                f"Error reading order history: {e}",
+                extra={"userId": userId, "include_archived": includeArchived},
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error while reading order history: {e}",
+            )
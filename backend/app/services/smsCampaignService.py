@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import getSettings
+from app.core.sharedState import RateLimiter, getSharedState
+from app.core.shutdown import getShutdownManager
+from app.models.smsCampaignModel import SmsCampaign
+from app.models.userModel import User
+from app.provider.smsProvider import SMSService, getSmsService
+from app.repository.smsCampaignRepo import SmsCampaignRepository
+
+logger = logging.getLogger(__name__)
+
+# A running campaign refreshes its lease every CAMPAIGN_LEASE_REFRESH_SECONDS,
+# so a batch held up by slow providers does not outlive it
+CAMPAIGN_LEASE_SECONDS = 300
+CAMPAIGN_LEASE_REFRESH_SECONDS = CAMPAIGN_LEASE_SECONDS / 3
+
+# Campaigns started from this process through the admin API
+_runningCampaigns: Dict[str, "asyncio.Task[None]"] = {}
+
+
+class CampaignBusyError(Exception):
+    """Raised when another process is already sending the campaign"""
+
+
+class SmsCampaignService:
+    """Send one message to every matching user in resumable batches
+
+    Recipients are streamed in users.Id order through a server-side cursor,
+    so memory stays flat regardless of the user count. After each batch has
+    been dispatched the last user Id is checkpointed; running a campaign
+    again with the same name resumes after that Id.
+    """
+
+    def __init__(
+        self,
+        sessionMaker: Callable[[], AsyncSession],
+        smsService: Optional[SMSService] = None,
+        rateLimiter: Optional[RateLimiter] = None,
+    ):
+        self.sessionMaker = sessionMaker
+        self.smsService = smsService or getSmsService()
+        self.rateLimiter = rateLimiter or RateLimiter(getSharedState())
+
+    async def runCampaign(
+        self,
+        name: str,
+        message: str,
+        verifiedOnly: bool = True,
+        batchSize: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> SmsCampaign:
+        """Create or resume the named campaign and send it to completion"""
+        batchSize = batchSize or getSettings.SMS_BULK_BATCH_SIZE
+        leaseKey = f"sms-campaign:{name}"
+        # Unique per run, so only this run can extend or release the lease
+        owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        if not await getSharedState().add(
+            leaseKey, owner, ttlSeconds=CAMPAIGN_LEASE_SECONDS
+        ):
+            raise CampaignBusyError(f"Campaign {name} is already running")
+
+        leaseLost = asyncio.Event()
+        keeper = asyncio.create_task(
+            _keepLease(leaseKey, owner, leaseLost), name=f"smsCampaignLease:{name}"
+        )
+        try:
+            async with self.sessionMaker() as session:
+                repository = SmsCampaignRepository(session)
+                campaign = await self._loadOrCreate(
+                    repository, name, message, verifiedOnly
+                )
+                if campaign.completedAt is not None:
+                    logger.info(
+                        "SMS campaign already completed",
+                        extra={"campaign": name, "sent": campaign.sentCount},
+                    )
+                    return campaign
+
+                logger.info(
+                    "SMS campaign started",
+                    extra={"campaign": name, "resume_after_user": campaign.lastUserId},
+                )
+                async for batch in self._streamRecipients(
+                    campaign.lastUserId, campaign.verifiedOnly, batchSize
+                ):
+                    if leaseLost.is_set():
+                        # Another process may be sending; it resumes from the checkpoint
+                        raise CampaignBusyError(f"Campaign {name} lost its lease")
+                    results = await self.smsService.sendBulk(
+                        ((phoneNumber, campaign.message) for _, phoneNumber in batch),
+                        rateLimiter=self.rateLimiter,
+                        concurrency=concurrency,
+                    )
+                    sent = sum(results)
+                    await repository.saveProgress(
+                        campaign.Id, batch[-1][0], sent, len(results) - sent
+                    )
+
+                await repository.markCompleted(campaign.Id)
+                await session.refresh(campaign)
+                logger.info(
+                    "SMS campaign completed",
+                    extra={
+                        "campaign": name,
+                        "sent": campaign.sentCount,
+                        "failed": campaign.failedCount,
+                    },
+                )
+                return campaign
+        finally:
+            keeper.cancel()
+            await asyncio.gather(keeper, return_exceptions=True)
+            await getSharedState().deleteIfValue(leaseKey, owner)
+
+    async def getCampaign(self, name: str) -> Optional[SmsCampaign]:
+        async with self.sessionMaker() as session:
+            return await SmsCampaignRepository(session).queryName(name)
+
+    async def _loadOrCreate(
+        self,
+        repository: SmsCampaignRepository,
+        name: str,
+        message: str,
+        verifiedOnly: bool,
+    ) -> SmsCampaign:
+        campaign = await repository.queryName(name)
+        if campaign is None:
+            return await repository.create(
+                SmsCampaign(name=name, message=message, verifiedOnly=verifiedOnly)
+            )
+        if campaign.message != message:
+            # A resumed run must not switch messages halfway through the audience
+            logger.warning(
+                "Resuming SMS campaign with its original message",
+                extra={"campaign": name},
+            )
+        return campaign
+
+    async def _streamRecipients(self, afterUserId: int, verifiedOnly: bool, batchSize: int):
+        """Yield lists of (userId, phoneNumber) in Id order
+
+        PostgreSQL streams through a server-side cursor. SQLite has no such
+        cursor and an open read would block the checkpoint commits, so it is
+        read in short keyset pages instead.
+        """
+        stmt = select(User.Id, User.phoneNumber).order_by(User.Id)
+        if verifiedOnly:
+            stmt = stmt.where(User.isVerified.is_(True))
+        async with self.sessionMaker() as session:
+            if session.bind.dialect.name == "sqlite":
+                while True:
+                    result = await session.execute(
+                        stmt.where(User.Id > afterUserId).limit(batchSize)
+                    )
+                    batch: List[Tuple[int, str]] = [(row[0], row[1]) for row in result]
+                    await session.commit()
+                    if not batch:
+                        return
+                    afterUserId = batch[-1][0]
+                    yield batch
+
+            result = await session.stream(
+                stmt.where(User.Id > afterUserId).execution_options(yield_per=batchSize)
+            )
+            async for partition in result.partitions():
+                yield [(row[0], row[1]) for row in partition]
+
+
+async def _keepLease(leaseKey: str, owner: str, leaseLost: asyncio.Event) -> None:
+    """Refresh a campaign lease until cancelled; set leaseLost if it is taken"""
+    while True:
+        await asyncio.sleep(CAMPAIGN_LEASE_REFRESH_SECONDS)
+        try:
+            held = await getSharedState().refresh(
+                leaseKey, owner, ttlSeconds=CAMPAIGN_LEASE_SECONDS
+            )
+        except Exception as e:
+            # Retried on the next tick, well before the lease runs out
+            logger.warning(
+                f"SMS campaign lease refresh failed: {e}",
+                extra={"lease": leaseKey},
+            )
+            continue
+        if not held:
+            logger.error(
+                "SMS campaign lease lost; stopping after the current batch",
+                extra={"lease": leaseKey},
+            )
+            leaseLost.set()
+            return
+
+
+def startCampaign(
+    sessionMaker: Callable[[], AsyncSession],
+    name: str,
+    message: str,
+    verifiedOnly: bool = True,
+) -> bool:
+    """Run a campaign in the background of this process; False if already running here"""
+    running = _runningCampaigns.get(name)
+    if running is not None and not running.done():
+        return False
+
+    async def run() -> None:
+        try:
+            await SmsCampaignService(sessionMaker).runCampaign(
+                name, message, verifiedOnly
+            )
+        except Exception as e:
+            logger.error(
+                f"SMS campaign failed: {e}",
+                extra={"campaign": name},
+            )
+        finally:
+            _runningCampaigns.pop(name, None)
+
+    # Shutdown waits for the campaign up to its deadline; a cancelled run
+    # resumes from its last checkpoint when started again
+    _runningCampaigns[name] = getShutdownManager().createTask(
+        run(), name=f"smsCampaign:{name}"
+    )
+    return True
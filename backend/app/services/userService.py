@@ -1,17 +1,27 @@
+import asyncio
+import hashlib
+import hmac
 import logging
+import secrets
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Union
 
 from fastapi import HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.audit import getAuditLog
+from app.core.deadline import checkDeadline
+from app.core.revocation import getRevocationList
 from app.core.security import SecurityManager
 from app.core.settings import getSettings
 from app.models.otpModel import OTP
+from app.models.sessionModel import UserSession
 from app.models.userModel import User
-from app.provider.smsProvider import smsService
+from app.provider.smsProvider import getSmsService
 from app.repository.otpRepo import OTPRepository
-from app.repository.userRepo import UserRepository
+from app.repository.sessionRepo import SessionRepository
+from app.repository.userRepo import UserAuthRow, UserRepository
 from app.schemas.userSchema import (
     UserChangePasswordSchema,
     UserCreateSchema,
@@ -20,12 +30,14 @@ from app.schemas.userSchema import (
     UserResetPasswordSchema,
     VerifyOtpSchema,
 )
-from app.utils.jwtHandler import JWTHandler
+from app.utils.jwtHandler import TokenData, getJwtHandler
 
 logger = logging.getLogger(__name__)
-jwtHandler = JWTHandler(
-    secretKey=getSettings.SECRET_KEY, algorithm=getSettings.ALGORITHM
-)
+
+ACCESS_TOKEN_COOKIE = "accessToken"
+REFRESH_TOKEN_COOKIE = "refreshToken"
+# Refresh tokens are only sent to the user routes that rotate or revoke them
+REFRESH_TOKEN_COOKIE_PATH = "/api/v1/users"
 
 
 class UserService:
@@ -35,11 +47,12 @@ class UserService:
         self.session = session
         self.userRepository = UserRepository(session)
         self.otpRepository = OTPRepository(session)
+        self.sessionRepository = SessionRepository(session)
 
     async def registerUser(self, userData: UserCreateSchema) -> User:
         """Register a new user and send OTP"""
         try:
-            existingUser = await self.userRepository.queryPhoneNumber(
+            existingUser = await self.userRepository.queryAuthByPhoneNumber(
                 userData.phoneNumber
             )
             if existingUser:
@@ -51,10 +64,16 @@ class UserService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Phone number already in use",
                 )
+            # Hashing cannot be interrupted, so do not start it after the deadline
+            checkDeadline()
+            # argon2 runs in a thread so one hash does not stall the event loop
+            hashedPassword = await asyncio.to_thread(
+                SecurityManager.hashPassword, userData.password
+            )
             user = User(
                 fullName=userData.fullName,
                 phoneNumber=userData.phoneNumber,
-                hashedPassword=SecurityManager.hashPassword(userData.password),
+                hashedPassword=hashedPassword,
             )
             self.session.add(user)
             await self.session.commit()
@@ -68,15 +87,15 @@ class UserService:
             )
             await self.otpRepository.create(otp)
             try:
-                await smsService.sendSms(
-                    userData.phoneNumber,
-                    f"Your Vireakbo RC Store verification code is: {otpCode}. Valid for 5 minutes.",
-                )
+                await getSmsService().sendOtpSms(userData.phoneNumber, otpCode)
             except Exception as e:
                 logger.error(
                     f"Error sending OTP SMS during registration: {e}",
                     extra={"phone_number": userData.phoneNumber},
                 )
+            getAuditLog().record(
+                "user.registered", userId=user.Id, phoneNumber=userData.phoneNumber
+            )
             logger.info(
                 "User registered successfully with OTP sent",
                 extra={"userId": user.Id, "phone_number": userData.phoneNumber},
@@ -97,34 +116,69 @@ class UserService:
             )
 
     async def verifyUserOtp(self, data: VerifyOtpSchema) -> None:
-        """Verify user's phone number using OTP and delete it from database"""
+        """Verify user's phone number using OTP, consuming it atomically"""
         try:
-            otpRecord = await self.otpRepository.getValidOTP(data.phoneNumber)
-            if not otpRecord:
-                logger.warning(
-                    "OTP verification failed: No valid OTP found",
-                    extra={"phone_number": data.phoneNumber},
+            maxAttempts = getSettings.OTP_MAX_ATTEMPTS
+            consumedId = await self.otpRepository.consumeValidOTP(
+                data.phoneNumber, data.otpCode, maxAttempts
+            )
+            if consumedId is None:
+                failure = await self.otpRepository.recordFailedAttempt(
+                    data.phoneNumber, maxAttempts
                 )
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid or expired OTP",
+                await self.session.commit()
+                if failure is None:
+                    getAuditLog().record(
+                        "otp.verify",
+                        "failure",
+                        phoneNumber=data.phoneNumber,
+                        reason="no_valid_otp",
+                    )
+                    logger.warning(
+                        "OTP verification failed: No valid OTP found",
+                        extra={"phone_number": data.phoneNumber},
+                    )
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Invalid or expired OTP",
+                    )
+                attempts, invalidated = failure
+                if invalidated:
+                    getAuditLog().record(
+                        "otp.verify",
+                        "failure",
+                        phoneNumber=data.phoneNumber,
+                        reason="locked",
+                        attempts=attempts,
+                    )
+                    logger.warning(
+                        "OTP invalidated after too many failed attempts",
+                        extra={"phone_number": data.phoneNumber, "attempts": attempts},
+                    )
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Too many invalid attempts, request a new OTP",
+                    )
+                getAuditLog().record(
+                    "otp.verify",
+                    "failure",
+                    phoneNumber=data.phoneNumber,
+                    reason="wrong_code",
+                    attempts=attempts,
                 )
-            if otpRecord.otpCode != data.otpCode:
                 logger.warning(
                     "OTP verification failed: Invalid OTP code",
-                    extra={"phone_number": data.phoneNumber},
+                    extra={"phone_number": data.phoneNumber, "attempts": attempts},
                 )
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Invalid OTP code",
                 )
 
-            user = await self.userRepository.queryPhoneNumber(data.phoneNumber)
-            if user:
-                user.isVerified = True
-                await self.session.commit()
-            await self.otpRepository.deleteOTP(otpRecord.Id)
+            await self.userRepository.markVerified(data.phoneNumber)
+            await self.session.commit()
 
+            getAuditLog().record("otp.verify", phoneNumber=data.phoneNumber)
             logger.info(
                 "OTP verified successfully and deleted from database",
                 extra={"phone_number": data.phoneNumber},
@@ -144,13 +198,29 @@ class UserService:
 
     async def authenticateUser(
         self, userData: UserLoginSchema, response: Response
-    ) -> User:
+    ) -> UserAuthRow:
         """Authenticate user using phone number and password"""
         try:
-            user = await self.userRepository.queryPhoneNumber(userData.phoneNumber)
-            if not user or not SecurityManager.verifyPassword(
-                userData.password, user.hashedPassword
-            ):
+            user = await self.userRepository.queryAuthByPhoneNumber(
+                userData.phoneNumber
+            )
+            checkDeadline()
+            isValid, upgradedHash = (
+                await asyncio.to_thread(
+                    SecurityManager.verifyAndUpdatePassword,
+                    userData.password,
+                    user.hashedPassword,
+                )
+                if user
+                else (False, None)
+            )
+            if not isValid:
+                getAuditLog().record(
+                    "auth.login",
+                    "failure",
+                    userId=user.Id if user else None,
+                    phoneNumber=userData.phoneNumber,
+                )
                 logger.warning(
                     "Authentication failed: Invalid credentials",
                     extra={"phone_number": userData.phoneNumber},
@@ -159,22 +229,11 @@ class UserService:
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid phone number or password",
                 )
-            tokenData: Dict[str, Any] = {
-                "userId": user.Id,
-                "phoneNumber": user.phoneNumber,
-                "fullName": user.fullName,
-            }
-            accessToken = jwtHandler.encodeToken(
-                tokenData,
-                expiresDelta=timedelta(minutes=getSettings.ACCESS_TOKEN_EXPIRE_MINUTES),
-            )
-            response.set_cookie(
-                key="accessToken",
-                value=accessToken,
-                httponly=True,
-                max_age=getSettings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-                secure=True,
-                samesite="lax",
+            if upgradedHash:
+                await self._rehashPassword(user.Id, upgradedHash)
+            await self._issueSession(user, response)
+            getAuditLog().record(
+                "auth.login", userId=user.Id, phoneNumber=userData.phoneNumber
             )
             logger.info(
                 "User authenticated successfully",
@@ -195,7 +254,7 @@ class UserService:
     async def forgotPassword(self, data: UserForgotPasswordSchema) -> None:
         """Initiate password reset process"""
         try:
-            user = await self.userRepository.queryPhoneNumber(data.phoneNumber)
+            user = await self.userRepository.queryAuthByPhoneNumber(data.phoneNumber)
             if not user:
                 logger.warning(
                     "Forgot password failed: User not found",
@@ -205,6 +264,9 @@ class UserService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="User with given phone number not found",
                 )
+            getAuditLog().record(
+                "password.reset_requested", userId=user.Id, phoneNumber=data.phoneNumber
+            )
             logger.info(
                 "Password reset initiated",
                 extra={"userId": user.Id, "phone_number": data.phoneNumber},
@@ -234,8 +296,20 @@ class UserService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="User with given phone number not found",
                 )
-            user.hashedPassword = SecurityManager.hashPassword(data.newPassword)
+            checkDeadline()
+            user.hashedPassword = await asyncio.to_thread(
+                SecurityManager.hashPassword, data.newPassword
+            )
             await self.userRepository.update(user)
+            revokedSessions = await self.sessionRepository.revokeAllForUser(user.Id)
+            for sessionId in revokedSessions:
+                getRevocationList().add(sessionId)
+            getAuditLog().record(
+                "password.reset",
+                userId=user.Id,
+                phoneNumber=data.phoneNumber,
+                revokedSessions=len(revokedSessions),
+            )
             logger.info(
                 "Password reset successfully",
                 extra={"userId": user.Id, "phone_number": data.phoneNumber},
@@ -252,35 +326,46 @@ class UserService:
                 detail=f"Internal server error during password reset: {e}",
             )
 
-    async def changePassword(self, currentUserId: int, data: UserChangePasswordSchema):
-        """Change user password using user ID and old/new passwords"""
-        try:
-            # Get user from database using userId
-            user = await self.userRepository.queryId(int(currentUserId))
-            if not user:
-                logger.warning(
-                    "Change password failed: User not found",
-                    extra={"userId": currentUserId},
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User with given ID not found",
-                )
+    async def changePassword(
+        self,
+        user: User,
+        data: UserChangePasswordSchema,
+        currentSessionId: Optional[str] = None,
+    ):
+        """Change the password of an already loaded user using old/new passwords
 
-            if not SecurityManager.verifyPassword(
-                data.oldPassword, user.hashedPassword
+        Every other session of the user is revoked; currentSessionId, the
+        session making the change, stays signed in.
+        """
+        try:
+            checkDeadline()
+            if not await asyncio.to_thread(
+                SecurityManager.verifyPassword, data.oldPassword, user.hashedPassword
             ):
+                getAuditLog().record("password.change", "failure", userId=user.Id)
                 logger.warning(
                     "Change password failed: Incorrect old password",
-                    extra={"userId": currentUserId},
+                    extra={"userId": user.Id},
                 )
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Incorrect old password",
                 )
 
-            user.hashedPassword = SecurityManager.hashPassword(data.newPassword)
+            user.hashedPassword = await asyncio.to_thread(
+                SecurityManager.hashPassword, data.newPassword
+            )
             await self.userRepository.update(user)
+            revokedSessions = await self.sessionRepository.revokeAllForUser(
+                user.Id, exceptSessionId=currentSessionId
+            )
+            for sessionId in revokedSessions:
+                getRevocationList().add(sessionId)
+            getAuditLog().record(
+                "password.change",
+                userId=user.Id,
+                revokedSessions=len(revokedSessions),
+            )
             logger.info(
                 "Password changed successfully",
                 extra={"userId": user.Id},
@@ -296,10 +381,64 @@ class UserService:
                 detail=f"Internal server error during password change: {e}",
             )
 
-    async def logoutUser(self, currentUser: User, response: Response) -> None:
-        """Logout current user"""
+    async def refreshSession(
+        self, refreshToken: Optional[str], response: Response
+    ) -> None:
+        """Rotate the refresh token and issue a new access token"""
         try:
-            if not currentUser:
+            sessionId, _, secret = (refreshToken or "").partition(".")
+            if not sessionId or not secret:
+                logger.warning("Token refresh failed: Missing refresh token")
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Refresh token not found in cookies",
+                )
+
+            newSecret = secrets.token_urlsafe(32)
+            userId = await self.sessionRepository.rotate(
+                sessionId,
+                self._hashRefreshToken(secret),
+                self._hashRefreshToken(newSecret),
+            )
+            if userId is None:
+                await self._handleRejectedRefresh(sessionId, secret)
+                self._clearAuthCookies(response)
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid or expired refresh token",
+                )
+
+            user = await self.userRepository.queryAuthById(userId)
+            if not user:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User for session not found",
+                )
+            self._setAuthCookies(
+                response,
+                self._encodeAccessToken(user, sessionId),
+                f"{sessionId}.{newSecret}",
+            )
+            logger.info(
+                "Session refreshed successfully",
+                extra={"userId": userId, "sessionId": sessionId},
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(
+                f"Error during token refresh: {e}",
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error during token refresh: {e}",
+            )
+
+    async def logoutUser(self, tokenData: TokenData, response: Response) -> None:
+        """Logout current user and revoke the session"""
+        try:
+            if not tokenData:
                 logger.warning(
                     "Logout failed: User is not authenticated",
                 )
@@ -307,14 +446,26 @@ class UserService:
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="User is not authenticated",
                 )
-            response.delete_cookie(key="accessToken")
+            if tokenData.sessionId:
+                revokedAt = await self.sessionRepository.revoke(tokenData.sessionId)
+                getRevocationList().add(tokenData.sessionId, revokedAt)
+            self._clearAuthCookies(response)
+            getAuditLog().record(
+                "auth.logout",
+                userId=int(tokenData.userId),
+                sessionId=tokenData.sessionId,
+            )
             logger.info(
                 "User logged out successfully",
-                extra={"phone_number": currentUser.phoneNumber},
+                extra={
+                    "phone_number": tokenData.phoneNumber,
+                    "sessionId": tokenData.sessionId,
+                },
             )
         except HTTPException:
             raise
         except Exception as e:
+            await self.session.rollback()
             logger.error(
                 f"Error during user logout: {e}",
             )
@@ -322,3 +473,107 @@ class UserService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Internal server error during logout: {e}",
             )
+
+    async def _issueSession(
+        self, user: Union[User, UserAuthRow], response: Response
+    ) -> None:
+        """Create a session and set the access and refresh token cookies"""
+        sessionId = uuid.uuid4().hex
+        secret = secrets.token_urlsafe(32)
+        await self.sessionRepository.create(
+            UserSession(
+                Id=sessionId,
+                userId=user.Id,
+                refreshTokenHash=self._hashRefreshToken(secret),
+                expiresAt=datetime.now(timezone.utc)
+                + timedelta(days=getSettings.REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+        )
+        self._setAuthCookies(
+            response, self._encodeAccessToken(user, sessionId), f"{sessionId}.{secret}"
+        )
+
+    async def _handleRejectedRefresh(self, sessionId: str, secret: str) -> None:
+        """Revoke the session when an already-rotated refresh token is replayed"""
+        userSession = await self.sessionRepository.queryId(sessionId)
+        if (
+            userSession is None
+            or userSession.revokedAt is not None
+            or hmac.compare_digest(
+                userSession.refreshTokenHash, self._hashRefreshToken(secret)
+            )
+        ):
+            logger.warning(
+                "Token refresh failed: Session revoked or expired",
+                extra={"sessionId": sessionId},
+            )
+            return
+        revokedAt = await self.sessionRepository.revoke(sessionId)
+        getRevocationList().add(sessionId, revokedAt)
+        getAuditLog().record(
+            "session.reuse_detected",
+            "failure",
+            userId=userSession.userId,
+            sessionId=sessionId,
+        )
+        logger.warning(
+            "Refresh token reuse detected, session revoked",
+            extra={"sessionId": sessionId, "userId": userSession.userId},
+        )
+
+    @staticmethod
+    def _encodeAccessToken(user: Union[User, UserAuthRow], sessionId: str) -> str:
+        tokenData: Dict[str, Any] = {
+            "userId": user.Id,
+            "phoneNumber": user.phoneNumber,
+            "fullName": user.fullName,
+            "sid": sessionId,
+        }
+        return getJwtHandler().encodeToken(
+            tokenData,
+            expiresDelta=timedelta(minutes=getSettings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        )
+
+    @staticmethod
+    def _hashRefreshToken(secret: str) -> str:
+        return hashlib.sha256(secret.encode()).hexdigest()
+
+    @staticmethod
+    def _setAuthCookies(response: Response, accessToken: str, refreshToken: str) -> None:
+        response.set_cookie(
+            key=ACCESS_TOKEN_COOKIE,
+            value=accessToken,
+            httponly=True,
+            max_age=getSettings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            secure=True,
+            samesite="lax",
+        )
+        response.set_cookie(
+            key=REFRESH_TOKEN_COOKIE,
+            value=refreshToken,
+            httponly=True,
+            max_age=getSettings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+            path=REFRESH_TOKEN_COOKIE_PATH,
+            secure=True,
+            samesite="strict",
+        )
+
+    @staticmethod
+    def _clearAuthCookies(response: Response) -> None:
+        response.delete_cookie(key=ACCESS_TOKEN_COOKIE)
+        response.delete_cookie(key=REFRESH_TOKEN_COOKIE, path=REFRESH_TOKEN_COOKIE_PATH)
+
+    async def _rehashPassword(self, userId: int, upgradedHash: str) -> None:
+        """Store a hash with the current argon2 parameters; never fails the login"""
+        try:
+            await self.userRepository.updatePasswordHash(userId, upgradedHash)
+            logger.info(
+                "Password hash upgraded to current parameters",
+                extra={"userId": userId},
+            )
+        except Exception as e:
+            await self.session.rollback()
+            logger.warning(
+                f"Failed to upgrade password hash: {e}",
+                extra={"userId": userId},
+            )
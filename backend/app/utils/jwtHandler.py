@@ -1,16 +1,17 @@
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
-from jose import jwt
-from jose.exceptions import ExpiredSignatureError, JWTError
 from pydantic import BaseModel
 
+from app.core.lazy import LazySingleton
+
 
 class TokenData(BaseModel):
     userId: str
     phoneNumber: str
     fullName: str
     expiresAt: datetime
+    sessionId: Optional[str] = None
 
 
 class JWTHandler:
@@ -24,6 +25,7 @@ class JWTHandler:
         self, payload: Dict[str, Any], expiresDelta: Optional[timedelta] = None
     ) -> str:
         """Encode a JWT token with an expiration time"""
+        from jose import jwt
 
         toEncode = payload.copy()
         if expiresDelta:
@@ -39,6 +41,9 @@ class JWTHandler:
 
     def decodeToken(self, token: str) -> TokenData:
         """Decode a JWT token and return the token data"""
+        from jose import jwt
+        from jose.exceptions import ExpiredSignatureError, JWTError
+
         try:
             payload = jwt.decode(token, self.secretKey, algorithms=[self.algorithm])
             phoneNumber = payload.get("phoneNumber")
@@ -52,8 +57,20 @@ class JWTHandler:
                 phoneNumber=phoneNumber,
                 fullName=payload.get("fullName") or "",
                 expiresAt=datetime.fromtimestamp(exp, tz=timezone.utc),
+                sessionId=payload.get("sid"),
             )
         except ExpiredSignatureError:
             raise ValueError("Token has expired")
         except JWTError as e:
             raise ValueError(f"Token decode error: {e}")
+
+
+def _createJwtHandler() -> JWTHandler:
+    """Create the JWT handler from settings"""
+    from app.core.settings import getSettings
+
+    return JWTHandler(secretKey=getSettings.SECRET_KEY, algorithm=getSettings.ALGORITHM)
+
+
+# Shared JWT handler instance, created on first use
+getJwtHandler = LazySingleton(_createJwtHandler)
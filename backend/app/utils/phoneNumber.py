@@ -0,0 +1,55 @@
+from typing import List, Optional
+
+# Cambodia; numbers without a country code are assumed to be local
+DEFAULT_COUNTRY_CODE = "855"
+
+# E.164 allows at most 15 digits; Cambodian subscriber numbers have 8 or 9
+MIN_DIGITS = 8
+MAX_DIGITS = 15
+
+_STRIP_TABLE = str.maketrans("", "", " -.()/\t")
+
+
+def normalizePhoneNumber(phoneNumber: str) -> str:
+    """Return the canonical E.164 form, e.g. "012 345 678" -> "+85512345678"
+
+    Accepts local numbers with or without the trunk 0, numbers with the
+    country code with or without "+", and the "00" international prefix.
+    Raises ValueError for anything that cannot be a phone number.
+    """
+    value = phoneNumber.strip().translate(_STRIP_TABLE)
+    if value.startswith("00"):
+        value = "+" + value[2:]
+
+    international = value.startswith("+")
+    digits = value[1:] if international else value
+    if not digits.isdigit():
+        raise ValueError("Phone number may only contain digits and a leading +")
+
+    if not international:
+        if digits.startswith("0"):
+            digits = DEFAULT_COUNTRY_CODE + digits[1:]
+        elif not (
+            digits.startswith(DEFAULT_COUNTRY_CODE)
+            and len(digits) >= len(DEFAULT_COUNTRY_CODE) + MIN_DIGITS
+        ):
+            digits = DEFAULT_COUNTRY_CODE + digits
+
+    # Drop a trunk 0 written after the country code ("+855 012 ...")
+    if digits.startswith(DEFAULT_COUNTRY_CODE + "0"):
+        digits = DEFAULT_COUNTRY_CODE + digits[len(DEFAULT_COUNTRY_CODE) + 1 :]
+
+    if not MIN_DIGITS <= len(digits) <= MAX_DIGITS:
+        raise ValueError("Phone number has an invalid length")
+    return "+" + digits
+
+
+def normalizePhoneNumbers(phoneNumbers: List[str]) -> List[Optional[str]]:
+    """Normalize a batch, with None in place of numbers that are invalid"""
+    normalized: List[Optional[str]] = []
+    for phoneNumber in phoneNumbers:
+        try:
+            normalized.append(normalizePhoneNumber(phoneNumber))
+        except ValueError:
+            normalized.append(None)
+    return normalized
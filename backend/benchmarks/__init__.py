@@ -0,0 +1,4 @@
+"""Benchmark harnesses for the backend service.
+
+Run from the ``backend`` directory, e.g. ``python -m benchmarks.serialization``.
+"""
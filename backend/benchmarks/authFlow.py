@@ -0,0 +1,203 @@
+"""Load test for the auth flow: register -> verifyOtp -> login -> changePassword.
+
+Boots the app in-process (lifespan included) against SQLite and, optionally,
+Postgres, with SMS routed to a fake transport. Reports throughput and
+p50/p95/p99 per endpoint and can fail on regressions against a baseline.
+
+    python -m benchmarks.authFlow --users 200 --concurrency 20 --postgres pgserver \\
+        --output auth.json --baseline auth-baseline.json --max-regression 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.common import (
+    FakeSMSTransport,
+    applyBenchmarkEnv,
+    percentiles,
+    postgresStandIn,
+    printTable,
+    writeResults,
+)
+
+ENDPOINTS = ["register", "verifyOtp", "login", "changePassword"]
+PASSWORD = "benchmarkPassword1"
+NEW_PASSWORD = "benchmarkPassword2"
+
+
+class FlowRecorder:
+    """Collects latencies and failures per endpoint"""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {name: [] for name in ENDPOINTS}
+        self.errors: Dict[str, int] = {name: 0 for name in ENDPOINTS}
+
+    async def call(
+        self, name: str, client: httpx.AsyncClient, path: str, body: Dict[str, Any], expected: int
+    ) -> bool:
+        startTime = time.perf_counter()
+        response = await client.post(f"/api/v1/users/{path}", json=body)
+        self.latencies[name].append(time.perf_counter() - startTime)
+        if response.status_code != expected:
+            self.errors[name] += 1
+            return False
+        return True
+
+
+async def runVirtualUser(
+    app: Any, index: int, runId: str, sms: FakeSMSTransport, recorder: FlowRecorder
+) -> None:
+    """Drive one user through the whole flow with its own cookie jar"""
+    phoneNumber = f"0{runId}{index:06d}"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="https://bench") as client:
+        registered = await recorder.call(
+            "register",
+            client,
+            "register",
+            {"phoneNumber": phoneNumber, "fullName": f"Bench {runId} {index}", "password": PASSWORD},
+            201,
+        )
+        if not registered:
+            return
+        otpCode = sms.lastOtp(phoneNumber) or "000000"
+        await recorder.call(
+            "verifyOtp", client, "verifyOtp", {"phoneNumber": phoneNumber, "otpCode": otpCode}, 200
+        )
+        loggedIn = await recorder.call(
+            "login", client, "login", {"phoneNumber": phoneNumber, "password": PASSWORD}, 200
+        )
+        if not loggedIn:
+            return
+        await recorder.call(
+            "changePassword",
+            client,
+            "changePassword",
+            {"oldPassword": PASSWORD, "newPassword": NEW_PASSWORD},
+            200,
+        )
+
+
+async def runScenario(databaseUrl: str, users: int, concurrency: int) -> Dict[str, Any]:
+    """Boot the app against databaseUrl and run the flow for every user"""
+    applyBenchmarkEnv(databaseUrl)
+    sms = FakeSMSTransport()
+    sms.install()
+
+    from app.main import createApp
+
+    app = createApp()
+    recorder = FlowRecorder()
+    runId = f"{uuid.uuid4().int % 90 + 10}"
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(index: int) -> None:
+        async with semaphore:
+            await runVirtualUser(app, index, runId, sms, recorder)
+
+    async with app.router.lifespan_context(app):
+        startTime = time.perf_counter()
+        await asyncio.gather(*(limited(index) for index in range(users)))
+        elapsed = time.perf_counter() - startTime
+
+    endpoints: Dict[str, Any] = {}
+    for name in ENDPOINTS:
+        summary = percentiles(recorder.latencies[name])
+        summary["errors"] = recorder.errors[name]
+        summary["throughput_rps"] = len(recorder.latencies[name]) / elapsed if elapsed else 0.0
+        endpoints[name] = summary
+    return {
+        "database": databaseUrl.split(":", 1)[0],
+        "users": users,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "flows_per_s": users / elapsed if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def findRegressions(
+    results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Compare p95 latency and throughput against a previous run"""
+    baselineByDatabase = {run["database"]: run for run in baseline.get("runs", [])}
+    regressions: List[str] = []
+    for run in results:
+        previous = baselineByDatabase.get(run["database"])
+        if not previous:
+            continue
+        for name, summary in run["endpoints"].items():
+            before = previous["endpoints"].get(name)
+            if not before or not summary.get("count"):
+                continue
+            if summary["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{run['database']} {name}: p95 {before['p95_ms']:.1f}ms -> {summary['p95_ms']:.1f}ms"
+                )
+            if summary["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{run['database']} {name}: throughput {before['throughput_rps']:.1f} -> "
+                    f"{summary['throughput_rps']:.1f} req/s"
+                )
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> int:
+    runs: List[Dict[str, Any]] = []
+    with contextlib.ExitStack() as stack:
+        databaseUrls: List[str] = []
+        if not args.skip_sqlite:
+            tmpDir = stack.enter_context(tempfile.TemporaryDirectory())
+            databaseUrls.append(f"sqlite+aiosqlite:///{os.path.join(tmpDir, 'bench.db')}")
+        if args.postgres == "pgserver":
+            databaseUrls.append(stack.enter_context(postgresStandIn()))
+        elif args.postgres:
+            databaseUrls.append(args.postgres)
+
+        for databaseUrl in databaseUrls:
+            runs.append(await runScenario(databaseUrl, args.users, args.concurrency))
+
+    for run in runs:
+        print(f"\n{run['database']}: {run['flows_per_s']:.1f} flows/s over {run['elapsed_s']:.1f}s")
+        printTable(
+            [{"endpoint": name, **summary} for name, summary in run["endpoints"].items()],
+            ["endpoint", "count", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"],
+        )
+
+    results = {"benchmark": "auth_flow", "runs": runs}
+    writeResults(args.output, results)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            regressions = findRegressions(runs, json.load(fh), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100, help="Flows to run")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--postgres",
+        default=os.environ.get("BENCH_POSTGRES_URL"),
+        help="Postgres URL, or 'pgserver' to start a local stand-in",
+    )
+    parser.add_argument("--skip-sqlite", action="store_true")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    sys.exit(asyncio.run(main(parser.parse_args())))
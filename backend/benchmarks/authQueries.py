@@ -0,0 +1,177 @@
+"""Database queries per authenticated request under load.
+
+Logs a set of users in, then hammers the authenticated endpoints concurrently
+and counts the SQL statements each request executes:
+
+* ``me``: served from the access-token claims; expected to run no queries.
+* ``changePassword``: loads the current user once, updates it and revokes
+  its other sessions.
+
+    python -m benchmarks.authQueries --users 20 --requests 10 --postgres pgserver
+
+Exits non-zero when a request runs more statements than --max-queries allows.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.common import (
+    FakeSMSTransport,
+    applyBenchmarkEnv,
+    percentiles,
+    postgresStandIn,
+    printTable,
+    writeResults,
+)
+
+PASSWORDS = ("benchmarkPassword1", "benchmarkPassword2")
+
+# Default upper bound on statements per request, by endpoint
+MAX_QUERIES = {"me": 0, "changePassword": 3}
+
+class QueryRecorder:
+    """Collects latency and statement counts per endpoint"""
+
+    def __init__(self, endpoints: List[str]) -> None:
+        self.latencies: Dict[str, List[float]] = {name: [] for name in endpoints}
+        self.queries: Dict[str, List[int]] = {name: [] for name in endpoints}
+        self.errors: Dict[str, int] = {name: 0 for name in endpoints}
+
+    async def call(
+        self, name: str, client: httpx.AsyncClient, method: str, path: str, body: Any = None
+    ) -> bool:
+        from app.core.queryStats import trackQueries
+
+        startTime = time.perf_counter()
+        with trackQueries() as stats:
+            response = await client.request(method, f"/api/v1/users/{path}", json=body)
+        self.latencies[name].append(time.perf_counter() - startTime)
+        self.queries[name].append(stats.count)
+        if response.status_code != 200:
+            self.errors[name] += 1
+            return False
+        return True
+
+
+async def runVirtualUser(
+    app: Any, index: int, runId: str, requests: int, sms: FakeSMSTransport, recorder: QueryRecorder
+) -> None:
+    """Log one user in, then issue authenticated requests with its cookies"""
+    phoneNumber = f"0{runId}{index:06d}"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="https://bench") as client:
+        await client.post(
+            "/api/v1/users/register",
+            json={"phoneNumber": phoneNumber, "fullName": f"Query {runId} {index}", "password": PASSWORDS[0]},
+        )
+        response = await client.post(
+            "/api/v1/users/login", json={"phoneNumber": phoneNumber, "password": PASSWORDS[0]}
+        )
+        if response.status_code != 200:
+            return
+
+        for step in range(requests):
+            await recorder.call("me", client, "GET", "me")
+            await recorder.call(
+                "changePassword",
+                client,
+                "POST",
+                "changePassword",
+                {"oldPassword": PASSWORDS[step % 2], "newPassword": PASSWORDS[(step + 1) % 2]},
+            )
+
+
+async def runScenario(databaseUrl: str, users: int, requests: int, concurrency: int) -> Dict[str, Any]:
+    # Cheap hashes so the run measures query counts rather than argon2
+    os.environ.setdefault("ARGON2_TIME_COST", "1")
+    os.environ.setdefault("ARGON2_MEMORY_COST", "8192")
+    applyBenchmarkEnv(databaseUrl)
+    from app.core.database import getDatabaseManager
+    from app.core.queryStats import installQueryStats
+    from app.main import createApp
+
+    sms = FakeSMSTransport()
+    sms.install()
+    app = createApp()
+    recorder = QueryRecorder(list(MAX_QUERIES))
+    runId = f"{uuid.uuid4().int % 90 + 10}"
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(index: int) -> None:
+        async with semaphore:
+            await runVirtualUser(app, index, runId, requests, sms, recorder)
+
+    async with app.router.lifespan_context(app):
+        installQueryStats(getDatabaseManager().asyncEngine)
+        startTime = time.perf_counter()
+        await asyncio.gather(*(limited(index) for index in range(users)))
+        elapsed = time.perf_counter() - startTime
+
+    endpoints: Dict[str, Any] = {}
+    for name in MAX_QUERIES:
+        counts = recorder.queries[name]
+        summary = percentiles(recorder.latencies[name])
+        summary["errors"] = recorder.errors[name]
+        summary["throughput_rps"] = len(counts) / elapsed if elapsed else 0.0
+        summary["queries_mean"] = sum(counts) / len(counts) if counts else 0.0
+        summary["queries_max"] = max(counts, default=0)
+        endpoints[name] = summary
+    return {
+        "database": databaseUrl.split(":", 1)[0],
+        "users": users,
+        "requests_per_user": requests,
+        "concurrency": concurrency,
+        "endpoints": endpoints,
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    runs: List[Dict[str, Any]] = []
+    with contextlib.ExitStack() as stack:
+        tmpDir = stack.enter_context(tempfile.TemporaryDirectory())
+        databaseUrls = [f"sqlite+aiosqlite:///{os.path.join(tmpDir, 'queries.db')}"]
+        if args.postgres == "pgserver":
+            databaseUrls.append(stack.enter_context(postgresStandIn()))
+        elif args.postgres:
+            databaseUrls.append(args.postgres)
+        for databaseUrl in databaseUrls:
+            runs.append(await runScenario(databaseUrl, args.users, args.requests, args.concurrency))
+
+    failures: List[str] = []
+    for run in runs:
+        print(f"\n{run['database']}")
+        printTable(
+            [{"endpoint": name, **summary} for name, summary in run["endpoints"].items()],
+            ["endpoint", "count", "errors", "queries_mean", "queries_max", "throughput_rps", "p50_ms", "p95_ms"],
+        )
+        for name, summary in run["endpoints"].items():
+            limit = MAX_QUERIES[name] if args.max_queries is None else args.max_queries
+            if summary["queries_max"] > limit:
+                failures.append(f"{run['database']} {name}: {summary['queries_max']} queries > {limit}")
+            if summary["errors"]:
+                failures.append(f"{run['database']} {name}: {summary['errors']} failed requests")
+
+    writeResults(args.output, {"benchmark": "auth_queries", "runs": runs})
+    for failure in failures:
+        print(f"FAILED {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=10, help="Requests per endpoint per user")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--postgres", default=os.environ.get("BENCH_POSTGRES_URL"))
+    parser.add_argument("--max-queries", type=int, help="Override the per-endpoint query limits")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    sys.exit(asyncio.run(main(parser.parse_args())))
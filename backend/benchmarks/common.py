@@ -0,0 +1,179 @@
+import contextlib
+import json
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+# Minimal settings so the app can boot without a .env file
+BENCHMARK_ENV: Dict[str, str] = {
+    "APP_NAME": "Vireakbo RC Store Benchmark",
+    "APP_VERSION": "bench",
+    "DEBUG": "false",
+    "DATABASE_AUTO_MIGRATE": "true",
+    "SECRET_KEY": "benchmark-secret-key",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "CORS_ORIGINS": '["*"]',
+    "CORS_CREDENTIALS": "true",
+    "CORS_METHODS": '["*"]',
+    "CORS_HEADERS": '["*"]',
+    "TWILIO_ACCOUNT_SID": "",
+    "TWILIO_AUTH_TOKEN": "",
+    "TWILIO_PHONE_NUMBER": "",
+    "SMS_SENDER_ID": "benchmark",
+}
+
+
+def benchmarkEnv(databaseUrl: str) -> Dict[str, str]:
+    """Environment for a benchmark run; explicit variables take precedence"""
+    env = dict(BENCHMARK_ENV)
+    env.update(os.environ)
+    env["DATABASE_URL"] = databaseUrl
+    return env
+
+
+def applyBenchmarkEnv(databaseUrl: str) -> None:
+    """Configure settings for an in-process benchmark run"""
+    from app.core.settings import getSettings
+
+    os.environ.update(benchmarkEnv(databaseUrl))
+    getSettings.reset()
+    resetAppSingletons()
+
+
+def measureCpu(fn: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    """Run fn repeatedly and report CPU and wall time per call in microseconds"""
+    fn()  # warm up caches and lazy imports
+    cpuStart = time.process_time()
+    wallStart = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    cpuElapsed = time.process_time() - cpuStart
+    wallElapsed = time.perf_counter() - wallStart
+    return {
+        "cpu_us_per_call": cpuElapsed / iterations * 1e6,
+        "wall_us_per_call": wallElapsed / iterations * 1e6,
+    }
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples (seconds) as milliseconds"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(fraction: float) -> float:
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return ordered[index] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def printTable(rows: List[Dict[str, Any]], columns: List[str]) -> None:
+    """Print result rows as an aligned text table"""
+    widths = {
+        column: max(len(column), *(len(_fmt(row.get(column))) for row in rows))
+        for column in columns
+    }
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(_fmt(row.get(column)).ljust(widths[column]) for column in columns))
+
+
+def writeResults(path: Optional[str], results: Dict[str, Any]) -> None:
+    """Write machine-readable results to a JSON file when a path is given"""
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2, default=str)
+
+
+def _fmt(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return "" if value is None else str(value)
+
+
+def resetAppSingletons() -> None:
+    """Drop process-wide singletons so the next boot uses fresh settings"""
+    from app.core.audit import getAuditLog
+    from app.core.database import getDatabaseManager
+    from app.core.health import getHealthMonitor
+    from app.core.orderArchive import getOrderArchiver
+    from app.core.revocation import getRevocationList
+    from app.core.scheduler import getScheduler
+    from app.core.security import getPwdContext
+    from app.core.sharedState import getSharedState
+    from app.core.shutdown import getShutdownManager
+    from app.provider.smsProvider import getSmsService
+    from app.utils.jwtHandler import getJwtHandler
+
+    for singleton in (
+        getAuditLog,
+        getDatabaseManager,
+        getHealthMonitor,
+        getOrderArchiver,
+        getPwdContext,
+        getRevocationList,
+        getScheduler,
+        getSharedState,
+        getShutdownManager,
+        getSmsService,
+        getJwtHandler,
+    ):
+        singleton.reset()
+
+
+class FakeSMSTransport:
+    """Records outgoing SMS instead of calling the provider"""
+
+    def __init__(self) -> None:
+        self.messages: Dict[str, List[str]] = {}
+
+    def install(self) -> None:
+        """Route the global SMS service through this transport"""
+        from app.provider.smsProvider import SMSService, getSmsService
+
+        transport = self
+
+        class _FakeSMSService(SMSService):
+            async def _deliver(self, phone: str, message: str) -> bool:
+                transport.messages.setdefault(phone, []).append(message)
+                return True
+
+        getSmsService.override(_FakeSMSService(apiKey="fake", apiSecret="fake"))
+
+    def lastOtp(self, phoneNumber: str) -> Optional[str]:
+        """Extract the six-digit code from the latest message to a number"""
+        from app.provider.smsProvider import SMSService
+
+        phone = SMSService._formatPhoneNumbers([phoneNumber])[0]
+        for message in reversed(self.messages.get(phone, [])):
+            for token in message.replace(".", " ").split():
+                if len(token) == 6 and token.isdigit():
+                    return token
+        return None
+
+
+@contextlib.contextmanager
+def postgresStandIn() -> Iterator[str]:
+    """Start a throwaway local Postgres (requires the pgserver package)"""
+    import tempfile
+
+    import pgserver
+
+    with tempfile.TemporaryDirectory() as dataDir:
+        server = pgserver.get_server(dataDir, cleanup_mode="stop")
+        try:
+            yield f"postgresql+asyncpg://postgres@/postgres?host={dataDir}"
+        finally:
+            server.cleanup()
@@ -0,0 +1,247 @@
+"""Health probes: readiness served from cache, and withdrawn before the drain.
+
+Starts the service the way production runs it (python -m app.serve:
+gunicorn with the draining uvicorn worker, one worker) and fires a burst of
+concurrent /health/ready and /health/live requests over HTTP, checking that
+none of them ran a database statement (the X-DB-Query-Count header, in debug
+mode); the dependencies only see the background probe rounds. Then sends
+SIGTERM with a request still in flight and samples the endpoints through
+each phase:
+
+    python -m benchmarks.healthProbes --requests 2000 --concurrency 50 --postgres pgserver
+
+Expected: during the readiness delay /health/ready answers 503 "draining"
+while API requests are still served; once draining starts API requests get
+503 and /health/live keeps answering 200; the in-flight request completes
+and the server exits cleanly. Exits non-zero on any mismatch.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.common import benchmarkEnv, percentiles, postgresStandIn, printTable, writeResults
+
+PROBE_INTERVAL_SECONDS = 0.2
+READINESS_DELAY_SECONDS = 1.0
+SERVER_START_TIMEOUT_SECONDS = 60
+API_PATH = "/api/v1/inventory/health-bench"
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def burst(
+    client: httpx.AsyncClient, path: str, requests: int, concurrency: int
+) -> Tuple[Dict[str, float], int, List[str]]:
+    """Latencies, total statements reported by the responses, and failures"""
+    from app.core.queryStats import QUERY_COUNT_HEADER
+
+    latencies: List[float] = []
+    failures: List[str] = []
+    statements = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal statements, remaining
+        while remaining > 0:
+            remaining -= 1
+            startTime = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - startTime)
+            statements += int(response.headers.get(QUERY_COUNT_HEADER, 0))
+            if response.status_code != 200:
+                failures.append(f"{path}: HTTP {response.status_code} {response.text[:200]}")
+
+    startTime = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    summary = percentiles(latencies)
+    summary["requests_per_s"] = requests / (time.perf_counter() - startTime)
+    return summary, statements, failures
+
+
+async def sample(client: httpx.AsyncClient) -> Dict[str, Any]:
+    ready = await client.get("/health/ready")
+    live = await client.get("/health/live")
+    api = await client.get(API_PATH)
+    return {
+        "ready": ready.status_code,
+        "ready_reason": ready.json()["reason"],
+        "live": live.status_code,
+        "api": api.status_code,
+    }
+
+
+def freePort() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def waitUntilReady(client: httpx.AsyncClient, server: subprocess.Popen) -> None:
+    deadline = time.monotonic() + SERVER_START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited during startup with code {server.returncode}")
+        with contextlib.suppress(httpx.TransportError):
+            if (await client.get("/health/ready")).status_code == 200:
+                return
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"server not ready after {SERVER_START_TIMEOUT_SECONDS}s")
+
+
+async def runScenario(
+    databaseUrl: str, requests: int, concurrency: int, logPath: str
+) -> Dict[str, Any]:
+    port = freePort()
+    env = benchmarkEnv(databaseUrl)
+    env.update(
+        {
+            # Debug mode turns on the query count headers
+            "DEBUG": "true",
+            "HEALTH_PROBE_INTERVAL_SECONDS": str(PROBE_INTERVAL_SECONDS),
+            "SHUTDOWN_READINESS_DELAY_SECONDS": str(READINESS_DELAY_SECONDS),
+            "WEB_CONCURRENCY": "1",
+            "HOST": "127.0.0.1",
+            "PORT": str(port),
+        }
+    )
+    failures: List[str] = []
+    paths: Dict[str, Any] = {}
+    phases: List[Dict[str, Any]] = []
+    with open(logPath, "wb") as log:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app.serve"],
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            limits=httpx.Limits(max_connections=concurrency + 5),
+        ) as client:
+            await waitUntilReady(client, server)
+
+            for path in ("/health/ready", "/health/live"):
+                summary, statements, pathFailures = await burst(
+                    client, path, requests, concurrency
+                )
+                paths[path] = {**summary, "db_statements": statements}
+                failures.extend(pathFailures[:5])
+                if statements:
+                    failures.append(f"{path} ran {statements} statements; probes must be cached")
+
+            phases.append({"phase": "serving", **await sample(client)})
+            # A request still uploading its body keeps the drain waiting
+            release = asyncio.Event()
+
+            async def slowBody() -> AsyncIterator[bytes]:
+                await release.wait()
+                yield b'{"phoneNumber": "012000000", "password": "wrongPassword1"}'
+
+            held = asyncio.create_task(
+                client.post(
+                    "/api/v1/users/login",
+                    content=slowBody(),
+                    headers={"content-type": "application/json"},
+                )
+            )
+            await asyncio.sleep(0.2)
+            server.send_signal(signal.SIGTERM)
+            signalledAt = time.monotonic()
+            await asyncio.sleep(READINESS_DELAY_SECONDS / 2)
+            phases.append({"phase": "readiness_delay", **await sample(client)})
+            await asyncio.sleep(READINESS_DELAY_SECONDS)
+            phases.append({"phase": "draining", **await sample(client)})
+            release.set()
+            heldStatus = (await held).status_code
+            if heldStatus == 503:
+                failures.append("in-flight request was refused during the drain")
+
+        exitCode = await asyncio.to_thread(server.wait, 30)
+        shutdownSeconds = time.monotonic() - signalledAt
+        if exitCode != 0:
+            failures.append(f"server exited with code {exitCode} after SIGTERM")
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.wait()
+
+    expected = {
+        "serving": {"ready": 200, "live": 200},
+        "readiness_delay": {"ready": 503, "live": 200, "ready_reason": "draining"},
+        "draining": {"ready": 503, "live": 200, "api": 503},
+    }
+    for phase in phases:
+        for key, value in expected[phase["phase"]].items():
+            if phase[key] != value:
+                failures.append(f"{phase['phase']}: {key} was {phase[key]}, expected {value}")
+    # Served, not refused: 404 for the unknown sku
+    if phases[1]["api"] == 503:
+        failures.append("readiness_delay: API request refused before draining started")
+
+    return {
+        "database": databaseUrl.split(":", 1)[0],
+        "paths": paths,
+        "phases": phases,
+        "held_status": heldStatus,
+        "shutdown_s": shutdownSeconds,
+        "failures": failures,
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    runs: List[Dict[str, Any]] = []
+    with contextlib.ExitStack() as stack:
+        tmpDir = stack.enter_context(tempfile.TemporaryDirectory())
+        databaseUrls = [f"sqlite+aiosqlite:///{os.path.join(tmpDir, 'health.db')}"]
+        if args.postgres == "pgserver":
+            databaseUrls.append(stack.enter_context(postgresStandIn()))
+        elif args.postgres:
+            databaseUrls.append(args.postgres)
+        for index, databaseUrl in enumerate(databaseUrls):
+            logPath = os.path.join(tmpDir, f"server{index}.log")
+            try:
+                runs.append(
+                    await runScenario(databaseUrl, args.requests, args.concurrency, logPath)
+                )
+            except Exception:
+                with open(logPath, encoding="utf-8", errors="replace") as fh:
+                    print(fh.read()[-4000:], file=sys.stderr)
+                raise
+
+    for run in runs:
+        print(
+            f"\n{run['database']} (in-flight request answered {run['held_status']}, "
+            f"exited {run['shutdown_s']:.2f}s after SIGTERM)"
+        )
+        printTable(
+            [{"path": path, **summary} for path, summary in run["paths"].items()],
+            ["path", "count", "requests_per_s", "p50_ms", "p99_ms", "db_statements"],
+        )
+        printTable(run["phases"], ["phase", "ready", "ready_reason", "live", "api"])
+
+    writeResults(args.output, {"benchmark": "health_probes", "runs": runs})
+    failures = [f"{run['database']} {failure}" for run in runs for failure in run["failures"]]
+    for failure in failures:
+        print(f"FAILED {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--postgres", default=os.environ.get("BENCH_POSTGRES_URL"))
+    parser.add_argument("--output", help="Write JSON results to this path")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,199 @@
+"""Checkout throughput and oversell on one hot SKU.
+
+Seeds one product and a pool of users, then runs thousands of concurrent
+reserve-then-checkout flows against that single SKU through
+``InventoryService``. A share of the buyers abandon their reservation;
+after the run the reservation sweeper expires those holds. The run fails
+if more units were sold than stocked, stock went negative, or the units
+sold, held and available do not add up to the initial stock.
+
+    python -m benchmarks.inventoryContention --checkouts 2000 --stock 500 --postgres pgserver
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from benchmarks.common import (
+    applyBenchmarkEnv,
+    percentiles,
+    postgresStandIn,
+    printTable,
+    writeResults,
+)
+
+
+async def seed(
+    databaseManager: Any, runId: str, users: int, stock: int, seed: int
+) -> List[int]:
+    from app.cli.generateData import generateData
+    from app.repository.inventoryRepo import InventoryRepository
+
+    result = await generateData(
+        databaseManager.asyncEngine, users=users, seed=seed, hashedPassword="unused"
+    )
+    async with databaseManager.asyncSessionMaker() as session:
+        await InventoryRepository(session).setStock(
+            f"bench-{runId}", f"Benchmark item {runId}", 1.5, stock
+        )
+    return list(range(result["firstUserId"], result["lastUserId"] + 1))
+
+
+async def runScenario(databaseUrl: str, args: argparse.Namespace) -> Dict[str, Any]:
+    os.environ["RESERVATION_TTL_SECONDS"] = str(args.ttl)
+    applyBenchmarkEnv(databaseUrl)
+    from app.core.database import getDatabaseManager
+    from app.models.inventoryModel import StockReservation
+    from app.models.orderModel import Order
+    from app.services.inventoryService import InventoryService, expireReservations
+
+    databaseManager = getDatabaseManager()
+    await databaseManager.checkSchemaVersion(autoMigrate=True)
+    sessionMaker = databaseManager.asyncSessionMaker
+
+    runId = f"{uuid.uuid4().int % 90 + 10}"
+    sku = f"bench-{runId}"
+    userIds = await seed(databaseManager, runId, args.users, args.stock, args.seed)
+    chooser = random.Random(args.seed)
+    plans = [
+        (chooser.choice(userIds), chooser.random() < args.abandon_rate)
+        for _ in range(args.checkouts)
+    ]
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    outcomes: Dict[str, int] = {
+        "sold": 0, "abandoned": 0, "expired": 0, "out_of_stock": 0, "error": 0
+    }
+
+    async def buy(userId: int, abandon: bool) -> None:
+        async with semaphore:
+            startTime = time.perf_counter()
+            try:
+                async with sessionMaker() as session:
+                    service = InventoryService(session)
+                    try:
+                        reservation = await service.reserve(sku, userId, 1)
+                    except HTTPException as e:
+                        outcomes["out_of_stock" if e.status_code == 409 else "error"] += 1
+                        return
+                    if abandon:
+                        outcomes["abandoned"] += 1
+                        return
+                    try:
+                        await service.checkout(reservation.Id, userId)
+                        outcomes["sold"] += 1
+                    except HTTPException as e:
+                        # The hold outlived its TTL while queued behind other buyers
+                        outcomes["expired" if e.status_code == 409 else "error"] += 1
+            finally:
+                latencies.append(time.perf_counter() - startTime)
+
+    startTime = time.perf_counter()
+    await asyncio.gather(*(buy(userId, abandon) for userId, abandon in plans))
+    elapsed = time.perf_counter() - startTime
+
+    async def available() -> int:
+        async with sessionMaker() as session:
+            return (await InventoryService(session).getStock(sku)).available
+
+    availableAfterRun = await available()
+    await asyncio.sleep(args.ttl)
+    await expireReservations(sessionMaker)
+    availableAfterSweep = await available()
+
+    async with sessionMaker() as session:
+        ordered = await session.scalar(
+            select(func.coalesce(func.sum(Order.quantity), 0)).where(
+                Order.productName == f"Benchmark item {runId}"
+            )
+        )
+        stillHeld = await session.scalar(
+            select(func.count()).where(
+                StockReservation.sku == sku, StockReservation.status == "held"
+            )
+        )
+    await databaseManager.close()
+
+    summary = percentiles(latencies)
+    return {
+        "database": databaseUrl.split(":", 1)[0],
+        "checkouts": args.checkouts,
+        "stock": args.stock,
+        "concurrency": args.concurrency,
+        **outcomes,
+        "orders_units": ordered,
+        "available_after_run": availableAfterRun,
+        "available_after_sweep": availableAfterSweep,
+        "still_held": stillHeld,
+        "throughput_rps": args.checkouts / elapsed if elapsed else 0.0,
+        "p50_ms": summary.get("p50_ms"),
+        "p99_ms": summary.get("p99_ms"),
+    }
+
+
+def checkRun(run: Dict[str, Any], initialStock: int) -> List[str]:
+    failures: List[str] = []
+    name = run["database"]
+    if run["orders_units"] != run["sold"]:
+        failures.append(f"{name}: {run['orders_units']} units ordered, {run['sold']} checkouts succeeded")
+    if run["sold"] > initialStock:
+        failures.append(f"{name}: oversold {run['sold']} of {initialStock}")
+    if min(run["available_after_run"], run["available_after_sweep"]) < 0:
+        failures.append(f"{name}: stock went negative")
+    held = run["abandoned"] + run["expired"]
+    if run["available_after_run"] + run["sold"] + held != initialStock:
+        failures.append(f"{name}: sold + held + available != {initialStock} before sweep")
+    if run["still_held"] or run["available_after_sweep"] + run["sold"] != initialStock:
+        failures.append(f"{name}: sweeper left {run['still_held']} holds or lost stock")
+    if run["error"]:
+        failures.append(f"{name}: {run['error']} failed checkouts")
+    return failures
+
+
+async def main(args: argparse.Namespace) -> int:
+    runs: List[Dict[str, Any]] = []
+    with contextlib.ExitStack() as stack:
+        tmpDir = stack.enter_context(tempfile.TemporaryDirectory())
+        databaseUrls = [f"sqlite+aiosqlite:///{os.path.join(tmpDir, 'inventory.db')}"]
+        if args.postgres == "pgserver":
+            databaseUrls.append(stack.enter_context(postgresStandIn()))
+        elif args.postgres:
+            databaseUrls.append(args.postgres)
+        for databaseUrl in databaseUrls:
+            runs.append(await runScenario(databaseUrl, args))
+
+    printTable(
+        runs,
+        ["database", "checkouts", "stock", "sold", "abandoned", "expired", "out_of_stock", "error",
+         "available_after_run", "available_after_sweep", "throughput_rps", "p50_ms", "p99_ms"],
+    )
+    writeResults(args.output, {"benchmark": "inventory_contention", "runs": runs})
+    failures = [failure for run in runs for failure in checkRun(run, args.stock)]
+    for failure in failures:
+        print(f"FAILED {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checkouts", type=int, default=2000)
+    parser.add_argument("--stock", type=int, default=500, help="Initial units of the SKU")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--abandon-rate", type=float, default=0.1, help="Share of buyers that never check out")
+    parser.add_argument("--ttl", type=float, default=2.0, help="Reservation TTL seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--postgres", default=os.environ.get("BENCH_POSTGRES_URL"))
+    parser.add_argument("--output", help="Write JSON results to this path")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,140 @@
+"""Parallel OTP verification benchmark and correctness check.
+
+For each round a fresh user and OTP are created, then many verifications for
+the same phone number run concurrently, each in its own session:
+
+* ``race``: every request sends the correct code; exactly one may succeed.
+* ``bruteforce``: wrong codes in parallel, then the correct code; the OTP must
+  be invalidated after OTP_MAX_ATTEMPTS failures and the correct code refused.
+
+    python -m benchmarks.otpVerify --rounds 20 --parallel 50 --postgres pgserver
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from fastapi import HTTPException
+
+from benchmarks.common import (
+    applyBenchmarkEnv,
+    percentiles,
+    postgresStandIn,
+    printTable,
+    writeResults,
+)
+
+
+async def verifyOnce(sessionMaker: Any, phoneNumber: str, otpCode: str, latencies: List[float]) -> bool:
+    from app.schemas.userSchema import VerifyOtpSchema
+    from app.services.userService import UserService
+
+    async with sessionMaker() as session:
+        startTime = time.perf_counter()
+        try:
+            await UserService(session).verifyUserOtp(
+                VerifyOtpSchema(phoneNumber=phoneNumber, otpCode=otpCode)
+            )
+            return True
+        except HTTPException as e:
+            if e.status_code != 400:
+                raise
+            return False
+        finally:
+            latencies.append(time.perf_counter() - startTime)
+
+
+async def seedOtp(sessionMaker: Any, phoneNumber: str, otpCode: str) -> None:
+    from app.models.otpModel import OTP
+    from app.models.userModel import User
+    from app.utils.phoneNumber import normalizePhoneNumber
+
+    # Stored numbers are canonical, as if they had come through the API schemas
+    phoneNumber = normalizePhoneNumber(phoneNumber)
+    async with sessionMaker() as session:
+        session.add(User(fullName=f"OTP {phoneNumber}", phoneNumber=phoneNumber, hashedPassword="x"))
+        session.add(OTP(phoneNumber=phoneNumber, otpCode=otpCode))
+        await session.commit()
+
+
+async def runScenarios(databaseUrl: str, rounds: int, parallel: int) -> Dict[str, Any]:
+    applyBenchmarkEnv(databaseUrl)
+    from app.core.database import getDatabaseManager
+    from app.core.settings import getSettings
+
+    databaseManager = getDatabaseManager()
+    await databaseManager.checkSchemaVersion(autoMigrate=True)
+    sessionMaker = databaseManager.asyncSessionMaker
+    maxAttempts = getSettings.OTP_MAX_ATTEMPTS
+    runTag = f"{int(time.time()) % 10000:04d}"
+
+    latencies: List[float] = []
+    violations: List[str] = []
+    startTime = time.perf_counter()
+    for index in range(rounds):
+        phoneNumber = f"09{runTag}{index:04d}"
+        await seedOtp(sessionMaker, phoneNumber, "123456")
+        outcomes = await asyncio.gather(
+            *(verifyOnce(sessionMaker, phoneNumber, "123456", latencies) for _ in range(parallel))
+        )
+        if sum(outcomes) != 1:
+            violations.append(f"race {phoneNumber}: {sum(outcomes)} successes")
+
+        phoneNumber = f"08{runTag}{index:04d}"
+        await seedOtp(sessionMaker, phoneNumber, "123456")
+        wrong = await asyncio.gather(
+            *(verifyOnce(sessionMaker, phoneNumber, f"{code:06d}", latencies) for code in range(parallel))
+        )
+        if any(wrong):
+            violations.append(f"bruteforce {phoneNumber}: wrong code accepted")
+        if parallel >= maxAttempts and await verifyOnce(sessionMaker, phoneNumber, "123456", latencies):
+            violations.append(f"bruteforce {phoneNumber}: accepted after {parallel} failures")
+    elapsed = time.perf_counter() - startTime
+    await databaseManager.close()
+
+    summary = percentiles(latencies)
+    summary["throughput_rps"] = len(latencies) / elapsed if elapsed else 0.0
+    return {
+        "database": databaseUrl.split(":", 1)[0],
+        "rounds": rounds,
+        "parallel": parallel,
+        "violations": violations,
+        "verify": summary,
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    runs: List[Dict[str, Any]] = []
+    with contextlib.ExitStack() as stack:
+        tmpDir = stack.enter_context(tempfile.TemporaryDirectory())
+        databaseUrls = [f"sqlite+aiosqlite:///{os.path.join(tmpDir, 'otp.db')}"]
+        if args.postgres == "pgserver":
+            databaseUrls.append(stack.enter_context(postgresStandIn()))
+        elif args.postgres:
+            databaseUrls.append(args.postgres)
+        for databaseUrl in databaseUrls:
+            runs.append(await runScenarios(databaseUrl, args.rounds, args.parallel))
+
+    printTable(
+        [{"database": run["database"], "violations": len(run["violations"]), **run["verify"]} for run in runs],
+        ["database", "violations", "count", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"],
+    )
+    writeResults(args.output, {"benchmark": "otp_verify", "runs": runs})
+    failed = [violation for run in runs for violation in run["violations"]]
+    for violation in failed:
+        print(f"VIOLATION {violation}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--parallel", type=int, default=20)
+    parser.add_argument("--postgres", default=os.environ.get("BENCH_POSTGRES_URL"))
+    parser.add_argument("--output", help="Write JSON results to this path")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,270 @@
+"""Per-endpoint query budgets and N+1 detection for the user, order and inventory routes.
+
+Walks one user at a time through the whole API (register, OTP, login,
+session refresh, password flows, stock reservations, checkout and order
+history) with the app in debug mode, and checks every request against
+its statement budget with ``app.core.queryStats.queryBudget``. A request
+that runs any statement more than once is flagged as a likely N+1. The
+X-DB-Query-Count header is compared with the independently tracked count.
+
+    python -m benchmarks.queryBudgets --users 3 --orders 5 --postgres pgserver
+
+Before the API walk the detector checks itself: lazy-loading ``Order.users``
+for a page of orders must be reported as repeated statements.
+
+Exits non-zero when any endpoint exceeds its budget or repeats a statement.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.common import (
+    FakeSMSTransport,
+    applyBenchmarkEnv,
+    postgresStandIn,
+    printTable,
+    writeResults,
+)
+
+PASSWORDS = ("benchmarkPassword1", "benchmarkPassword2")
+
+# Maximum statements per request, by endpoint
+BUDGETS = {
+    "register": 5,
+    "verifyOtp": 2,
+    "login": 2,
+    "me": 0,
+    "refresh": 2,
+    "changePassword": 3,
+    "getStock": 1,
+    "reserve": 2,
+    "checkout": 4,
+    "release": 2,
+    "orders": 2,
+    "ordersWithArchive": 3,
+    "logout": 1,
+    "forgotPassword": 1,
+    "resetPassword": 3,
+}
+
+# How many times one statement may run within a single request
+MAX_REPEATS = 1
+
+
+class BudgetRecorder:
+    """Runs requests under their budgets and collects counts and violations"""
+
+    def __init__(self) -> None:
+        self.queries: Dict[str, List[int]] = {name: [] for name in BUDGETS}
+        self.failures: List[str] = []
+
+    async def call(
+        self,
+        name: str,
+        client: httpx.AsyncClient,
+        method: str,
+        path: str,
+        body: Any = None,
+        expectStatus: Tuple[int, ...] = (200, 201),
+    ) -> Optional[httpx.Response]:
+        from app.core.queryStats import QUERY_COUNT_HEADER, QueryBudgetExceeded, queryBudget
+
+        response = None
+        try:
+            with queryBudget(BUDGETS[name], MAX_REPEATS, label=name) as stats:
+                response = await client.request(method, path, json=body)
+        except QueryBudgetExceeded as e:
+            self.failures.append(str(e))
+        self.queries[name].append(stats.count)
+        if response is None:
+            return None
+        if response.status_code not in expectStatus:
+            self.failures.append(f"{name}: HTTP {response.status_code} {response.text[:200]}")
+        headerCount = response.headers.get(QUERY_COUNT_HEADER)
+        if headerCount is None or int(headerCount) != stats.count:
+            self.failures.append(f"{name}: header reports {headerCount}, tracked {stats.count}")
+        return response
+
+
+async def checkDetector(sessionMaker: Any, runId: str) -> Optional[str]:
+    """Lazy-load Order.users for orders of different users; must be flagged"""
+    from sqlalchemy import select
+
+    from app.core.queryStats import QueryBudgetExceeded, queryBudget
+    from app.models.orderModel import Order
+    from app.models.userModel import User
+
+    async with sessionMaker() as session:
+        users = [
+            User(fullName=f"Lazy {runId} {index}", phoneNumber=f"0{runId}9{index:05d}", hashedPassword="unused")
+            for index in range(3)
+        ]
+        session.add_all(users)
+        await session.commit()
+        userIds = [user.Id for user in users]
+
+    async with sessionMaker() as session:
+        for userId in userIds:
+            session.add(
+                Order(userId=userId, productName="lazy", quantity=1, pricePerUnit=1.0,
+                      totalPrice=1.0, orderedAt=datetime.now(timezone.utc))
+            )
+        await session.commit()
+
+    async with sessionMaker() as session:
+        try:
+            with queryBudget(10, MAX_REPEATS, label="lazyLoad"):
+                orders = (
+                    await session.scalars(select(Order).where(Order.userId.in_(userIds)))
+                ).all()
+                await session.run_sync(lambda _: [order.users.fullName for order in orders])
+        except QueryBudgetExceeded:
+            return None
+    return "detector did not flag one lazy load per order"
+
+
+async def walkUser(
+    app: Any, index: int, runId: str, sku: str, orders: int, sms: FakeSMSTransport, recorder: BudgetRecorder
+) -> None:
+    phoneNumber = f"0{runId}{index:06d}"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="https://bench") as client:
+        users = "/api/v1/users"
+        await recorder.call(
+            "register", client, "POST", f"{users}/register",
+            {"phoneNumber": phoneNumber, "fullName": f"Budget {runId} {index}", "password": PASSWORDS[0]},
+        )
+        await recorder.call(
+            "verifyOtp", client, "POST", f"{users}/verifyOtp",
+            {"phoneNumber": phoneNumber, "otpCode": sms.lastOtp(phoneNumber) or "000000"},
+        )
+        await recorder.call(
+            "login", client, "POST", f"{users}/login",
+            {"phoneNumber": phoneNumber, "password": PASSWORDS[0]},
+        )
+        await recorder.call("me", client, "GET", f"{users}/me")
+        await recorder.call("refresh", client, "POST", f"{users}/refresh")
+        await recorder.call(
+            "changePassword", client, "POST", f"{users}/changePassword",
+            {"oldPassword": PASSWORDS[0], "newPassword": PASSWORDS[1]},
+        )
+
+        inventory = "/api/v1/inventory"
+        await recorder.call("getStock", client, "GET", f"{inventory}/{sku}")
+        for _ in range(orders):
+            response = await recorder.call(
+                "reserve", client, "POST", f"{inventory}/{sku}/reservations", {"quantity": 1}
+            )
+            if response is not None and response.status_code == 201:
+                await recorder.call(
+                    "checkout", client, "POST",
+                    f"{inventory}/reservations/{response.json()['Id']}/checkout",
+                )
+        response = await recorder.call(
+            "reserve", client, "POST", f"{inventory}/{sku}/reservations", {"quantity": 1}
+        )
+        if response is not None and response.status_code == 201:
+            await recorder.call(
+                "release", client, "DELETE", f"{inventory}/reservations/{response.json()['Id']}"
+            )
+
+        await recorder.call("orders", client, "GET", "/api/v1/orders")
+        await recorder.call("ordersWithArchive", client, "GET", "/api/v1/orders?includeArchived=true")
+        await recorder.call("logout", client, "POST", f"{users}/logout")
+        await recorder.call(
+            "forgotPassword", client, "POST", f"{users}/forgotPassword", {"phoneNumber": phoneNumber}
+        )
+        await recorder.call(
+            "resetPassword", client, "POST", f"{users}/resetPassword",
+            {"phoneNumber": phoneNumber, "newPassword": PASSWORDS[0]},
+        )
+
+
+async def runScenario(databaseUrl: str, users: int, orders: int) -> Dict[str, Any]:
+    # Cheap hashes; debug mode turns on the query count headers
+    os.environ.setdefault("ARGON2_TIME_COST", "1")
+    os.environ.setdefault("ARGON2_MEMORY_COST", "8192")
+    os.environ["DEBUG"] = "true"
+    applyBenchmarkEnv(databaseUrl)
+    from app.core.database import getDatabaseManager
+    from app.main import createApp
+    from app.repository.inventoryRepo import InventoryRepository
+
+    sms = FakeSMSTransport()
+    sms.install()
+    app = createApp()
+    recorder = BudgetRecorder()
+    runId = f"{uuid.uuid4().int % 90 + 10}"
+    sku = f"budget-{runId}"
+
+    async with app.router.lifespan_context(app):
+        sessionMaker = getDatabaseManager().asyncSessionMaker
+        detectorFailure = await checkDetector(sessionMaker, runId)
+        if detectorFailure:
+            recorder.failures.append(detectorFailure)
+        async with sessionMaker() as session:
+            await InventoryRepository(session).setStock(sku, "Budget item", 2.0, users * (orders + 1))
+        # Sequential so every request is counted alone
+        for index in range(users):
+            await walkUser(app, index, runId, sku, orders, sms, recorder)
+
+    endpoints = {
+        name: {
+            "budget": BUDGETS[name],
+            "requests": len(counts),
+            "queries_max": max(counts, default=0),
+            "queries_mean": sum(counts) / len(counts) if counts else 0.0,
+        }
+        for name, counts in recorder.queries.items()
+    }
+    return {
+        "database": databaseUrl.split(":", 1)[0],
+        "users": users,
+        "orders_per_user": orders,
+        "endpoints": endpoints,
+        "failures": recorder.failures,
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    runs: List[Dict[str, Any]] = []
+    with contextlib.ExitStack() as stack:
+        tmpDir = stack.enter_context(tempfile.TemporaryDirectory())
+        databaseUrls = [f"sqlite+aiosqlite:///{os.path.join(tmpDir, 'budgets.db')}"]
+        if args.postgres == "pgserver":
+            databaseUrls.append(stack.enter_context(postgresStandIn()))
+        elif args.postgres:
+            databaseUrls.append(args.postgres)
+        for databaseUrl in databaseUrls:
+            runs.append(await runScenario(databaseUrl, args.users, args.orders))
+
+    for run in runs:
+        print(f"\n{run['database']}")
+        printTable(
+            [{"endpoint": name, **summary} for name, summary in run["endpoints"].items()],
+            ["endpoint", "requests", "budget", "queries_max", "queries_mean"],
+        )
+
+    writeResults(args.output, {"benchmark": "query_budgets", "runs": runs})
+    failures = [f"{run['database']} {failure}" for run in runs for failure in run["failures"]]
+    for failure in failures:
+        print(f"FAILED {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--orders", type=int, default=5, help="Checkouts per user before reading history")
+    parser.add_argument("--postgres", default=os.environ.get("BENCH_POSTGRES_URL"))
+    parser.add_argument("--output", help="Write JSON results to this path")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,150 @@
+"""Scheduler leases: every run on exactly one of several workers, timeouts, no overlap.
+
+Starts --workers schedulers, each with its own engine on the same database
+as separate uvicorn workers would have, all registering the same jobs:
+
+    tick   every second; records which worker ran each run time
+    slow   every 2s, takes 3s (timeout 5s); must never overlap itself
+    hang   every 2s, sleeps past its 1s timeout; every run must time out
+
+    python -m benchmarks.schedulerLeases --workers 4 --seconds 10 --postgres pgserver
+
+Exits non-zero when a tick run time ran twice or not at all, slow runs
+overlapped, or a hang run did not end as a timeout.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.common import applyBenchmarkEnv, postgresStandIn, printTable, writeResults
+
+JOBS = ("tick", "slow", "hang")
+
+
+async def runScenario(databaseUrl: str, workers: int, seconds: float) -> Dict[str, Any]:
+    applyBenchmarkEnv(databaseUrl)
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.core.database import getDatabaseManager
+    from app.core.scheduler import Scheduler
+    from app.core.sharedState import DatabaseStateBackend
+
+    databaseManager = getDatabaseManager()
+    await databaseManager.checkSchemaVersion(autoMigrate=True)
+
+    ticks: List[Tuple[datetime, int]] = []
+    slowRuns: List[Tuple[float, float]] = []
+    engines = [create_async_engine(databaseUrl) for _ in range(workers)]
+    schedulers: List[Scheduler] = []
+    for index, engine in enumerate(engines):
+        scheduler = Scheduler(DatabaseStateBackend(lambda engine=engine: engine))
+        scheduler.workerId = f"bench:{index}"
+
+        async def tick(index: int = index) -> None:
+            ticks.append((datetime.now(timezone.utc).replace(microsecond=0), index))
+
+        async def slow() -> None:
+            startTime = time.monotonic()
+            await asyncio.sleep(3)
+            slowRuns.append((startTime, time.monotonic()))
+
+        async def hang() -> None:
+            await asyncio.sleep(60)
+
+        scheduler.interval("tick", 1, tick, timeoutSeconds=5, jitterSeconds=0.2)
+        scheduler.interval("slow", 2, slow, timeoutSeconds=5, jitterSeconds=0.2)
+        scheduler.interval("hang", 2, hang, timeoutSeconds=1, jitterSeconds=0.2)
+        schedulers.append(scheduler)
+
+    def outcomeCounts() -> Dict[str, Dict[str, int]]:
+        runs = schedulers[0]._runs
+        return {
+            job: {
+                outcome: int(runs.value(job=job, outcome=outcome))
+                for outcome in ("success", "failure", "timeout", "skipped")
+            }
+            for job in JOBS
+        }
+
+    # The metrics registry is process-wide; count only this scenario's runs
+    before = outcomeCounts()
+    tasks = [asyncio.create_task(scheduler.run()) for scheduler in schedulers]
+    await asyncio.sleep(seconds)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for engine in engines:
+        await engine.dispose()
+    await databaseManager.close()
+
+    failures: List[str] = []
+    perSlot = Counter(slot for slot, _ in ticks)
+    duplicates = sorted(slot.isoformat() for slot, count in perSlot.items() if count > 1)
+    if duplicates:
+        failures.append(f"tick ran more than once at {duplicates[:5]}")
+    if perSlot:
+        first, last = min(perSlot), max(perSlot)
+        expected = int((last - first).total_seconds()) + 1
+        if len(perSlot) < expected:
+            failures.append(f"tick missed {expected - len(perSlot)} of {expected} run times")
+    slowRuns.sort()
+    overlaps = sum(1 for previous, current in zip(slowRuns, slowRuns[1:]) if current[0] < previous[1])
+    if overlaps:
+        failures.append(f"slow overlapped itself {overlaps} times")
+
+    outcomes = {
+        job: {outcome: count - before[job][outcome] for outcome, count in counts.items()}
+        for job, counts in outcomeCounts().items()
+    }
+    if outcomes["hang"]["success"] or not outcomes["hang"]["timeout"]:
+        failures.append(f"hang outcomes {outcomes['hang']}, expected only timeouts")
+    return {
+        "database": databaseUrl.split(":", 1)[0],
+        "workers": workers,
+        "tick_runs_by_worker": dict(sorted(Counter(index for _, index in ticks).items())),
+        "outcomes": outcomes,
+        "failures": failures,
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    runs: List[Dict[str, Any]] = []
+    with contextlib.ExitStack() as stack:
+        tmpDir = stack.enter_context(tempfile.TemporaryDirectory())
+        databaseUrls = [f"sqlite+aiosqlite:///{os.path.join(tmpDir, 'scheduler.db')}"]
+        if args.postgres == "pgserver":
+            databaseUrls.append(stack.enter_context(postgresStandIn()))
+        elif args.postgres:
+            databaseUrls.append(args.postgres)
+        for databaseUrl in databaseUrls:
+            runs.append(await runScenario(databaseUrl, args.workers, args.seconds))
+
+    for run in runs:
+        print(f"\n{run['database']} ({run['workers']} workers), tick runs by worker {run['tick_runs_by_worker']}")
+        printTable(
+            [{"job": job, **outcomes} for job, outcomes in run["outcomes"].items()],
+            ["job", "success", "failure", "timeout", "skipped"],
+        )
+
+    writeResults(args.output, {"benchmark": "scheduler_leases", "runs": runs})
+    failures = [f"{run['database']} {failure}" for run in runs for failure in run["failures"]]
+    for failure in failures:
+        print(f"FAILED {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--postgres", default=os.environ.get("BENCH_POSTGRES_URL"))
+    parser.add_argument("--output", help="Write JSON results to this path")
+    sys.exit(asyncio.run(main(parser.parse_args())))
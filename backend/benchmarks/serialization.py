@@ -0,0 +1,175 @@
+"""Serialization CPU and bytes-on-the-wire benchmark.
+
+Calls the real order history route (GET /api/v1/orders) through FastAPI's
+request handling once per JSON_RESPONSE_BACKEND, with the database and auth
+dependencies replaced so only routing, validation and serialization are
+measured. "pydantic" is FastAPI without a response class, which serializes
+the response model straight to bytes; "orjson" and "json" set one. Also
+reports gzip/brotli compressed sizes of the body.
+
+    python -m benchmarks.serialization --iterations 2000 --output serialization.json
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI
+
+from app.core.compression import brotli, compressBody
+from app.core.responses import getDefaultResponseClass, orjson
+from app.schemas.orderSchema import OrderHistoryResponseSchema, OrderResponseSchema
+from benchmarks.common import applyBenchmarkEnv, measureCpu, printTable, writeResults
+
+ROUNDS = 5
+
+
+def buildOrderHistory(count: int) -> OrderHistoryResponseSchema:
+    """Build an order-history payload with count orders"""
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    orders = [
+        OrderResponseSchema(
+            Id=index + 1,
+            userId=42,
+            productName=f"RC Crawler 1:{10 + index % 14} Model {index}",
+            quantity=1 + index % 3,
+            pricePerUnit=129.99 + index % 50,
+            totalPrice=(129.99 + index % 50) * (1 + index % 3),
+            orderedAt=base + timedelta(hours=index),
+        )
+        for index in range(count)
+    ]
+    return OrderHistoryResponseSchema(orders=orders, total=count)
+
+
+def buildApp(backend: str) -> FastAPI:
+    """The order routes under the app's prefix, with the given JSON backend"""
+    from app.api.dependency import getAsyncSession, getCurrentTokenData
+    from app.api.v1.orderRoute import orderRoutes
+    from app.utils.jwtHandler import TokenData
+
+    app = FastAPI(default_response_class=getDefaultResponseClass(backend))
+    app.include_router(orderRoutes, prefix="/api/v1/orders")
+    tokenData = TokenData(
+        userId="42",
+        phoneNumber="0123456789",
+        fullName="Bench User",
+        expiresAt=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+
+    async def noSession() -> Any:
+        yield None
+
+    app.dependency_overrides[getCurrentTokenData] = lambda: tokenData
+    app.dependency_overrides[getAsyncSession] = noSession
+    return app
+
+
+async def callRoute(app: FastAPI) -> bytes:
+    """Run one GET /api/v1/orders through the ASGI app and return the body"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/orders",
+        "raw_path": b"/api/v1/orders",
+        "root_path": "",
+        "query_string": b"limit=1000",
+        "headers": [],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    chunks: List[bytes] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"Order history route answered {message['status']}")
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+
+async def cpuPerCall(app: FastAPI, iterations: int) -> float:
+    """CPU microseconds per route call"""
+    cpuStart = time.process_time()
+    for _ in range(iterations):
+        await callRoute(app)
+    return (time.process_time() - cpuStart) / iterations * 1e6
+
+
+async def benchmarkPayload(
+    name: str, payload: OrderHistoryResponseSchema, iterations: int
+) -> List[Dict[str, Any]]:
+    """Measure the route with every JSON backend for a payload"""
+    from app.services.orderService import OrderService
+
+    async def getHistory(self: Any, *args: Any, **kwargs: Any) -> OrderHistoryResponseSchema:
+        return payload
+
+    OrderService.getHistory = getHistory  # type: ignore[method-assign]
+
+    backends = ["pydantic", "json"]
+    if orjson is not None:
+        backends.append("orjson")
+    apps = {backend: buildApp(backend) for backend in backends}
+    bodies = {backend: await callRoute(app) for backend, app in apps.items()}
+
+    # Interleave the backends so drift in machine load hits them all alike
+    samples: Dict[str, List[float]] = {backend: [] for backend in backends}
+    for _ in range(ROUNDS):
+        for backend, app in apps.items():
+            samples[backend].append(await cpuPerCall(app, iterations))
+
+    rows: List[Dict[str, Any]] = []
+    for backend in backends:
+        body = bodies[backend]
+        row: Dict[str, Optional[Any]] = {
+            "payload": name,
+            "backend": backend,
+            "route_cpu_us": statistics.median(samples[backend]),
+            "bytes": len(body),
+            "gzip_bytes": len(compressBody(body, "gzip", 6, 4)),
+            "br_bytes": len(compressBody(body, "br", 6, 4)) if brotli else None,
+        }
+        row["gzip_cpu_us"] = measureCpu(
+            lambda: compressBody(body, "gzip", 6, 4), max(1, iterations // 10)
+        )["cpu_us_per_call"]
+        if brotli:
+            row["br_cpu_us"] = measureCpu(
+                lambda: compressBody(body, "br", 6, 4), max(1, iterations // 10)
+            )["cpu_us_per_call"]
+        rows.append(row)
+    return rows
+
+
+async def main(args: argparse.Namespace) -> None:
+    applyBenchmarkEnv("sqlite+aiosqlite:///:memory:")
+    rows: List[Dict[str, Any]] = []
+    for count in (1, 10, 100, 1000):
+        iterations = max(5, args.iterations // max(1, count // 5) // ROUNDS)
+        rows.extend(
+            await benchmarkPayload(f"orders[{count}]", buildOrderHistory(count), iterations)
+        )
+
+    printTable(
+        rows,
+        ["payload", "backend", "route_cpu_us", "bytes", "gzip_bytes", "br_bytes", "gzip_cpu_us", "br_cpu_us"],
+    )
+    writeResults(args.output, {"benchmark": "serialization", "results": rows})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,108 @@
+"""SMS send latency and delivery while the primary provider degrades.
+
+Drives ``SMSService`` with two local fake providers through four phases:
+healthy, primary hanging, primary erroring, primary recovered. The
+``single`` setup is the old behaviour (one provider, long timeout); the
+``failover`` setup adds a secondary provider, the per-attempt timeout and
+circuit breakers.
+
+    python -m benchmarks.smsFailover --messages 100 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.common import applyBenchmarkEnv, percentiles, printTable, writeResults
+
+# (phase, primary latency seconds, primary error rate)
+PHASES = (
+    ("healthy", 0.02, 0.0),
+    ("primary_hang", 2.0, 0.0),
+    ("primary_errors", 0.02, 1.0),
+    ("recovered", 0.02, 0.0),
+)
+
+
+async def runPhase(service: Any, messages: int, concurrency: int) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    delivered = 0
+
+    async def sendOne(index: int) -> None:
+        nonlocal delivered
+        async with semaphore:
+            startTime = time.perf_counter()
+            if await service.sendSms(f"012{index:06d}", "benchmark"):
+                delivered += 1
+            latencies.append(time.perf_counter() - startTime)
+
+    startTime = time.perf_counter()
+    await asyncio.gather(*(sendOne(index) for index in range(messages)))
+    summary = percentiles(latencies)
+    summary["elapsed_s"] = time.perf_counter() - startTime
+    summary["delivered_pct"] = 100.0 * delivered / messages
+    return summary
+
+
+async def runSetup(name: str, messages: int, concurrency: int, resetSeconds: float) -> List[Dict[str, Any]]:
+    from app.provider.smsBackends import FakeSmsBackend
+    from app.provider.smsProvider import SMSService
+
+    primary = FakeSmsBackend("primary", seed=1)
+    backends = [primary]
+    if name == "failover":
+        backends.append(FakeSmsBackend("secondary", latencySeconds=0.05, seed=2))
+    service = SMSService(backends=backends)
+    if name == "single":
+        # The old client: one provider, a 10 second HTTP timeout and no breaker
+        service.timeoutSeconds = 10.0
+        service.breakers["primary"].failureThreshold = sys.maxsize
+        service.breakers["primary"].slowCallSeconds = float("inf")
+
+    rows: List[Dict[str, Any]] = []
+    for phase, latency, errorRate in PHASES:
+        primary.latencySeconds, primary.errorRate = latency, errorRate
+        if phase == "recovered":
+            # Let the open breaker reach half-open so it can probe the primary
+            await asyncio.sleep(resetSeconds)
+        sentBefore = {backend.name: len(backend.sent) for backend in backends}
+        summary = await runPhase(service, messages, concurrency)
+        for backend in backends:
+            summary[f"via_{backend.name}"] = len(backend.sent) - sentBefore[backend.name]
+        summary["primary_breaker"] = service.breakers["primary"].state
+        rows.append({"setup": name, "phase": phase, **summary})
+    await service.close()
+    return rows
+
+
+async def main(args: argparse.Namespace) -> int:
+    os.environ.setdefault("SMS_PROVIDER_TIMEOUT_SECONDS", str(args.timeout))
+    os.environ.setdefault("SMS_SLOW_CALL_SECONDS", str(args.timeout / 2))
+    os.environ.setdefault("SMS_BREAKER_RESET_SECONDS", str(args.reset))
+    applyBenchmarkEnv("sqlite+aiosqlite://")
+
+    rows: List[Dict[str, Any]] = []
+    for setup in ("single", "failover"):
+        rows.extend(await runSetup(setup, args.messages, args.concurrency, args.reset))
+
+    printTable(
+        rows,
+        ["setup", "phase", "delivered_pct", "p50_ms", "p99_ms", "elapsed_s",
+         "via_primary", "via_secondary", "primary_breaker"],
+    )
+    writeResults(args.output, {"benchmark": "sms_failover", "runs": rows})
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100, help="Messages per phase")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=0.5, help="Per-attempt timeout")
+    parser.add_argument("--reset", type=float, default=1.0, help="Breaker reset seconds")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,111 @@
+"""Cold-start benchmark: import time of ``app.main`` and lifespan startup.
+
+Import time is measured in fresh interpreters with ``python -X importtime``;
+startup is measured for a first boot (DDL) and a warm boot (version matches).
+
+    python -m benchmarks.startup --runs 5 --output startup.json
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.common import applyBenchmarkEnv, benchmarkEnv, printTable, writeResults
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measureImport(databaseUrl: str) -> Tuple[int, List[Tuple[str, int]]]:
+    """Import app.main in a fresh interpreter; return total and self times in us"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=benchmarkEnv(databaseUrl),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    selfTimes: List[Tuple[str, int]] = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        selfUs, cumulativeUs, _, module = match.groups()
+        selfTimes.append((module, int(selfUs)))
+        if module == "app.main":
+            total = int(cumulativeUs)
+    selfTimes.sort(key=lambda item: item[1], reverse=True)
+    return total, selfTimes
+
+
+async def measureLifespan() -> float:
+    """Run the application lifespan once and return the startup time in ms"""
+    from app.main import createApp
+
+    app = createApp()
+    startTime = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        elapsed = (time.perf_counter() - startTime) * 1000
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpDir:
+        databaseUrl = f"sqlite+aiosqlite:///{os.path.join(tmpDir, 'startup.db')}"
+
+        totals: List[int] = []
+        slowest: List[Tuple[str, int]] = []
+        for _ in range(args.runs):
+            total, selfTimes = measureImport(databaseUrl)
+            totals.append(total)
+            slowest = selfTimes[: args.top]
+
+        applyBenchmarkEnv(databaseUrl)
+        firstBoot = asyncio.run(measureLifespan())
+        warmBoots = [asyncio.run(measureLifespan()) for _ in range(args.runs)]
+
+    results: Dict[str, Any] = {
+        "benchmark": "startup",
+        "import_ms": {
+            "median": statistics.median(totals) / 1000,
+            "min": min(totals) / 1000,
+            "max": max(totals) / 1000,
+        },
+        "slowest_modules_self_ms": {module: us / 1000 for module, us in slowest},
+        "lifespan_ms": {
+            "first_boot": firstBoot,
+            "warm_boot_median": statistics.median(warmBoots),
+        },
+    }
+
+    printTable(
+        [
+            {"metric": "import app.main (median)", "ms": results["import_ms"]["median"]},
+            {"metric": "lifespan first boot", "ms": firstBoot},
+            {"metric": "lifespan warm boot (median)", "ms": results["lifespan_ms"]["warm_boot_median"]},
+        ],
+        ["metric", "ms"],
+    )
+    print()
+    printTable(
+        [{"module": module, "self_ms": us / 1000} for module, us in slowest],
+        ["module", "self_ms"],
+    )
+    writeResults(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""ORM vs core fast path for the login lookup: latency and allocations per call.
+
+Seeds users with ``app.cli.generateData``, then looks them up by phone number through
+``UserRepository.queryPhoneNumber`` (full ORM instance) and
+``UserRepository.queryAuthByPhoneNumber`` (cached core select into a slotted
+dataclass), each in a fresh session as a request would.
+
+    python -m benchmarks.userLookup --users 1000 --iterations 2000 --postgres pgserver
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List
+
+from benchmarks.common import (
+    applyBenchmarkEnv,
+    percentiles,
+    postgresStandIn,
+    printTable,
+    writeResults,
+)
+
+SEED = 47
+
+
+async def seedUsers(engine: Any, count: int) -> List[str]:
+    from app.cli.generateData import generateData, phoneNumberFor
+
+    result = await generateData(
+        engine,
+        users=count,
+        seed=SEED,
+        workers=min(4, os.cpu_count() or 1),
+        hashedPassword="$argon2id$v=19$m=65536,t=3,p=4$placeholder",
+    )
+    return [
+        phoneNumberFor(SEED, userId)
+        for userId in range(result["firstUserId"], result["lastUserId"] + 1)
+    ]
+
+
+async def measure(
+    lookup: Callable[[str], Awaitable[Any]], phoneNumbers: List[str], iterations: int
+) -> Dict[str, float]:
+    """Latency percentiles plus the mean tracemalloc peak of a single call"""
+    for phoneNumber in phoneNumbers[:50]:
+        await lookup(phoneNumber)  # warm statement caches and pools
+
+    latencies: List[float] = []
+    for index in range(iterations):
+        startTime = time.perf_counter()
+        await lookup(phoneNumbers[index % len(phoneNumbers)])
+        latencies.append(time.perf_counter() - startTime)
+
+    # Allocation is measured in a separate pass; tracing skews timings
+    sampleCalls = min(iterations, 500)
+    peaks: List[int] = []
+    tracemalloc.start()
+    for index in range(sampleCalls):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await lookup(phoneNumbers[index % len(phoneNumbers)])
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    summary = percentiles(latencies)
+    summary["calls_per_s"] = len(latencies) / sum(latencies) if latencies else 0.0
+    summary["alloc_peak_kib"] = sum(peaks) / len(peaks) / 1024
+    return summary
+
+
+async def runScenario(databaseUrl: str, users: int, iterations: int) -> Dict[str, Any]:
+    applyBenchmarkEnv(databaseUrl)
+    import app.models  # noqa: F401
+    from app.core.database import getDatabaseManager
+    from app.repository.userRepo import UserRepository
+
+    databaseManager = getDatabaseManager()
+    await databaseManager.checkSchemaVersion(autoMigrate=True)
+    sessionMaker = databaseManager.asyncSessionMaker
+    phoneNumbers = await seedUsers(databaseManager.asyncEngine, users)
+
+    async def ormLookup(phoneNumber: str) -> Any:
+        async with sessionMaker() as session:
+            user = await UserRepository(session).queryPhoneNumber(phoneNumber)
+            return user.Id, user.hashedPassword
+
+    async def coreLookup(phoneNumber: str) -> Any:
+        async with sessionMaker() as session:
+            user = await UserRepository(session).queryAuthByPhoneNumber(phoneNumber)
+            return user.Id, user.hashedPassword
+
+    paths: Dict[str, Any] = {}
+    for name, lookup in (("orm", ormLookup), ("core", coreLookup)):
+        paths[name] = await measure(lookup, phoneNumbers, iterations)
+    await databaseManager.close()
+    return {"database": databaseUrl.split(":", 1)[0], "users": users, "paths": paths}
+
+
+async def main(args: argparse.Namespace) -> int:
+    runs: List[Dict[str, Any]] = []
+    with contextlib.ExitStack() as stack:
+        tmpDir = stack.enter_context(tempfile.TemporaryDirectory())
+        databaseUrls = [f"sqlite+aiosqlite:///{os.path.join(tmpDir, 'lookup.db')}"]
+        if args.postgres == "pgserver":
+            databaseUrls.append(stack.enter_context(postgresStandIn()))
+        elif args.postgres:
+            databaseUrls.append(args.postgres)
+        for databaseUrl in databaseUrls:
+            runs.append(await runScenario(databaseUrl, args.users, args.iterations))
+
+    for run in runs:
+        print(f"\n{run['database']}")
+        printTable(
+            [{"path": name, **summary} for name, summary in run["paths"].items()],
+            ["path", "count", "calls_per_s", "p50_ms", "p95_ms", "p99_ms", "alloc_peak_kib"],
+        )
+    writeResults(args.output, {"benchmark": "user_lookup", "runs": runs})
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--postgres", default=os.environ.get("BENCH_POSTGRES_URL"))
+    parser.add_argument("--output", help="Write JSON results to this path")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,29 @@
+"""Gunicorn configuration for multi-worker deployments.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+"""
+
+from app.core.settings import getSettings
+from app.core.workers import defaultWorkerCount, resetAfterFork
+
+# Drains requests on SIGTERM while still listening, see app.core.server
+worker_class = "app.core.uvicornWorker.DrainingUvicornWorker"
+
+bind = f"{getSettings.HOST}:{getSettings.PORT}"
+workers = defaultWorkerCount(getSettings.WEB_CONCURRENCY, getSettings.MAX_WORKERS)
+
+# Import the application once in the master so workers fork with modules loaded;
+# engines and clients are created lazily inside each worker.
+preload_app = True
+# On SIGTERM a worker withdraws readiness for SHUTDOWN_READINESS_DELAY_SECONDS,
+# then drains requests, uvicorn's connections and the lifespan shutdown within
+# SHUTDOWN_TIMEOUT_SECONDS each; leave headroom before the hard kill
+graceful_timeout = (
+    int(getSettings.SHUTDOWN_READINESS_DELAY_SECONDS + 3 * getSettings.SHUTDOWN_TIMEOUT_SECONDS) + 5
+)
+timeout = 60
+keepalive = 5
+
+
+def post_fork(server, worker):
+    resetAfterFork()